@@ -0,0 +1,52 @@
+""" Run the offline benchmarks and write one JSON document of their results.
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --quick --only parse pagination
+
+The document has `environment` (package and Python versions) and `results`,
+a list of records described in `benchmarks.common`.
+Compare two documents with `python -m benchmarks.compare old.json new.json`.
+"""
+import argparse
+import json
+import sys
+from typing import Any, Callable
+
+from benchmarks import bench_fetch, bench_import, bench_pagination, bench_parse
+from benchmarks.common import environment
+
+
+def _suites(quick: bool) -> dict[str, Callable[[], list[dict[str, Any]]]]:
+    repeat: int = 1 if quick else 3
+    return {
+        'import': lambda: [bench_import.measure(3 if quick else 10)],
+        'parse': lambda: bench_parse.bench(20 if quick else 200, repeat),
+        'pagination': lambda: bench_pagination.bench((1, 5) if quick else (1, 10, 50), 50, repeat),
+        'fetch': lambda: bench_fetch.bench(50 if quick else 200, (1, 8) if quick else (1, 8, 32), 0.0, repeat),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', '-o', default=None, help='file to write, stdout if omitted')
+    parser.add_argument('--quick', action='store_true', help='fewer items and runs, for a smoke test')
+    parser.add_argument('--only', nargs='+', choices=['import', 'parse', 'pagination', 'fetch'], default=None)
+    args = parser.parse_args()
+
+    suites = _suites(args.quick)
+    results: list[dict[str, Any]] = []
+    for name in args.only or suites:
+        print(f'running {name}', file=sys.stderr)
+        results.extend(suites[name]())
+
+    document: dict[str, Any] = {'environment': environment(), 'results': results}
+    if args.output is None:
+        json.dump(document, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
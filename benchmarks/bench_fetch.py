@@ -0,0 +1,71 @@
+""" End-to-end benchmark of bulk detail fetch against a local server.
+
+`yahoo_auction_auto.stub.StubServer` on 127.0.0.1 serves auction pages,
+optionally after `--latency` seconds, and `YahooAuction.get_info_selling_many`
+fetches them through URLs pointing at it, so the figures cover
+the client, the connection pool, the worker pool and parsing together.
+Items are aIDs.
+
+    python -m benchmarks.bench_fetch --aids 500 --concurrency 1 8 32 --latency 0.01
+"""
+import argparse
+import asyncio
+import json
+import sys
+from typing import Any, Iterable
+
+from benchmarks.common import measure_async
+
+
+async def _bench(aids: int, concurrencies: Iterable[int], latency: float, repeat: int) -> list[dict[str, Any]]:
+    from yahoo_auction_auto.parsers import PARSERS
+    from yahoo_auction_auto.stub import StubServer
+    from yahoo_auction_auto.yahoo_auction import YahooAuction
+
+    results: list[dict[str, Any]] = []
+    async with StubServer(selling=aids, latency=latency) as server:
+        aIDs: list[str] = [item.aID for item in server.listed('selling')]
+        for concurrency in concurrencies:
+            for parser in PARSERS:
+                async with YahooAuction([], max_connections=concurrency, parser=parser, urls=server.urls) as ya:
+
+                    async def run() -> None:
+                        async for aID, result in ya.get_info_selling_many(aIDs, concurrency):
+                            if isinstance(result, Exception):
+                                raise result
+
+                    results.append(await measure_async(
+                        'fetch.info_selling_many',
+                        parser,
+                        run,
+                        aids,
+                        repeat,
+                        concurrency=concurrency,
+                        latency=latency
+                    ))
+    return results
+
+
+def bench(
+    aids: int = 200,
+    concurrencies: Iterable[int] = (1, 8, 32),
+    latency: float = 0.0,
+    repeat: int = 3
+) -> list[dict[str, Any]]:
+    """ Return result records of fetching `aids` pages at each concurrency with every parser backend. """
+    return asyncio.run(_bench(aids, concurrencies, latency, repeat))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--aids', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds the server waits per request')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    json.dump(bench(args.aids, args.concurrency, args.latency, args.repeat), sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+""" Import-time benchmark of yahoo_auction_auto.
+
+Runs `from yahoo_auction_auto import YahooAuction` in fresh interpreters and reports the median
+time over a bare interpreter start, as JSON on stdout.
+Exits with 1 if the median exceeds `--max-ms`, so it can gate a CI job.
+
+    python -m benchmarks.bench_import --runs 20 --max-ms 300
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any
+
+HEAVY_MODULES: tuple[str, ...] = ('selenium', 'chromedriver_binary', 'bs4', 'lxml')
+
+
+def _run(code: str) -> float:
+    start: float = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], check=True)
+    return time.perf_counter() - start
+
+
+def measure(runs: int) -> dict[str, Any]:
+    """ Return median import time and heavy modules loaded by the import. """
+    bare: list[float] = [_run('pass') for _ in range(runs)]
+    imported: list[float] = [_run('from yahoo_auction_auto import YahooAuction') for _ in range(runs)]
+    check: str = (
+        'import sys; from yahoo_auction_auto import YahooAuction; '
+        f'print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+    )
+    loaded: str = subprocess.run(
+        [sys.executable, '-c', check], check=True, capture_output=True, text=True
+    ).stdout.strip()
+    return {
+        'benchmark': 'import',
+        'runs': runs,
+        'median_ms': (statistics.median(imported) - statistics.median(bare)) * 1000,
+        'heavy_modules_loaded': loaded.split(',') if loaded else [],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--max-ms', type=float, default=None, help='fail if the median exceeds this')
+    args = parser.parse_args()
+
+    result: dict[str, Any] = measure(args.runs)
+    json.dump(result, sys.stdout)
+    sys.stdout.write('\n')
+    if result['heavy_modules_loaded']:
+        sys.exit(1)
+    if args.max_ms is not None and result['median_ms'] > args.max_ms:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+""" Pagination benchmark of `_get_urls` over synthetic list pages.
+
+Pages of `--items` products each, rendered as `yahoo_auction_auto.stub` does,
+are served from memory by `httpx.MockTransport`,
+so the figures are of the pagination loop and the list page parsing,
+not of the network. Items are product URLs.
+
+    python -m benchmarks.bench_pagination --pages 1 10 50 --items 50
+"""
+import argparse
+import asyncio
+import json
+import sys
+from typing import Any, Iterable
+
+import httpx
+
+from benchmarks.common import measure_async
+
+LIST_URL: str = 'https://auctions.yahoo.co.jp/openuser/jp/show/mystatus?select=selling'
+
+
+def transport(pages: int, items: int) -> httpx.MockTransport:
+    """ Return transport serving `pages` list pages from memory. """
+    from yahoo_auction_auto.stub import make_items, render_list_page
+    from yahoo_auction_auto.urls import YahooAuctionURL
+
+    urls: YahooAuctionURL = YahooAuctionURL()
+    products = make_items(pages * items)
+    contents: dict[int, bytes] = {
+        page: render_list_page(
+            products[(page - 1) * items:page * items],
+            urls,
+            f'{LIST_URL}&apg={page + 1}' if page < pages else None
+        )
+        for page in range(1, pages + 1)
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page: int = int(request.url.params.get('apg', '1'))
+        return httpx.Response(200, content=contents[page])
+
+    return httpx.MockTransport(handler)
+
+
+async def _bench(page_counts: Iterable[int], items: int, repeat: int) -> list[dict[str, Any]]:
+    from yahoo_auction_auto.client import HTTPClient
+    from yahoo_auction_auto.parsers import PARSERS, get_parser
+    from yahoo_auction_auto.yahoo_auction import _PATTERN_SELLING, _get_urls
+
+    results: list[dict[str, Any]] = []
+    for pages in page_counts:
+        async with HTTPClient({}, transport=transport(pages, items)) as client:
+            for name in PARSERS:
+                parser = get_parser(name)
+
+                async def run() -> None:
+                    urls: list[str] = await _get_urls(client, LIST_URL, _PATTERN_SELLING, parser)
+                    assert len(urls) == pages * items
+
+                result: dict[str, Any] = await measure_async('pagination.get_urls', name, run, pages * items, repeat, pages=pages)
+                result['pages_per_sec'] = pages / result['seconds']
+                results.append(result)
+    return results
+
+
+def bench(page_counts: Iterable[int] = (1, 10, 50), items: int = 50, repeat: int = 3) -> list[dict[str, Any]]:
+    """ Return result records of `_get_urls` over each number of pages with every parser backend. """
+    return asyncio.run(_bench(page_counts, items, repeat))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--items', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    json.dump(bench(args.pages, args.items, args.repeat), sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
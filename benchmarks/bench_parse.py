@@ -0,0 +1,76 @@
+""" Parsing benchmark of the auction page fixture.
+
+Measures each `_get_*` extractor on a prebuilt soup, building the soup itself,
+and a full `InfoSelling.parse` with every parser backend.
+Items are pages, so `items_per_sec` is pages parsed per second.
+
+    python -m benchmarks.bench_parse --pages 200
+"""
+import argparse
+import json
+import sys
+from typing import Any, Callable
+
+from benchmarks.common import fixture, measure
+
+EXTRACTORS: tuple[str, ...] = (
+    '_get_title',
+    '_get_seller_name',
+    '_get_stack',
+    '_get_start_datetime',
+    '_get_end_datetime',
+    '_get_refundable',
+    '_get_startprice',
+    '_get_timeleft',
+    '_get_count_bid',
+    '_get_count_access',
+    '_get_count_watch',
+)
+
+
+def _times(func: Callable[[], Any], n: int) -> Callable[[], None]:
+    def run() -> None:
+        for _ in range(n):
+            func()
+    return run
+
+
+def bench(pages: int = 200, repeat: int = 3) -> list[dict[str, Any]]:
+    """ Return result records of the extractors and of full parses over `pages` pages. """
+    from yahoo_auction_auto.info import selling
+    from yahoo_auction_auto.info.selling import InfoSelling
+    from yahoo_auction_auto.parsers import PARSERS
+    from yahoo_auction_auto.soup import make_soup
+
+    content: bytes = fixture('test_selling.html')
+    results: list[dict[str, Any]] = []
+
+    results.append(measure('parse.soup', 'make_soup', _times(lambda: make_soup(content), pages), pages, repeat))
+    soup = make_soup(content)
+    for name in EXTRACTORS:
+        extractor = getattr(selling, name)
+        results.append(measure('parse.extractor', name, _times(lambda: extractor(soup), pages), pages, repeat))
+
+    for parser in PARSERS:
+        results.append(measure(
+            'parse.info_selling',
+            parser,
+            _times(lambda: InfoSelling('a1').parse(content, parser=parser), pages),
+            pages,
+            repeat,
+            bytes_per_page=len(content)
+        ))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    json.dump(bench(args.pages, args.repeat), sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
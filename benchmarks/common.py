@@ -0,0 +1,96 @@
+""" Measurement helpers shared by the benchmarks.
+
+Every benchmark returns a list of result records, plain dicts having
+`benchmark`, `name`, `items`, `seconds`, `items_per_sec` and `peak_kib`,
+so that `python -m benchmarks` can dump them as one JSON document and
+`python -m benchmarks.compare` can diff two of them.
+
+`peak_kib` is the peak of the Python heap traced by `tracemalloc`.
+Memory allocated inside libxml2 is not traced, which flatters lxml.
+"""
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable
+
+FIXTURES: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests', 'info')
+
+
+def fixture(name: str) -> bytes:
+    """ Return content of a fixture in `tests/info`. """
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+
+def record(benchmark: str, name: str, items: int, seconds: float, peak: int, **extra: Any) -> dict[str, Any]:
+    """ Return a result record. `peak` is in bytes. """
+    return {
+        'benchmark': benchmark,
+        'name': name,
+        'items': items,
+        'seconds': seconds,
+        'items_per_sec': items / seconds if seconds > 0 else 0.0,
+        'peak_kib': peak / 1024,
+        **extra,
+    }
+
+
+def measure(benchmark: str, name: str, func: Callable[[], Any], items: int, repeat: int, **extra: Any) -> dict[str, Any]:
+    """ Time `func` producing `items` items, best of `repeat`, and its peak memory in one more run.
+
+    Memory is traced in a separate run, since tracing slows down allocation.
+    """
+    func()  # warm up lazy imports and caches
+    best: float = float('inf')
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return record(benchmark, name, items, best, _peak(func), **extra)
+
+
+async def measure_async(
+    benchmark: str,
+    name: str,
+    func: Callable[[], Awaitable[Any]],
+    items: int,
+    repeat: int,
+    **extra: Any
+) -> dict[str, Any]:
+    """ `measure` of a coroutine function. """
+    await func()
+    best: float = float('inf')
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        await func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        await func()
+        peak: int = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return record(benchmark, name, items, best, peak, **extra)
+
+
+def environment() -> dict[str, Any]:
+    """ Return versions the results depend on. """
+    from yahoo_auction_auto import __version__
+    return {
+        'package_version': __version__,
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'timestamp': time.time(),
+    }
+
+
+def _peak(func: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
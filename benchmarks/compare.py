@@ -0,0 +1,72 @@
+""" Compare two result documents of `python -m benchmarks`.
+
+Records are matched on `benchmark`, `name` and their parameters
+(`pages`, `concurrency`, `latency`), and the change of `items_per_sec`
+and `peak_kib` is printed as a table.
+Exits with 1 if any throughput dropped by more than `--threshold` percent.
+
+    python -m benchmarks.compare old.json new.json --threshold 10
+"""
+import argparse
+import json
+import sys
+from typing import Any
+
+PARAMETERS: tuple[str, ...] = ('pages', 'concurrency', 'latency')
+
+
+def key(result: dict[str, Any]) -> tuple[Any, ...]:
+    """ Return what identifies `result` across runs. """
+    return (result['benchmark'], result.get('name', '')) + tuple(result.get(p) for p in PARAMETERS)
+
+
+def compare(old: dict[str, Any], new: dict[str, Any]) -> list[dict[str, Any]]:
+    """ Return changes of every record present in both documents. """
+    before: dict[tuple[Any, ...], dict[str, Any]] = {key(r): r for r in old['results'] if 'items_per_sec' in r}
+    changes: list[dict[str, Any]] = []
+    for result in new['results']:
+        previous = before.get(key(result))
+        if previous is None or 'items_per_sec' not in result:
+            continue
+        changes.append({
+            'key': key(result),
+            'items_per_sec': (previous['items_per_sec'], result['items_per_sec']),
+            'throughput_change': _percent(previous['items_per_sec'], result['items_per_sec']),
+            'peak_change': _percent(previous['peak_kib'], result['peak_kib']),
+        })
+    return changes
+
+
+def _percent(old: float, new: float) -> float:
+    return (new - old) / old * 100 if old else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=10.0, help='percent of throughput drop to fail on')
+    args = parser.parse_args()
+
+    with open(args.old, encoding='utf-8') as f:
+        old: dict[str, Any] = json.load(f)
+    with open(args.new, encoding='utf-8') as f:
+        new: dict[str, Any] = json.load(f)
+
+    regressed: bool = False
+    for change in compare(old, new):
+        label: str = ' '.join(str(part) for part in change['key'] if part is not None)
+        before, after = change['items_per_sec']
+        flag: str = ''
+        if change['throughput_change'] < -args.threshold:
+            flag = '  REGRESSION'
+            regressed = True
+        print(
+            f'{label:60} {before:12.1f} -> {after:12.1f} items/s '
+            f'({change["throughput_change"]:+6.1f}%)  memory {change["peak_change"]:+6.1f}%{flag}'
+        )
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == '__main__':
+    main()
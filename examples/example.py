@@ -8,7 +8,11 @@ async def main():
     with open('cookies.json') as f:
         cookies = json.load(f)
 
-    ya = YahooAuction(cookies=cookies)
+    async with YahooAuction(cookies=cookies) as ya: # 接続は使い回され、抜けるときに閉じられる
+        await run(ya)
+
+
+async def run(ya: YahooAuction):
     aIDs: list[str] = await ya.get_urls_selling() # 出品中のaIDを全て取得する
     pprint(aIDs)
 
@@ -16,6 +20,12 @@ async def main():
         info = await ya.get_info_selling(aID) # 出品中の情報を取得する。
         pprint(info.__dict__)
 
+    async for aID, info in ya.get_info_selling_many(aIDs, concurrency=8): # 出品中の情報をまとめて取得する。
+        if isinstance(info, Exception):
+            print(aID, info)
+        else:
+            pprint(info.__dict__)
+
 
 if __name__ == '__main__':
     asyncio.run(main())
\ No newline at end of file
@@ -1,2 +1,22 @@
 from .info import *
 
+from .test_concurrency import *
+from .test_yahoo_auction import *
+from .test_cache import *
+from .test_cancel import *
+from .test_import import *
+from .test_watch import *
+from .test_scheduler import *
+from .test_soup import *
+from .test_parsers import *
+from .test_stub import *
+from .test_metrics import *
+from .test_limiter import *
+from .test_retry import *
+from .test_accounts import *
+from .test_parse_pool import *
+from .test_store import *
+from .test_closed import *
+from .test_cli import *
+from .test_session import *
+from .test_chrome import *
@@ -1 +1,3 @@
-from .test_selling import *
\ No newline at end of file
+from .test_selling import *
+from .test_summary import *
+from .test_table import *
\ No newline at end of file
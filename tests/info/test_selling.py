@@ -63,4 +63,13 @@ class TestInfoSelling(TestCase):
     
     def test_get_count_watch(self) -> None:
         count_watch: int = selling._get_count_watch(self.soup)
-        self.assertEqual(count_watch, 0)
\ No newline at end of file
+        self.assertEqual(count_watch, 0)
+
+
+    def test_index_page(self) -> None:
+        index = selling._index_page(self.soup)
+        self.assertEqual(index.title, 'title')
+        self.assertEqual(index.seller_name, 'seller_name')
+        self.assertEqual(index.details['オークションID'], '：10000000000')
+        self.assertEqual(set(index.counts), {'入札件数', '残り時間'})
+        self.assertEqual(index.statistics, {'access': '0', 'watch': '0'})
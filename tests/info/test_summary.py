@@ -0,0 +1,33 @@
+import re
+from unittest import TestCase
+from datetime import datetime
+
+import bs4
+
+from yahoo_auction_auto.info import summary
+
+class TestInfoSummary(TestCase):
+
+    def setUp(self) -> None:
+        with open('tests/info/test_summary.html', encoding='utf-8') as f:
+            self.soup = bs4.BeautifulSoup(f.read(), 'lxml')
+        self.summaries = summary._get_summaries(self.soup, re.compile(r'^rsec:itm;slk:tc;'), datetime(2021, 12, 20))
+    
+
+    def test_get_summaries(self) -> None:
+        self.assertEqual([s.aID for s in self.summaries], ['a1000000000', 'b2000000000'])
+        self.assertEqual(self.summaries[0].title, 'title 1')
+        self.assertEqual(self.summaries[0].url, 'https://page.auctions.yahoo.co.jp/jp/auction/a1000000000')
+
+
+    def test_get_price(self) -> None:
+        self.assertEqual([s.price for s in self.summaries], [10000, 500])
+
+
+    def test_get_count_bid(self) -> None:
+        self.assertEqual([s.count_bid for s in self.summaries], [3, 0])
+
+
+    def test_get_end_datetime(self) -> None:
+        self.assertEqual(self.summaries[0].end_datetime, datetime(2021, 10, 15, 19, 54))
+        self.assertEqual(self.summaries[1].end_datetime, datetime(2022, 1, 2, 9, 5))
@@ -0,0 +1,61 @@
+from unittest import TestCase
+from datetime import datetime
+
+from yahoo_auction_auto.info.selling import InfoSelling
+from yahoo_auction_auto.info import table
+
+
+def _info(aID: str, end: datetime, count_watch: int, count_bid: int = 0) -> InfoSelling:
+    info = InfoSelling(aID)
+    info.title = 'title'
+    info.seller_name = 'seller_name'
+    info.stack = 1
+    info.start_datetime = datetime(2021, 10, 12, 19, 54)
+    info.end_datetime = end
+    info.refundable = False
+    info.startprice = '10,000 円（税 0 円）'
+    info.timeleft = ''
+    info.count_bid = count_bid
+    info.count_access = 0
+    info.count_watch = count_watch
+    return info
+
+
+class TestSellingTable(TestCase):
+
+    def setUp(self) -> None:
+        self.now = table.to_epoch(datetime(2021, 10, 15, 0, 0))
+        self.table = table.SellingTable([
+            table.SellingRecord.from_info(_info('a', datetime(2021, 10, 15, 0, 30), 3), self.now),
+            table.SellingRecord.from_info(_info('b', datetime(2021, 10, 15, 19, 54), 4, 2), self.now),
+        ])
+
+
+    def test_parse_yen(self) -> None:
+        self.assertEqual(table.parse_yen('10,000 円（税 0 円）'), 10000)
+
+
+    def test_round_trip(self) -> None:
+        info = self.table[1].to_info()
+        self.assertEqual(info.end_datetime, datetime(2021, 10, 15, 19, 54))
+        self.assertEqual(info.startprice, '10,000 円')
+        self.assertEqual(info.timeleft, '19時間')
+        self.assertEqual(info.count_bid, 2)
+
+
+    def test_aggregates(self) -> None:
+        self.assertEqual(self.table.total_watches(), 7)
+        self.assertEqual([r.aID for r in self.table.ending_within(3600, self.now)], ['a'])
+        self.assertEqual([r.aID for r in self.table.with_bids()], ['b'])
+
+
+    def test_select_copies_columns(self) -> None:
+        selected = self.table.select([1])
+        self.assertEqual(len(selected), 1)
+        self.assertEqual(selected[0].aID, 'b')
+        self.assertEqual(selected[0].seller_name, 'seller_name')
+        self.assertEqual(selected.column('count_watch').tolist(), [4])
+        selected.append(table.SellingRecord('c', seller_name='other', count_watch=1))
+        self.assertEqual([r.seller_name for r in selected], ['seller_name', 'other'])
+        self.assertEqual(len(self.table), 2)
+        self.assertEqual([r.aID for r in self.table.where([True, False])], ['a'])
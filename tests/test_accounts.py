@@ -0,0 +1,130 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+import httpx
+
+from yahoo_auction_auto import AccountManager, YahooAuction
+from yahoo_auction_auto.metrics import Event, Metrics
+from yahoo_auction_auto.stub import SELLING, StubServer
+from yahoo_auction_auto.urls import YahooAuctionURL
+
+
+class TestAccountManager(IsolatedAsyncioTestCase):
+
+    async def test_cookies_are_isolated(self) -> None:
+        cookies: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            cookies.append(request.headers.get('Cookie', ''))
+            return httpx.Response(200, content=b'<html></html>')
+
+        transport = httpx.MockTransport(handler)
+        accounts = {
+            'a': [{'name': 'Y', 'value': 'a'}],
+            'b': [{'name': 'Y', 'value': 'b'}],
+        }
+        async with AccountManager(accounts, transport=transport) as manager:
+            self.assertEqual(manager.names, ['a', 'b'])
+            await manager.submit('a', YahooAuction.check_login)
+            await manager.submit('b', YahooAuction.check_login)
+            self.assertIs(manager['a'].limiter, manager['b'].limiter)
+        self.assertEqual(cookies, ['Y=a', 'Y=b'])
+
+
+    async def test_fair_scheduling(self) -> None:
+        order: list[str] = []
+
+        async def work(ya: YahooAuction, name: str) -> str:
+            order.append(name)
+            await asyncio.sleep(0)
+            return name
+
+        async with AccountManager({'a': [], 'b': []}, concurrency=1, per_account=1) as manager:
+            results = [entry async for entry in manager.map(work, {'a': ['a'] * 5, 'b': ['b'] * 2})]
+            stats = manager.stats()
+        self.assertEqual(order, ['a', 'b', 'a', 'b', 'a', 'a', 'a'])
+        self.assertEqual(len(results), 7)
+        self.assertEqual((stats['a'].calls, stats['b'].calls), (5, 2))
+        self.assertEqual(stats['a'].running, 0)
+
+
+    async def test_concurrency(self) -> None:
+        running: dict[str, int] = {'a': 0, 'b': 0}
+        peaks: dict[str, int] = {'a': 0, 'b': 0}
+
+        async def work(ya: YahooAuction, name: str) -> None:
+            running[name] += 1
+            peaks[name] = max(peaks[name], running[name])
+            self.assertLessEqual(sum(running.values()), 3)
+            await asyncio.sleep(0.01)
+            running[name] -= 1
+
+        async with AccountManager({'a': [], 'b': []}, concurrency=3, per_account=2) as manager:
+            async for _ in manager.map(work, {'a': ['a'] * 6, 'b': ['b'] * 6}):
+                pass
+        self.assertEqual(peaks, {'a': 2, 'b': 2})
+
+
+    async def test_stats_and_metrics(self) -> None:
+        events: list[Event] = []
+        async with StubServer(selling=4) as server:
+            async with AccountManager(
+                {'a': [], 'b': []}, 
+                urls=server.urls, 
+                metrics=Metrics(events.append), 
+                parser='lxml'
+            ) as manager:
+                aIDs = [item.aID for item in server.listed(SELLING)]
+                results = [entry async for entry in manager.map(
+                    lambda ya, aID: ya.get_info_selling(aID), 
+                    {'a': aIDs[:3], 'b': aIDs[3:] + ['missing']}
+                )]
+                stats = manager.stats()
+        self.assertEqual(sum(isinstance(result, Exception) for _, _, result in results), 1)
+        self.assertEqual((stats['a'].requests, stats['a'].request_errors), (3, 0))
+        self.assertEqual((stats['b'].calls, stats['b'].failed, stats['b'].request_errors), (2, 1, 1))
+        accounts = [e.labels['account'] for e in events if e.name == 'request']
+        self.assertEqual(sorted(accounts), ['a', 'a', 'a', 'b', 'b'])
+
+
+    async def test_options(self) -> None:
+        with self.assertRaises(ValueError):
+            AccountManager(cookies=[])
+        with self.assertRaises(ValueError):
+            AccountManager(parsr='lxml')
+        async with AccountManager({'a': []}, parser='lxml') as manager:
+            self.assertEqual(len(manager), 1)
+
+
+    async def test_remove(self) -> None:
+        async with AccountManager({'a': []}, urls=YahooAuctionURL.local('http://127.0.0.1:1')) as manager:
+            manager.add('b', [])
+            with self.assertRaises(ValueError):
+                manager.add('b', [])
+            await manager.remove('a')
+            self.assertEqual(manager.names, ['b'])
+            with self.assertRaises(KeyError):
+                await manager.submit('a', YahooAuction.check_login)
+
+
+    async def test_remove_with_granted_call(self) -> None:
+        calls: list[YahooAuction] = []
+
+        async def call(ya: YahooAuction) -> None:
+            calls.append(ya)
+
+        async def hold(ya: YahooAuction) -> None:
+            await asyncio.sleep(0.01)
+
+        urls = YahooAuctionURL.local('http://127.0.0.1:1')
+        async with AccountManager({'a': [], 'b': []}, concurrency=1, per_account=1, urls=urls) as manager:
+            granted = asyncio.create_task(manager.submit('a', call))
+            await manager.submit('a', hold)
+            # `granted` is given the slot but has not started
+            await manager.remove('a')
+            with self.assertRaises(KeyError):
+                await granted
+            self.assertEqual(calls, [])
+            # the slot is given back
+            await asyncio.wait_for(manager.submit('b', call), 1.0)
+            self.assertEqual(len(calls), 1)
@@ -0,0 +1,110 @@
+import tempfile
+import threading
+import time
+from unittest import IsolatedAsyncioTestCase
+
+import httpx
+
+from yahoo_auction_auto.cache import CacheEntry, ResponseCache
+from yahoo_auction_auto.client import HTTPClient
+
+URL: str = 'https://page.auctions.yahoo.co.jp/jp/auction/a1'
+
+
+class TestResponseCache(IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.requests: list[httpx.Request] = []
+
+    
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+
+    def _handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.headers.get('If-None-Match') == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=b'page', headers={'ETag': '"v1"'})
+
+
+    async def test_fresh_entry_is_served_from_cache(self) -> None:
+        cache = ResponseCache(self.tmp.name)
+        async with HTTPClient({'a': 'b'}, transport=httpx.MockTransport(self._handler), cache=cache) as client:
+            first = await client.get(URL, kind='detail')
+            second = await client.get(URL, kind='detail')
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(len(self.requests), 1)
+
+
+    async def test_stale_entry_is_revalidated(self) -> None:
+        cache = ResponseCache(self.tmp.name, ttl={'detail': 0.0})
+        async with HTTPClient({}, transport=httpx.MockTransport(self._handler), cache=cache) as client:
+            await client.get(URL, kind='detail')
+            response = await client.get(URL, kind='detail')
+        self.assertEqual(response.content, b'page')
+        self.assertEqual(self.requests[1].headers['If-None-Match'], '"v1"')
+
+
+    async def test_stale_entry_without_validators_is_refetched(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            return httpx.Response(200, content=b'page')
+
+        cache = ResponseCache(self.tmp.name, ttl={'detail': 0.0})
+        async with HTTPClient({}, transport=httpx.MockTransport(handler), cache=cache) as client:
+            await client.get(URL, kind='detail')
+            response = await client.get(URL, kind='detail')
+        self.assertEqual(response.content, b'page')
+        self.assertNotIn('If-None-Match', self.requests[1].headers)
+        self.assertNotIn('If-Modified-Since', self.requests[1].headers)
+
+
+    async def test_files_are_accessed_off_the_event_loop(self) -> None:
+        cache = ResponseCache(self.tmp.name)
+        threads: list[str] = []
+        put = cache.put
+
+        def record_put(key: str, entry: CacheEntry) -> None:
+            threads.append(threading.current_thread().name)
+            put(key, entry)
+
+        cache.put = record_put  # type: ignore[method-assign]
+        await cache.aput('a', CacheEntry('a', b'body', time.time(), '"v1"'))
+        entry = await cache.aget('a')
+        cache.close()
+        assert entry is not None
+        self.assertEqual(entry.content, b'body')
+        self.assertTrue(entry.revalidatable)
+        self.assertTrue(threads[0].startswith('cache'))
+
+
+    async def test_key_depends_on_cookies(self) -> None:
+        self.assertNotEqual(ResponseCache.key(URL, {'a': '1'}), ResponseCache.key(URL, {'a': '2'}))
+
+
+    def test_lru_eviction(self) -> None:
+        cache = ResponseCache(self.tmp.name, max_bytes=10)
+        now = time.time()
+        cache.put('a', CacheEntry('a', b'12345', now))
+        cache.put('b', CacheEntry('b', b'12345', now))
+        cache.get('a')
+        cache.put('c', CacheEntry('c', b'12345', now))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(set(ResponseCache(self.tmp.name)._sizes), {'a', 'c'})
+
+
+    def test_total_follows_replace_and_evict(self) -> None:
+        cache = ResponseCache(self.tmp.name, max_bytes=10)
+        now = time.time()
+        cache.put('a', CacheEntry('a', b'12345', now))
+        cache.put('a', CacheEntry('a', b'123', now))  # replaced, not added
+        cache.put('b', CacheEntry('b', b'1234567', now))
+        self.assertEqual(set(cache._sizes), {'a', 'b'})
+        cache.put('c', CacheEntry('c', b'12', now))
+        self.assertEqual(set(cache._sizes), {'b', 'c'})
+        self.assertEqual(cache._total, 9)
+        cache.clear()
+        self.assertEqual(cache._total, 0)
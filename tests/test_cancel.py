@@ -0,0 +1,122 @@
+import re
+from unittest import IsolatedAsyncioTestCase, mock
+from urllib.parse import parse_qs
+
+import httpx
+
+from yahoo_auction_auto.client import HTTPClient
+from yahoo_auction_auto.retry import Hedging, RetryPolicy
+from yahoo_auction_auto import YahooAuction
+from yahoo_auction_auto.cancel import CancelUnconfirmed, cancel_http, _get_confirm_form
+from yahoo_auction_auto.urls import YahooAuctionURL
+
+CANCEL_PAGE: bytes = '''
+<html><body>
+<form action="/jp/config/cancelauction" method="post">
+<input type="hidden" name="aID" value="a1">
+<input type="hidden" name=".crumb" value="token">
+<input type="checkbox" name="notify" value="1">
+<textarea name="reason">reason</textarea>
+<input type="submit" name="confirm" value="取り消す">
+<input type="submit" name="back" value="戻る">
+</form>
+</body></html>
+'''.encode()
+DONE_PAGE: bytes = '<html><body>オークションを取り消しました</body></html>'.encode()
+
+
+class TestCancel(IsolatedAsyncioTestCase):
+
+    def test_get_confirm_form(self) -> None:
+        form = _get_confirm_form(CANCEL_PAGE, YahooAuctionURL.CANCEL('a1'))
+        assert form is not None
+        method, action, data = form
+        self.assertEqual(method, 'POST')
+        self.assertEqual(action, 'https://page.auctions.yahoo.co.jp/jp/config/cancelauction')
+        self.assertEqual(data, {'aID': 'a1', '.crumb': 'token', 'reason': 'reason', 'confirm': '取り消す'})
+
+
+    def test_get_confirm_form_not_found(self) -> None:
+        self.assertIsNone(_get_confirm_form(b'<html></html>', YahooAuctionURL.CANCEL('a1')))
+
+
+    async def test_cancel_http(self) -> None:
+        posted: list[dict[str, list[str]]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == 'POST':
+                posted.append(parse_qs(request.content.decode()))
+                return httpx.Response(200, content=DONE_PAGE)
+            return httpx.Response(200, content=CANCEL_PAGE)
+
+        async with HTTPClient({}, transport=httpx.MockTransport(handler)) as client:
+            await cancel_http(client, 'a1')
+        self.assertEqual(posted[0]['.crumb'], ['token'])
+
+
+    async def test_cancel_http_get_form(self) -> None:
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if request.url.path == '/jp/config/cancelauction':
+                return httpx.Response(200, content=DONE_PAGE)
+            return httpx.Response(200, content=CANCEL_PAGE.replace(b'method="post"', b'method="get"'))
+
+        async with HTTPClient({}, transport=httpx.MockTransport(handler)) as client:
+            await cancel_http(client, 'a1')
+        self.assertEqual(requests[1].method, 'GET')
+        self.assertEqual(parse_qs(requests[1].url.query.decode())['.crumb'], ['token'])
+
+
+    async def test_confirm_is_sent_once(self) -> None:
+        confirms: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == '/jp/config/cancelauction':
+                confirms.append(request)
+                return httpx.Response(503)
+            return httpx.Response(200, content=CANCEL_PAGE.replace(b'method="post"', b'method="get"'))
+
+        retry = RetryPolicy(attempts=3, backoff=0.0, methods=('GET', 'POST'))
+        async with HTTPClient({}, transport=httpx.MockTransport(handler), retry=retry, hedging=Hedging()) as client:
+            with self.assertRaises(httpx.HTTPStatusError):
+                await cancel_http(client, 'a1')
+        self.assertEqual(len(confirms), 1)
+
+
+    async def test_cancel_http_rejected(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            # the confirm page is shown again, such as of an expired crumb
+            return httpx.Response(200, content=CANCEL_PAGE)
+
+        async with HTTPClient({}, transport=httpx.MockTransport(handler)) as client:
+            with self.assertRaises(ValueError):
+                await cancel_http(client, 'a1')
+
+
+    async def test_cancel_http_unconfirmed(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == 'POST':
+                return httpx.Response(200, content='<html><body>完了</body></html>'.encode())
+            return httpx.Response(200, content=CANCEL_PAGE)
+
+        async with HTTPClient({}, transport=httpx.MockTransport(handler)) as client:
+            with self.assertRaises(CancelUnconfirmed):
+                await cancel_http(client, 'a1')
+            await cancel_http(client, 'a1', marker=re.compile('完了'))
+            await cancel_http(client, 'a1', marker=None)
+
+
+    async def test_unconfirmed_is_not_fallen_back(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == 'POST':
+                return httpx.Response(200, content=b'<html><body></body></html>')
+            return httpx.Response(200, content=CANCEL_PAGE)
+
+        async with YahooAuction([], transport=httpx.MockTransport(handler)) as ya:
+            with mock.patch.object(ya, 'cancel_many') as cancel_many:
+                results = [result async for result in ya.cancel_many_http(['a1'], fallback=True)]
+        cancel_many.assert_not_called()
+        self.assertEqual(len(results), 1)
+        self.assertIsInstance(results[0][1], CancelUnconfirmed)
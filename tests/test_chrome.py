@@ -0,0 +1,93 @@
+import importlib.util
+import sys
+import threading
+import types
+from typing import Any, Optional, cast
+from unittest import IsolatedAsyncioTestCase, mock, skipUnless
+
+from yahoo_auction_auto import YahooAuction
+
+
+class FakeChrome:
+    """ Stand-in of a Chrome driver counting its quits. """
+    started: list['FakeChrome'] = []
+
+
+    def __init__(self, options: Any = None) -> None:
+        self.cookies: list[dict[str, Any]] = []
+        self.quits: int = 0
+        self.implicit_wait: Optional[float] = None
+        FakeChrome.started.append(self)
+
+
+    def implicitly_wait(self, seconds: float) -> None:
+        self.implicit_wait = seconds
+
+
+    def get(self, url: str) -> None:
+        pass
+
+
+    def add_cookie(self, cookie: dict[str, Any]) -> None:
+        self.cookies.append(cookie)
+
+
+    def quit(self) -> None:
+        self.quits += 1
+
+
+
+@skipUnless(importlib.util.find_spec('selenium'), 'selenium is not installed')
+class TestChromePool(IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        # the driver binary is not needed with FakeChrome
+        if 'yahoo_auction_auto.chrome' not in sys.modules and importlib.util.find_spec('chromedriver_binary') is None:
+            sys.modules['chromedriver_binary'] = types.ModuleType('chromedriver_binary')
+            self.addCleanup(sys.modules.pop, 'chromedriver_binary')
+        from yahoo_auction_auto import chrome
+        patcher = mock.patch.object(chrome, 'Chrome', FakeChrome)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        FakeChrome.started = []
+
+
+    async def test_set_cookies_while_borrowed(self) -> None:
+        async with YahooAuction([{'name': 'Y', 'value': 'old'}]) as ya:
+            pool = ya.start_chrome_pool(2)
+            with pool.borrow() as driver:
+                borrowed = next(d for d in FakeChrome.started if d is cast(object, driver))
+                ya.set_cookies([{'name': 'Y', 'value': 'new'}])
+                self.assertTrue(pool.closed)
+                self.assertEqual(borrowed.quits, 0)  # still in use
+            self.assertEqual(borrowed.quits, 1)
+            with self.assertRaises(RuntimeError):
+                with pool.borrow():
+                    pass
+        # no driver is restarted with the old cookies, and every one is quit once
+        self.assertEqual(len(FakeChrome.started), 2)
+        self.assertEqual([d.quits for d in FakeChrome.started], [1, 1])
+        # `cancel_with` waits explicitly, which an implicit wait would hold up
+        self.assertEqual([d.implicit_wait for d in FakeChrome.started], [0, 0])
+
+
+    async def test_close_wakes_waiters(self) -> None:
+        async with YahooAuction([]) as ya:
+            pool = ya.start_chrome_pool(1)
+            errors: list[Optional[BaseException]] = []
+
+            def wait() -> None:
+                try:
+                    with pool.borrow(timeout=5):
+                        errors.append(None)
+                except BaseException as e:
+                    errors.append(e)
+
+            with pool.borrow():
+                thread = threading.Thread(target=wait)
+                thread.start()
+                ya.close_chrome_pool()
+                thread.join(5)
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], RuntimeError)
+        self.assertEqual([d.quits for d in FakeChrome.started], [1])
@@ -0,0 +1,82 @@
+import asyncio
+import contextlib
+import csv
+import io
+import json
+import threading
+from typing import Iterator, Optional
+from unittest import TestCase
+from unittest.mock import patch
+
+from yahoo_auction_auto import cli
+from yahoo_auction_auto.stub import SELLING, StubServer
+
+
+@contextlib.contextmanager
+def _serve(server: StubServer) -> Iterator[StubServer]:
+    """ Run `server` on a thread of its own, as `cli.main` runs its own event loop. """
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result()
+    try:
+        yield server
+    finally:
+        asyncio.run_coroutine_threadsafe(server.stop(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def _run(argv: list[str], stdin: str = '', err: Optional[io.StringIO] = None) -> tuple[int, str]:
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err or io.StringIO()), patch('sys.stdin', io.StringIO(stdin)):
+        status = cli.main(argv)
+    return status, out.getvalue()
+
+
+class TestCLI(TestCase):
+
+    def test_read_aIDs(self) -> None:
+        self.assertEqual(cli.read_aIDs(['a1\n', '\n', '{"aID": "b2", "x": 1}\n']), ['a1', 'b2'])
+
+
+    def test_pipeline(self) -> None:
+        with _serve(StubServer(selling=5, per_page=2)) as server:
+            status, out = _run(['aids', 'selling', '--base-url', server.base_url])
+            self.assertEqual(status, 0)
+            aIDs = [json.loads(line)['aID'] for line in out.splitlines()]
+            self.assertEqual(aIDs, [item.aID for item in server.listed(SELLING)])
+
+            err = io.StringIO()
+            status, out = _run(['info', '--base-url', server.base_url, '-j', '2', '-f', 'csv'], out + 'missing\n', err)
+            self.assertEqual(status, 1)
+            self.assertIn('info missing: ', err.getvalue())
+            self.assertIn(f'info: {len(aIDs) + 1} aIDs, 1 failed', err.getvalue())
+            rows = list(csv.DictReader(io.StringIO(out)))
+            self.assertEqual(sorted(row['aID'] for row in rows), sorted(aIDs + ['missing']))
+            row = next(row for row in rows if row['aID'] == aIDs[0])
+            self.assertEqual(row['title'], server.items[aIDs[0]].title)
+            self.assertEqual(row['error'], '')
+            self.assertIn('404', next(row for row in rows if row['aID'] == 'missing')['error'])
+
+            status, out = _run(['cancel', aIDs[0], '--base-url', server.base_url, '--rate', '50'])
+            self.assertEqual(status, 0)
+            self.assertEqual(json.loads(out), {'aID': aIDs[0], 'cancelled': True})
+            self.assertEqual(server.cancelled, [aIDs[0]])
+
+
+    def test_usage(self) -> None:
+        with self.assertRaises(SystemExit):
+            _run([])
+        self.assertEqual(_run(['info', 'a1', '--concurrency', '0'])[0], 2)
+        self.assertEqual(_run(['info', 'a1', '--rate', '0'])[0], 2)
+        self.assertEqual(_run(['info', 'a1', '--rate', '-1'])[0], 2)
+        self.assertEqual(_run(['info', 'a1', '--retries', '-1'])[0], 2)
+        with patch.dict('os.environ', {'YAHOO_AUCTION_COOKIES': ''}):
+            self.assertEqual(_run(['aids', 'selling'])[0], 2)
+
+
+    def test_writer_is_abstract(self) -> None:
+        with self.assertRaises(TypeError):
+            cli.Writer(io.StringIO(), ('aID',))  # type: ignore[abstract]
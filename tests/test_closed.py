@@ -0,0 +1,92 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from yahoo_auction_auto import YahooAuction
+from yahoo_auction_auto.info.closed_with_winner import InfoClosedWithWinner
+from yahoo_auction_auto.info.closed_without_winner import InfoClosedWithoutWinner
+from yahoo_auction_auto.info.table import JST
+from yahoo_auction_auto.stub import CLOSED_WITH_WINNER, CLOSED_WITHOUT_WINNER, StubItem, StubServer
+from yahoo_auction_auto.watermark import ClosedWatermark
+
+
+def _newer(state: str, count: int) -> list[StubItem]:
+    """ Return items closed after the ones `StubServer` generates, newest first. """
+    now: datetime = datetime.now(JST).replace(tzinfo=None, second=0, microsecond=0)
+    ends = [now - timedelta(minutes=i + 1) for i in range(count)]
+    return [StubItem(f'{state[0]}9{i:09d}', state, end - timedelta(days=7), end) for i, end in enumerate(ends)]
+
+
+class TestClosedWatermark(TestCase):
+
+    def test_is_known(self) -> None:
+        watermark = ClosedWatermark()
+        self.assertFalse(watermark.is_known('a', datetime(2021, 1, 1)))
+        watermark.update(['b', 'a'], datetime(2021, 1, 2))
+        self.assertTrue(watermark.is_known('a'))
+        self.assertTrue(watermark.is_known('x', datetime(2021, 1, 1)))
+        self.assertFalse(watermark.is_known('x', datetime(2021, 1, 2)))  # closed at the same time as the newest
+        watermark.update(['c'], datetime(2021, 1, 1))
+        self.assertEqual(watermark.aIDs, ['c', 'b', 'a'])
+        self.assertEqual(watermark.end_datetime, datetime(2021, 1, 2))
+
+
+    def test_keep(self) -> None:
+        watermark = ClosedWatermark(keep=2)
+        watermark.update(['a'])
+        watermark.update(['c', 'b'])
+        self.assertEqual(watermark.aIDs, ['c', 'b'])
+        self.assertFalse(watermark.is_known('a'))
+
+
+    def test_save_and_load(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'watermark.json')
+            self.assertEqual(ClosedWatermark.load(path).aIDs, [])
+            ClosedWatermark(['a', 'b'], datetime(2021, 1, 2, 3, 4)).save(path)
+            watermark = ClosedWatermark.load(path)
+        self.assertEqual(watermark.aIDs, ['a', 'b'])
+        self.assertEqual(watermark.end_datetime, datetime(2021, 1, 2, 3, 4))
+
+
+
+class TestIncrementalSync(IsolatedAsyncioTestCase):
+
+    async def test_info_closed_with_winner(self) -> None:
+        async with StubServer(selling=0, closed_with_winner=120, per_page=50) as server:
+            watermark = ClosedWatermark()
+            async with YahooAuction([], urls=server.urls, parser='lxml') as ya:
+                infos = await ya.get_info_closed_with_winner(watermark)
+                self.assertEqual(server.requests['list'], 3)
+                items = server.listed(CLOSED_WITH_WINNER)
+                self.assertEqual([info.aID for info in infos], [item.aID for item in items])
+                self.assertIsInstance(infos[0], InfoClosedWithWinner)
+                self.assertEqual(infos[0].price, items[0].price)
+                self.assertEqual(watermark.end_datetime, items[0].end_datetime)
+
+                self.assertEqual(await ya.get_info_closed_with_winner(watermark), [])
+                self.assertEqual(server.requests['list'], 4)
+
+                new = _newer(CLOSED_WITH_WINNER, 2)
+                server.items = {**{item.aID: item for item in new}, **server.items}
+                infos = await ya.get_info_closed_with_winner(watermark)
+                self.assertEqual(server.requests['list'], 5)
+        self.assertEqual([info.aID for info in infos], [item.aID for item in new])
+
+
+    async def test_aIDs_closed_without_winner(self) -> None:
+        async with StubServer(selling=0, closed_without_winner=120, per_page=50) as server:
+            watermark = ClosedWatermark()
+            async with YahooAuction([], urls=server.urls) as ya:
+                aIDs = await ya.get_aIDs_closed_without_winner(watermark)
+                self.assertEqual(len(aIDs), 120)
+                new = _newer(CLOSED_WITHOUT_WINNER, 1)
+                server.items = {new[0].aID: new[0], **server.items}
+                requests = server.requests['list']
+                self.assertEqual(await ya.get_aIDs_closed_without_winner(watermark), [new[0].aID])
+                self.assertEqual(server.requests['list'], requests + 1)
+                self.assertEqual(len(await ya.get_aIDs_closed_without_winner()), 121)
+                infos = await ya.get_info_closed_without_winner()
+        self.assertIsInstance(infos[0], InfoClosedWithoutWinner)
+        self.assertEqual(infos[0].count_bid, 0)
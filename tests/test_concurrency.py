@@ -0,0 +1,36 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from yahoo_auction_auto.concurrency import as_completed_bounded
+
+
+class TestAsCompletedBounded(IsolatedAsyncioTestCase):
+
+    async def test_results_and_errors(self) -> None:
+        async def square(x: int) -> int:
+            await asyncio.sleep(0.001 * (5 - x))
+            if x == 3:
+                raise ValueError(x)
+            return x * x
+
+        results = {item: result async for item, result in as_completed_bounded(square, range(5), 2)}
+        self.assertEqual(set(results), set(range(5)))
+        self.assertIsInstance(results[3], ValueError)
+        self.assertEqual(results[4], 16)
+
+
+    async def test_concurrency_limit(self) -> None:
+        running: int = 0
+        peak: int = 0
+
+        async def track(x: int) -> int:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.001)
+            running -= 1
+            return x
+
+        items = [item async for item, _ in as_completed_bounded(track, range(20), 3)]
+        self.assertEqual(sorted(items), list(range(20)))
+        self.assertEqual(peak, 3)
@@ -0,0 +1,23 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+
+class TestImport(TestCase):
+
+    def test_heavy_modules_are_not_imported(self) -> None:
+        code: str = (
+            'import sys; from yahoo_auction_auto import YahooAuction; '
+            'print(",".join(m for m in ("selenium", "chromedriver_binary", "bs4", "lxml") if m in sys.modules))'
+        )
+        result = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True)
+        self.assertEqual(result.stdout.strip(), '')
+
+
+    def test_cli_help_loads_no_library(self) -> None:
+        code: str = (
+            'import sys, yahoo_auction_auto.cli as cli; '
+            'print(",".join(m for m in ("selenium", "bs4", "lxml", "yahoo_auction_auto.client") if m in sys.modules))'
+        )
+        result = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True)
+        self.assertEqual(result.stdout.strip(), '')
@@ -0,0 +1,127 @@
+import asyncio
+from urllib.parse import urlsplit
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from yahoo_auction_auto import YahooAuction
+from yahoo_auction_auto.limiter import HostLimiter, Limiter
+from yahoo_auction_auto.stub import StubServer
+
+
+class TestHostLimiter(TestCase):
+
+    def test_increase(self) -> None:
+        limiter = HostLimiter('h', concurrency=2.0, max_concurrency=3.0)
+        for _ in range(2):
+            limiter.in_flight += 1
+            limiter.release(200, 0.1)
+        self.assertAlmostEqual(limiter.concurrency, 2.0 + 1 / 2 + 1 / 2.5)
+        for _ in range(10):
+            limiter.in_flight += 1
+            limiter.release(200, 0.1)
+        self.assertEqual(limiter.concurrency, 3.0)
+        self.assertEqual(limiter.stats().successes, 12)
+
+
+    def test_decrease_once_per_burst(self) -> None:
+        limiter = HostLimiter('h', concurrency=8.0)
+        limiter.in_flight = 4
+        for _ in range(4):
+            limiter.release(503, 0.1)
+        self.assertEqual(limiter.concurrency, 4.0)
+        limiter.in_flight += 1
+        limiter.release(429, 0.1)
+        self.assertEqual(limiter.concurrency, 2.0)
+        stats = limiter.stats()
+        self.assertEqual((stats.failures, stats.throttled, stats.decreases), (5, 1, 2))
+
+
+    def test_latency(self) -> None:
+        limiter = HostLimiter('h', concurrency=8.0, smoothing=0.5)
+        for latency in (0.1, 0.1, 0.5):
+            limiter.in_flight += 1
+            limiter.release(200, latency)
+        self.assertLess(limiter.concurrency, 8.0)
+        self.assertEqual(limiter.decreases, 1)
+
+
+    def test_client_errors_are_healthy(self) -> None:
+        limiter = HostLimiter('h', concurrency=2.0)
+        limiter.in_flight += 1
+        limiter.release(404, 0.1)
+        self.assertGreater(limiter.concurrency, 2.0)
+
+
+    def test_limiter(self) -> None:
+        limiter = Limiter(concurrency=2.0)
+        self.assertIs(limiter.host('http://a:1/x'), limiter.host('http://a:1/y'))
+        self.assertIsNot(limiter.host('http://a:1/x'), limiter.host('http://a:2/x'))
+        self.assertEqual(list(limiter.stats()), ['a:1', 'a:2'])
+        with self.assertRaises(ValueError):
+            Limiter(concurrency=0.5)
+
+
+
+class TestHostLimiterAsync(IsolatedAsyncioTestCase):
+
+    async def test_concurrency(self) -> None:
+        limiter = HostLimiter('h', concurrency=2.0, max_concurrency=2.0)
+        running = 0
+        peak = 0
+
+        async def request() -> None:
+            nonlocal running, peak
+            await limiter.acquire()
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            limiter.release(200, 0.01)
+
+        await asyncio.gather(*(request() for _ in range(6)))
+        self.assertEqual(peak, 2)
+        self.assertEqual(limiter.in_flight, 0)
+
+
+    async def test_cancelled_waiter(self) -> None:
+        limiter = HostLimiter('h', concurrency=1.0, max_concurrency=1.0)
+        await limiter.acquire()
+        waiting = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiting.cancel()
+        limiter.release(200, 0.01)
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+        await asyncio.wait_for(limiter.acquire(), 1.0)
+
+
+    async def test_pause_while_waiting(self) -> None:
+        limiter = HostLimiter('h', concurrency=1.0, max_concurrency=1.0)
+        await limiter.acquire()
+        waiting = [asyncio.create_task(limiter.acquire()) for _ in range(2)]
+        await asyncio.sleep(0)
+        # the waiters are queued before the pause begins
+        limiter.release(429, 0.01, retry_after=0.2)
+        await asyncio.sleep(0.1)
+        self.assertFalse(any(task.done() for task in waiting))
+        self.assertEqual(limiter.in_flight, 0)
+        done, pending = await asyncio.wait(waiting, timeout=1.0, return_when=asyncio.FIRST_COMPLETED)
+        self.assertEqual((len(done), len(pending)), (1, 1))
+        limiter.release(200, 0.01)
+        await asyncio.wait_for(pending.pop(), 1.0)
+        self.assertEqual(limiter.in_flight, 1)
+
+
+
+class TestLimiterWithServer(IsolatedAsyncioTestCase):
+
+    async def test_back_off(self) -> None:
+        limiter = Limiter(concurrency=8.0)
+        async with StubServer(selling=8, error_rate=1.0, error_statuses=[503], error_routes=['detail']) as server:
+            async with YahooAuction([], urls=server.urls, limiter=limiter) as ya:
+                aIDs = await ya.get_aIDs_selling()
+                async for _ in ya.get_info_selling_many(aIDs):
+                    pass
+                stats = ya.limiter_stats()[urlsplit(server.base_url).netloc]
+        self.assertLess(stats.concurrency, 8.0)
+        self.assertEqual(stats.failures, 8)
+        self.assertEqual(stats.in_flight, 0)
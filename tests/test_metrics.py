@@ -0,0 +1,95 @@
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from yahoo_auction_auto import YahooAuction
+from yahoo_auction_auto.metrics import Event, Metrics, PrometheusExporter, measure
+from yahoo_auction_auto.stub import SELLING, StubServer
+
+
+class TestMetrics(TestCase):
+
+    def test_measure(self) -> None:
+        events: list[Event] = []
+        metrics = Metrics(events.append)
+        with metrics.measure('call', call='f') as values:
+            values['items'] = 3
+        with self.assertRaises(KeyError):
+            with metrics.measure('call', call='g'):
+                raise KeyError()
+        self.assertEqual([e.labels for e in events], [
+            {'call': 'f', 'error': 'none'},
+            {'call': 'g', 'error': 'KeyError'},
+        ])
+        self.assertEqual(events[0].values, {'items': 3})
+
+
+    def test_measure_off(self) -> None:
+        with measure(None, 'call') as values:
+            values['items'] = 1
+
+
+    def test_exporter(self) -> None:
+        exporter = PrometheusExporter(buckets=(0.1, 1.0))
+        metrics = Metrics(exporter)
+        metrics.emit('request', 0.5, {'kind': 'detail', 'status': '200'}, connect_seconds=0.05, bytes=100)
+        metrics.emit('request', 2.0, {'kind': 'detail', 'status': '200'}, connect_seconds=0.0, bytes=50)
+        text = exporter.render()
+        self.assertIn('# TYPE yahoo_auction_request_total counter', text)
+        self.assertIn('yahoo_auction_request_total{kind="detail",status="200"} 2.0', text)
+        self.assertIn('yahoo_auction_request_bytes_total{kind="detail",status="200"} 150.0', text)
+        self.assertIn('yahoo_auction_request_seconds_bucket{kind="detail",status="200",le="1.0"} 1', text)
+        self.assertIn('yahoo_auction_request_seconds_bucket{kind="detail",status="200",le="+Inf"} 2', text)
+        self.assertIn('yahoo_auction_request_connect_seconds_sum{kind="detail",status="200"} 0.05', text)
+        openmetrics = exporter.render(openmetrics=True)
+        self.assertIn('# TYPE yahoo_auction_request counter', openmetrics)
+        self.assertTrue(openmetrics.endswith('# EOF\n'))
+
+
+    def test_exporter_infinity(self) -> None:
+        exporter = PrometheusExporter(buckets=(1.0, float('inf')))
+        Metrics(exporter).emit('request', float('inf'), {}, ratio=float('nan'))
+        text = exporter.render(openmetrics=True)
+        self.assertEqual(text.count('yahoo_auction_request_seconds_bucket{le="+Inf"} 1'), 1)
+        self.assertIn('yahoo_auction_request_seconds_sum +Inf', text)
+        self.assertIn('yahoo_auction_request_ratio_total NaN', text)
+
+
+
+class TestInstrumentation(IsolatedAsyncioTestCase):
+
+    async def test_events(self) -> None:
+        events: list[Event] = []
+        async with StubServer(selling=5, per_page=2) as server:
+            async with YahooAuction([], urls=server.urls, metrics=Metrics(events.append), parser='lxml') as ya:
+                self.assertTrue(await ya.check_login())
+                aIDs = await ya.get_aIDs_selling()
+                await ya.get_info_selling(aIDs[0])
+
+        requests = [e for e in events if e.name == 'request']
+        self.assertEqual([e.labels['kind'] for e in requests], ['login', 'list', 'list', 'list', 'detail'])
+        self.assertTrue(all(e.labels['status'] == '200' for e in requests))
+        self.assertGreater(requests[0].values['connect_seconds'], 0)
+        self.assertEqual(requests[1].values['connect_seconds'], 0)  # reused connection
+        self.assertTrue(all(e.values['bytes'] > 0 for e in requests))
+
+        pagination = [e for e in events if e.name == 'pagination']
+        self.assertEqual(len(pagination), 1)
+        self.assertEqual(pagination[0].values, {'pages': 3, 'items': 5})
+
+        parses = [e.labels for e in events if e.name == 'parse']
+        self.assertEqual(parses[-1], {'kind': 'detail', 'parser': 'lxml', 'error': 'none'})
+        calls = [e.labels['call'] for e in events if e.name == 'call']
+        self.assertEqual(calls, ['check_login', 'InfoSelling.update'])
+
+
+    async def test_closed_iterator_is_not_an_error(self) -> None:
+        events: list[Event] = []
+        async with StubServer(selling=5, per_page=2) as server:
+            async with YahooAuction([], urls=server.urls, metrics=Metrics(events.append)) as ya:
+                urls = ya.iter_urls_selling()
+                async for _ in urls:
+                    break
+                await urls.aclose()  # type: ignore[attr-defined]
+        pagination = [e for e in events if e.name == 'pagination']
+        self.assertEqual(pagination[0].labels['error'], 'none')
+        self.assertEqual(pagination[0].values['pages'], 1)
+        self.assertEqual(server.listed(SELLING)[0].aID, 's0000000000')
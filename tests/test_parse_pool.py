@@ -0,0 +1,44 @@
+import pickle
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from yahoo_auction_auto import YahooAuction
+from yahoo_auction_auto.parsers import get_parser
+from yahoo_auction_auto.parsers.pool import ParsePool
+from yahoo_auction_auto.stub import SELLING, StubServer
+
+
+class TestParserPickle(TestCase):
+
+    def test_registered_parser_is_pickled_by_name(self) -> None:
+        for name in ('bs4', 'lxml'):
+            parser = get_parser(name)
+            self.assertIs(pickle.loads(pickle.dumps(parser)), parser)
+            self.assertLess(len(pickle.dumps(parser.detail)), 200)
+
+
+
+class TestParsePool(IsolatedAsyncioTestCase):
+
+    async def _sync(self, pool: ParsePool, parser: str) -> None:
+        async with StubServer(selling=7, per_page=3) as server:
+            async with YahooAuction([], urls=server.urls, parser=parser, parse_pool=pool) as ya:
+                aIDs = await ya.get_aIDs_selling()
+                summaries = await ya.get_summaries_selling()
+                info = await ya.get_info_selling(aIDs[2])
+        items = server.listed(SELLING)
+        self.assertEqual(aIDs, [item.aID for item in items])
+        self.assertEqual([s.title for s in summaries], [item.title for item in items])
+        self.assertEqual(info.title, items[2].title)
+        self.assertEqual(info.count_watch, items[2].count_watch)
+
+
+    async def test_processes(self) -> None:
+        with ParsePool(workers=2) as pool:
+            await self._sync(pool, 'lxml')
+            await self._sync(pool, 'bs4')
+        self.assertIsNone(pool._executor)
+
+
+    async def test_threads(self) -> None:
+        with ParsePool(workers=2, threads=True) as pool:
+            await self._sync(pool, 'bs4-partial')
@@ -0,0 +1,143 @@
+import re
+from datetime import datetime
+from unittest import TestCase
+
+from yahoo_auction_auto.info.selling import InfoSelling
+from yahoo_auction_auto.parsers import PARSERS, Parser, get_parser
+
+_PATTERN = re.compile(r'^rsec:itm;slk:tc;')
+_NOW = datetime(2021, 10, 13)
+
+_DUPLICATES: bytes = '''<html><body>
+<div class="ProductTitle">
+<h2 class="ProductTitle__text">not a title</h2>
+<h1 class="ProductTitle__text">first</h1>
+<h1 class="ProductTitle__text">second</h1>
+</div>
+<dl class="ProductDetail">
+<dt class="ProductDetail__title">個数</dt><dd class="other">：9</dd><dd class="ProductDetail__description">：2</dd>
+<dt class="ProductDetail__title">個数</dt><dd class="ProductDetail__description">：3</dd>
+</dl>
+<a data-ylk="rsec:pagination;slk:next;pos:1">次へ</a>
+<a href="/2" data-ylk="rsec:pagination;slk:next;pos:2">次へ</a>
+</body></html>'''.encode()
+
+
+class TestParser(TestCase):
+    """ Conformance suite every backend in `PARSERS` passes. """
+    parser: str = ''
+
+    def setUp(self) -> None:
+        if not self.parser:
+            self.skipTest('no backend')
+        self.backend: Parser = get_parser(self.parser)
+        with open('tests/info/test_selling.html', 'rb') as f:
+            self.detail: bytes = f.read()
+        with open('tests/info/test_summary.html', 'rb') as f:
+            self.list: bytes = f.read()
+
+
+    def test_declared_charset(self) -> None:
+        for charset in ('EUC-JP', 'Shift_JIS'):
+            page: bytes = (
+                f'<html><head><meta http-equiv="Content-Type" content="text/html; charset={charset}"></head>'
+                '<body><div class="ProductTitle"><h1 class="ProductTitle__text">タイトル</h1></div></body></html>'
+            ).encode(charset)
+            info = InfoSelling('a1')
+            info.parse(page, parser=self.backend)
+            self.assertEqual(info.title, 'タイトル', charset)
+
+
+    def test_name(self) -> None:
+        self.assertEqual(self.backend.name, self.parser)
+        self.assertIs(get_parser(self.parser), self.backend)
+
+
+    def test_detail(self) -> None:
+        info = InfoSelling('a1')
+        info.parse(self.detail, parser=self.backend)
+        self.assertEqual(info.title, 'title')
+        self.assertEqual(info.seller_name, 'seller_name')
+        self.assertEqual(info.stack, 1)
+        self.assertEqual(info.start_datetime, datetime(2021, 10, 12, 19, 54))
+        self.assertEqual(info.end_datetime, datetime(2021, 10, 15, 19, 54))
+        self.assertFalse(info.refundable)
+        self.assertEqual(info.startprice, '10,000 円（税 0 円）')
+        self.assertEqual(info.timeleft, '19時間')
+        self.assertEqual(info.count_bid, 0)
+        self.assertEqual(info.count_access, 0)
+        self.assertEqual(info.count_watch, 0)
+
+
+    def test_index(self) -> None:
+        index = self.backend.detail(self.detail)
+        self.assertEqual(index.details['オークションID'], '：10000000000')
+        self.assertEqual(set(index.counts), {'入札件数', '残り時間'})
+        self.assertEqual(index.statistics, {'access': '0', 'watch': '0'})
+
+
+    def test_first_occurrence_wins(self) -> None:
+        index = self.backend.detail(_DUPLICATES)
+        self.assertEqual(index.title, 'first')
+        self.assertEqual(index.details, {'個数': '：2'})
+        self.assertEqual(self.backend.list_page(_DUPLICATES, _PATTERN), ([], None))
+
+
+    def test_list_page(self) -> None:
+        urls, next_page = self.backend.list_page(self.list, _PATTERN)
+        self.assertEqual(urls, [
+            'https://page.auctions.yahoo.co.jp/jp/auction/a1000000000',
+            'https://page.auctions.yahoo.co.jp/jp/auction/b2000000000',
+        ])
+        self.assertEqual(next_page, 'https://auctions.yahoo.co.jp/openuser/jp/show/mystatus?select=selling&apg=2')
+
+
+    def test_summary_page(self) -> None:
+        summaries, next_page = self.backend.summary_page(self.list, _PATTERN, _NOW)
+        self.assertEqual([s.aID for s in summaries], ['a1000000000', 'b2000000000'])
+        self.assertEqual([s.title for s in summaries], ['title 1', 'title 2'])
+        self.assertEqual([s.price for s in summaries], [10000, 500])
+        self.assertEqual([s.count_bid for s in summaries], [3, 0])
+        self.assertEqual(
+            [s.end_datetime for s in summaries],
+            [datetime(2021, 10, 15, 19, 54), datetime(2022, 1, 2, 9, 5)]
+        )
+        self.assertIsNotNone(next_page)
+
+
+    def test_same_as_bs4(self) -> None:
+        reference: Parser = get_parser('bs4')
+        self.assertEqual(self.backend.detail(self.detail).__dict__, reference.detail(self.detail).__dict__)
+        self.assertEqual(self.backend.list_page(self.list, _PATTERN), reference.list_page(self.list, _PATTERN))
+        summaries, next_page = self.backend.summary_page(self.list, _PATTERN, _NOW)
+        expected, expected_next = reference.summary_page(self.list, _PATTERN, _NOW)
+        self.assertEqual([s.__dict__ for s in summaries], [s.__dict__ for s in expected])
+        self.assertEqual(next_page, expected_next)
+
+
+
+class TestBs4Parser(TestParser):
+    parser = 'bs4'
+
+
+
+class TestBs4PartialParser(TestParser):
+    parser = 'bs4-partial'
+
+
+
+class TestLxmlParser(TestParser):
+    parser = 'lxml'
+
+
+
+class TestGetParser(TestCase):
+
+    def test_every_backend_is_tested(self) -> None:
+        tested = {cls.parser for cls in TestParser.__subclasses__()}
+        self.assertEqual(tested, set(PARSERS))
+
+
+    def test_unknown(self) -> None:
+        with self.assertRaises(ValueError):
+            get_parser('html5lib')
@@ -0,0 +1,169 @@
+import asyncio
+import time
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+import httpx
+
+from yahoo_auction_auto import YahooAuction
+from yahoo_auction_auto.client import HTTPClient
+from yahoo_auction_auto.limiter import Limiter
+from yahoo_auction_auto.retry import Hedging, RetryBudget, RetryPolicy
+from yahoo_auction_auto.stub import StubServer
+
+URL: str = 'https://page.auctions.yahoo.co.jp/jp/auction/a1'
+
+
+class TestRetryPolicy(TestCase):
+
+    def test_delay(self) -> None:
+        policy = RetryPolicy(attempts=3, backoff=1.0, max_backoff=1.5)
+        self.assertLessEqual(policy.delay(0) or 0.0, 1.0)
+        self.assertEqual(policy.delay(1, retry_after=5.0), 1.5)
+        self.assertIsNone(policy.delay(2))
+
+
+    def test_budget(self) -> None:
+        budget = RetryBudget(ratio=0.5, capacity=1.0)
+        policy = RetryPolicy(budget=budget)
+        self.assertIsNotNone(policy.delay(0))
+        self.assertIsNone(policy.delay(0))
+        budget.deposit()
+        budget.deposit()
+        self.assertIsNotNone(policy.delay(0))
+        self.assertEqual((budget.withdrawn, budget.rejected), (2, 1))
+
+
+    def test_hedging_delay(self) -> None:
+        hedging = Hedging(initial=2.0, min_samples=10, min_delay=0.0)
+        self.assertEqual(hedging.delay('detail'), 2.0)
+        for i in range(1, 101):
+            hedging.observe('detail', i / 100)
+        self.assertEqual(hedging.delay('detail'), 0.95)
+        self.assertEqual(hedging.delay('list'), 2.0)
+
+
+
+class TestRetry(IsolatedAsyncioTestCase):
+
+    async def test_retry_status(self) -> None:
+        statuses = [503, 502, 200]
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(statuses[len(requests) - 1], content=b'page')
+
+        retry = RetryPolicy(backoff=0.0)
+        async with HTTPClient({}, transport=httpx.MockTransport(handler), retry=retry) as client:
+            response = await client.get(URL, kind='detail')
+        self.assertEqual(response.content, b'page')
+        self.assertEqual(len(requests), 3)
+
+
+    async def test_retry_gives_up(self) -> None:
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            raise httpx.ConnectTimeout('timeout', request=request)
+
+        retry = RetryPolicy(attempts=2, backoff=0.0)
+        async with HTTPClient({}, transport=httpx.MockTransport(handler), retry=retry) as client:
+            with self.assertRaises(httpx.ConnectTimeout):
+                await client.get(URL)
+            with self.assertRaises(httpx.ConnectTimeout):
+                await client.post(URL, {'a': 'b'})
+        self.assertEqual(len(requests), 3)  # POST is not retried
+
+
+    async def test_retry_with_server(self) -> None:
+        async with StubServer(selling=3, error_rate=0.5, error_statuses=[503], seed=1) as server:
+            retry = RetryPolicy(attempts=10, backoff=0.0, max_backoff=0.0, budget=RetryBudget(capacity=100))
+            async with YahooAuction([], urls=server.urls, retry=retry, limiter=Limiter()) as ya:
+                aIDs = await ya.get_aIDs_selling()
+                info = await ya.get_info_selling(aIDs[0])
+        self.assertEqual(len(aIDs), 3)
+        self.assertEqual(info.aID, aIDs[0])
+        self.assertGreater(retry.budget.withdrawn, 0)
+
+
+
+class TestHedging(IsolatedAsyncioTestCase):
+
+    async def test_first_response_is_kept(self) -> None:
+        requests: list[httpx.Request] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if len(requests) == 1:
+                await asyncio.sleep(10)
+            return httpx.Response(200, content=str(len(requests)).encode())
+
+        hedging = Hedging(initial=0.01)
+        async with HTTPClient({}, transport=httpx.MockTransport(handler), hedging=hedging) as client:
+            response = await asyncio.wait_for(client.get(URL), 5)
+        self.assertEqual(response.content, b'2')
+        self.assertEqual((hedging.hedged, hedging.won), (1, 1))
+
+
+    async def test_fast_response_is_not_hedged(self) -> None:
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200)
+
+        hedging = Hedging(initial=1.0, budget=RetryBudget())
+        async with HTTPClient({}, transport=httpx.MockTransport(handler), hedging=hedging) as client:
+            await client.get(URL)
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(hedging.hedged, 0)
+
+
+    async def test_failed_hedge_waits_for_the_other(self) -> None:
+        requests: list[httpx.Request] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if len(requests) == 1:
+                await asyncio.sleep(0.05)
+                return httpx.Response(200, content=b'first')
+            raise httpx.ConnectError('refused', request=request)
+
+        hedging = Hedging(initial=0.01)
+        async with HTTPClient({}, transport=httpx.MockTransport(handler), hedging=hedging) as client:
+            response = await client.get(URL)
+        self.assertEqual(response.content, b'first')
+        self.assertEqual(hedging.won, 0)
+
+
+    async def test_retryable_status_does_not_win(self) -> None:
+        requests: list[httpx.Request] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if len(requests) == 1:
+                await asyncio.sleep(0.05)
+                return httpx.Response(503)
+            await asyncio.sleep(0.2)
+            return httpx.Response(200, content=b'second')
+
+        hedging = Hedging(initial=0.01)
+        async with HTTPClient({}, transport=httpx.MockTransport(handler), hedging=hedging) as client:
+            response = await client.get(URL)
+        self.assertEqual(response.content, b'second')
+        self.assertEqual(hedging.won, 1)
+
+
+    async def test_latency_excludes_limiter_wait(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200)
+
+        hedging = Hedging(initial=10.0)
+        limiter = Limiter(rate=5.0, burst=1.0)
+        async with HTTPClient({}, transport=httpx.MockTransport(handler), hedging=hedging, limiter=limiter) as client:
+            started = time.monotonic()
+            await asyncio.gather(client.get(URL), client.get(URL))
+            self.assertGreaterEqual(time.monotonic() - started, 0.15)  # the second waited for a token
+        self.assertEqual(len(hedging._latencies['other']), 2)
+        self.assertLess(max(hedging._latencies['other']), 0.1)
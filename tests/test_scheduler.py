@@ -0,0 +1,127 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Optional
+from unittest import IsolatedAsyncioTestCase
+
+from yahoo_auction_auto.info.selling import MISSING_DATETIME, InfoSelling
+from yahoo_auction_auto.info.table import from_epoch
+from yahoo_auction_auto.scheduler import RefreshScheduler
+
+
+def _info(aID: str, end: float, count_bid: int = 0) -> InfoSelling:
+    info = InfoSelling(aID)
+    info.end_datetime = from_epoch(int(end))
+    info.count_bid = count_bid
+    return info
+
+
+class _FakeYahooAuction:
+
+    def __init__(self, ends: dict[str, float], delays: Optional[dict[str, float]] = None) -> None:
+        self.ends = ends
+        self.delays = delays or {}
+        self.fetched: list[str] = []
+        self.running: list[str] = []
+        self.overlapped: list[str] = []  # aIDs fetched while already being fetched
+
+
+    async def get_info_selling(self, aID: str) -> InfoSelling:
+        self.fetched.append(aID)
+        if aID in self.running:
+            self.overlapped.append(aID)
+        self.running.append(aID)
+        try:
+            await asyncio.sleep(self.delays.get(aID, 0.0))
+        finally:
+            self.running.remove(aID)
+        return _info(aID, self.ends[aID])
+
+
+
+class TestRefreshScheduler(IsolatedAsyncioTestCase):
+
+    def test_next_due(self) -> None:
+        scheduler = RefreshScheduler(_FakeYahooAuction({}), min_interval=30, max_interval=3600)  # type: ignore[arg-type]
+        now: float = 1_600_000_000
+        soon = scheduler.next_due(_info('a', now + 120), None, now)
+        later = scheduler.next_due(_info('b', now + 3 * 86400), None, now)
+        self.assertEqual(soon, now + 30)
+        self.assertEqual(later, now + 3600)
+        self.assertIsNone(scheduler.next_due(_info('c', now - 60), None, now))
+
+        active = scheduler.next_due(_info('d', now + 86400, count_bid=2), _info('d', now + 86400), now)
+        self.assertEqual(active, now + 900)
+
+
+    async def test_run_drops_ended(self) -> None:
+        now: float = time.time()
+        ya = _FakeYahooAuction({'ended': now - 60, 'open': now + 86400})
+        scheduler = RefreshScheduler(ya, budget_per_minute=600)  # type: ignore[arg-type]
+        scheduler.add(['ended', 'open'])
+        seen: set[str] = set()
+        async for aID, _ in scheduler.run():
+            seen.add(aID)
+            if len(seen) == 2:
+                break
+        self.assertEqual(seen, {'ended', 'open'})
+        self.assertEqual(len(scheduler), 1)
+
+
+    def test_next_due_without_end(self) -> None:
+        scheduler = RefreshScheduler(_FakeYahooAuction({}), max_interval=3600)  # type: ignore[arg-type]
+        info = InfoSelling('a')
+        info.end_datetime = MISSING_DATETIME
+        with self.assertLogs('yahoo_auction_auto.scheduler', 'WARNING'):
+            self.assertEqual(scheduler.next_due(info, None, 1_600_000_000), 1_600_003_600)
+
+
+    async def test_slow_fetch_does_not_hold_others(self) -> None:
+        now: float = time.time()
+        ends: dict[str, float] = {aID: now + 86400 for aID in ('slow', 'fast1', 'fast2')}
+        ya = _FakeYahooAuction(ends, {'slow': 0.5})
+        scheduler = RefreshScheduler(ya, budget_per_minute=6000, concurrency=2)  # type: ignore[arg-type]
+        scheduler.add('slow', now - 2)
+        scheduler.add('fast1', now - 1)
+        scheduler.add('fast2', now)
+        order: list[str] = []
+        async for aID, _ in scheduler.run():
+            order.append(aID)
+            if len(order) == 3:
+                break
+        self.assertEqual(order, ['fast1', 'fast2', 'slow'])
+
+
+    async def test_add_wakes_run(self) -> None:
+        now: float = time.time()
+        ya = _FakeYahooAuction({'open': now + 86400, 'new': now + 86400})
+        scheduler = RefreshScheduler(ya, budget_per_minute=6000)  # type: ignore[arg-type]
+        scheduler.add('open')
+        iterator = scheduler.run()
+        aID, _ = await iterator.__anext__()
+        self.assertEqual(aID, 'open')  # due again in an hour
+        next_item = asyncio.ensure_future(iterator.__anext__())
+        await asyncio.sleep(0.05)
+        scheduler.add('new')
+        aID, _ = await asyncio.wait_for(next_item, 1.0)
+        self.assertEqual(aID, 'new')
+        await iterator.aclose()
+
+
+    async def test_add_while_fetching(self) -> None:
+        now: float = time.time()
+        ya = _FakeYahooAuction({'a': now + 86400, 'b': now + 86400}, {'a': 0.2})
+        scheduler = RefreshScheduler(ya, budget_per_minute=6000, concurrency=2)  # type: ignore[arg-type]
+        scheduler.add('a')
+        iterator = scheduler.run()
+        first = asyncio.ensure_future(iterator.__anext__())
+        await asyncio.sleep(0.05)
+        scheduler.add('a')  # while the first fetch of it is running
+        scheduler.add('b')
+        seen: list[str] = [(await asyncio.wait_for(first, 1.0))[0]]
+        while len(seen) < 3:
+            seen.append((await asyncio.wait_for(iterator.__anext__(), 1.0))[0])
+        await iterator.aclose()
+        self.assertEqual(sorted(seen), ['a', 'a', 'b'])
+        self.assertEqual(ya.fetched.count('a'), 2)
+        self.assertEqual(ya.overlapped, [])
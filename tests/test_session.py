@@ -0,0 +1,123 @@
+import asyncio
+import os
+import tempfile
+import threading
+from typing import Any
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from yahoo_auction_auto import YahooAuction
+from yahoo_auction_auto.session import LoginRequired, SessionManager, load_cookies, save_cookies
+from yahoo_auction_auto.stub import SELLING, StubServer
+
+
+def _cookies(value: str) -> list[dict[str, Any]]:
+    return [{'name': 'Y', 'value': value, 'domain': '.yahoo.co.jp'}]
+
+
+
+class Fetch:
+    """ Stand-in of a Chrome profile, returning `cookies` after `delay` seconds. """
+
+    def __init__(self, cookies: list[dict[str, Any]], delay: float = 0.05) -> None:
+        self.cookies: list[dict[str, Any]] = cookies
+        self.delay: float = delay
+        self.calls: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+
+    def __call__(self) -> list[dict[str, Any]]:
+        with self._lock:
+            self.calls += 1
+        threading.Event().wait(self.delay)
+        return self.cookies
+
+
+
+class TestSaveCookies(TestCase):
+
+    def test_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cookies.json')
+            save_cookies(path, _cookies('old'))
+            save_cookies(path, _cookies('new'))
+            self.assertEqual(load_cookies(path), _cookies('new'))
+            self.assertEqual(os.listdir(directory), ['cookies.json'])
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+
+
+    def test_failed_write_keeps_file(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cookies.json')
+            save_cookies(path, _cookies('old'))
+            with self.assertRaises(TypeError):
+                save_cookies(path, [{'name': 'Y', 'value': object()}])
+            self.assertEqual(load_cookies(path), _cookies('old'))
+            self.assertEqual(os.listdir(directory), ['cookies.json'])
+
+
+
+class TestSessionManager(IsolatedAsyncioTestCase):
+
+    async def test_requires_source(self) -> None:
+        async with YahooAuction([]) as ya:
+            with self.assertRaises(ValueError):
+                SessionManager(ya)
+
+
+    async def test_check_login_cached(self) -> None:
+        async with StubServer(cookies={'Y': 'y'}) as server:
+            async with YahooAuction(_cookies('y'), urls=server.urls) as ya:
+                session = ya.open_session(fetch=Fetch(_cookies('y')))
+                results = await asyncio.gather(*(session.check_login() for _ in range(5)))
+                self.assertEqual(results, [True] * 5)
+                self.assertTrue(await session.check_login())
+                self.assertEqual(server.requests['mypage'], 1)
+                self.assertTrue(await session.check_login(max_age=0))
+                self.assertEqual(server.requests['mypage'], 2)
+
+
+    async def test_ensure_login(self) -> None:
+        async with StubServer(cookies={'Y': 'new'}) as server:
+            async with YahooAuction(_cookies('old'), urls=server.urls) as ya:
+                fetch = Fetch(_cookies('new'))
+                session = ya.open_session(fetch=fetch)
+                await session.ensure_login()
+                await session.ensure_login()
+                self.assertTrue(await ya.check_login())
+        self.assertEqual(fetch.calls, 1)
+        self.assertEqual(ya.cookies, _cookies('new'))
+
+
+    async def test_requests_share_one_refresh(self) -> None:
+        async with StubServer(selling=8, cookies={'Y': 'new'}) as server:
+            items = server.listed(SELLING)
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'cookies.json')
+                save_cookies(path, _cookies('old'))
+                async with YahooAuction(load_cookies(path), urls=server.urls, parser='lxml') as ya:
+                    fetch = Fetch(_cookies('new'))
+                    session = ya.open_session(path=path, fetch=fetch)
+                    infos = await asyncio.gather(*(ya.get_info_selling(item.aID) for item in items))
+                    self.assertEqual(load_cookies(path), _cookies('new'))
+        self.assertEqual([info.title for info in infos], [item.title for item in items])
+        self.assertEqual(fetch.calls, 1)
+        self.assertEqual(session.refreshes, 1)
+        self.assertLessEqual(server.requests['detail'], 2 * len(items))
+
+
+    async def test_failed_refresh(self) -> None:
+        def logged_out() -> list[dict[str, Any]]:
+            calls.append(1)
+            raise LoginRequired('profile is logged out')
+
+        calls: list[int] = []
+        async with StubServer(cookies={'Y': 'new'}) as server:
+            async with YahooAuction(_cookies('old'), urls=server.urls) as ya:
+                session = ya.open_session(fetch=logged_out)
+                results = await asyncio.gather(*(session.ensure_login() for _ in range(3)), return_exceptions=True)
+                self.assertTrue(all(isinstance(result, LoginRequired) for result in results))
+                # within min_interval, a redirected request is not refreshed for again
+                self.assertFalse(await session.on_login_required())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(session.failures, 1)
+        self.assertEqual(ya.cookies, _cookies('old'))
@@ -0,0 +1,38 @@
+import re
+from unittest import TestCase
+
+from yahoo_auction_auto.parsers.bs4_parser import Bs4Parser
+from yahoo_auction_auto.info.selling import InfoSelling
+
+
+class TestPartialParse(TestCase):
+
+    def setUp(self) -> None:
+        with open('tests/info/test_selling.html', 'rb') as f:
+            self.detail: bytes = f.read()
+        with open('tests/info/test_summary.html', 'rb') as f:
+            self.list: bytes = f.read()
+        self.pattern = re.compile(r'^rsec:itm;slk:tc;')
+
+
+    def test_detail(self) -> None:
+        full = InfoSelling('a1')
+        full.parse(self.detail)
+        partial = InfoSelling('a1')
+        partial.parse(self.detail, partial=True)
+        self.assertEqual(full.__dict__, partial.__dict__)
+
+
+    def test_list(self) -> None:
+        full = Bs4Parser().list_page(self.list, self.pattern)
+        partial = Bs4Parser(partial=True).list_page(self.list, self.pattern)
+        self.assertEqual(full, partial)
+        self.assertEqual(len(full[0]), 2)
+        self.assertIsNotNone(full[1])
+
+
+    def test_summary(self) -> None:
+        full, full_next = Bs4Parser().summary_page(self.list, self.pattern)
+        partial, partial_next = Bs4Parser(partial=True).summary_page(self.list, self.pattern)
+        self.assertEqual([s.__dict__ for s in full], [s.__dict__ for s in partial])
+        self.assertEqual(full_next, partial_next)
@@ -0,0 +1,98 @@
+import os
+import sqlite3
+import tempfile
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from yahoo_auction_auto.info.table import SellingRecord
+from yahoo_auction_auto.store import HistoryStore
+
+
+def _record(aID: str, fetched_at: int, count_watch: int = 0, end_time: int = 10_000) -> SellingRecord:
+    return SellingRecord(aID, 'title', 'seller', 1, 0, end_time, True, 1000, 0, 0, count_watch, fetched_at)
+
+
+class TestHistoryStore(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'history.db')
+
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+
+    def test_latest_and_series(self) -> None:
+        with HistoryStore(self.path) as store:
+            store.add(_record('a', 100, 1))
+            store.add(_record('a', 300, 3))
+            store.add(_record('b', 200, 5, end_time=500))
+            store.flush()
+            store.add(_record('a', 200, 2))  # out of order, not the latest
+            store.flush()
+            latest = store.latest()
+            self.assertEqual([(r.aID, r.fetched_at, r.count_watch) for r in latest], [('a', 300, 3), ('b', 200, 5)])
+            self.assertTrue(latest[0].refundable)
+            self.assertEqual([r.aID for r in store.latest(['b', 'x'])], ['b'])
+            self.assertEqual(list(store.series('a').column('count_watch')), [1, 2, 3])
+            self.assertEqual(list(store.series('a', since=150, until=250).column('fetched_at')), [200])
+            self.assertEqual([r.aID for r in store.ending_between(0, 1000)], ['b'])
+
+
+    def test_aIDs(self) -> None:
+        with HistoryStore(self.path) as store:
+            store.add_aIDs('selling', ['b', 'a'], fetched_at=100)
+            store.add_aIDs('selling', ['c'], fetched_at=200)
+            self.assertEqual(store.aIDs('selling'), [])  # not flushed yet
+        with HistoryStore(self.path) as store:
+            self.assertEqual(store.aIDs('selling'), ['c'])
+            self.assertEqual(store.aIDs('selling', at=150), ['b', 'a'])
+            self.assertEqual(store.aIDs('closed_with_winner'), [])
+
+
+    def test_same_second(self) -> None:
+        with HistoryStore(self.path) as store:
+            store.add(_record('a', 100, 1))
+            store.add_aIDs('selling', ['a', 'b'], fetched_at=100.2)
+            store.flush()
+            store.add(_record('a', 100, 2))
+            store.add_aIDs('selling', ['c'], fetched_at=100.7)
+            store.flush()
+            self.assertEqual(list(store.series('a').column('count_watch')), [1, 2])
+            self.assertEqual(store.latest()[0].count_watch, 2)
+            self.assertEqual(store.aIDs('selling'), ['c'])
+
+
+    def test_schema(self) -> None:
+        HistoryStore(self.path).close()
+        db = sqlite3.connect(self.path)
+        self.assertEqual(db.execute('PRAGMA journal_mode').fetchone(), ('wal',))
+        indexes = {name for name, in db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertIn('selling_end_time', indexes)
+        plan = ' '.join(str(row) for row in db.execute("EXPLAIN QUERY PLAN SELECT * FROM selling WHERE aID = 'a' ORDER BY fetched_at"))
+        self.assertNotIn('SCAN', plan)
+        db.close()
+
+
+    def test_failed_batch_is_rolled_back(self) -> None:
+        with HistoryStore(self.path) as store:
+            store.add(_record('a', 100))
+            store._records.append(('b',))  # wrong number of columns
+            with self.assertRaises(sqlite3.ProgrammingError):
+                store.flush()
+            self.assertEqual(len(store.latest()), 0)
+
+
+
+class TestHistoryStoreAsync(IsolatedAsyncioTestCase):
+
+    async def test_put(self) -> None:
+        async with HistoryStore(':memory:', batch_size=3) as store:
+            await store.put(_record('a', 100))
+            await store.put(_record('b', 100))
+            self.assertEqual(len(store.latest()), 0)
+            await store.put_aIDs('selling', ['a'])
+            self.assertEqual(len(store.latest()), 2)
+            await store.put(_record('c', 100))
+            await store.aflush()
+            self.assertEqual(len(store.latest()), 3)
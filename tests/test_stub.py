@@ -0,0 +1,95 @@
+import time
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+import httpx
+
+from yahoo_auction_auto import YahooAuction
+from yahoo_auction_auto.info.selling import InfoSelling
+from yahoo_auction_auto.stub import SELLING, StubServer, make_items, render_detail_page
+from yahoo_auction_auto.urls import YahooAuctionURL
+
+
+class TestYahooAuctionURL(TestCase):
+
+    def test_default(self) -> None:
+        urls = YahooAuctionURL()
+        self.assertEqual(urls.SELLING, YahooAuctionURL.SELLING)
+        self.assertEqual(urls.MYPAGE, YahooAuctionURL.MYPAGE)
+        self.assertEqual(urls.auction('a1'), YahooAuctionURL.AUCTION('a1'))
+        self.assertEqual(urls.cancel('a1'), YahooAuctionURL.CANCEL('a1'))
+
+
+    def test_local(self) -> None:
+        urls = YahooAuctionURL.local('http://127.0.0.1:8080/')
+        self.assertEqual(urls.SELLING, 'http://127.0.0.1:8080/openuser/jp/show/mystatus?select=selling')
+        self.assertEqual(urls.auction('a1'), 'http://127.0.0.1:8080/jp/auction/a1')
+        self.assertEqual(YahooAuctionURL.SELLING, 'https://auctions.yahoo.co.jp/openuser/jp/show/mystatus?select=selling')
+
+
+    def test_detail_page_is_parsed(self) -> None:
+        item = make_items(2)[1]
+        info = InfoSelling(item.aID)
+        info.parse(render_detail_page(item))
+        self.assertEqual(info.title, item.title)
+        self.assertEqual(info.seller_name, 'stub_seller')
+        self.assertEqual(info.end_datetime, item.end_datetime)
+        self.assertEqual(info.count_bid, item.count_bid)
+        self.assertEqual(info.count_watch, item.count_watch)
+        self.assertEqual(info.timeleft, '1時間')
+
+
+
+class TestStubServer(IsolatedAsyncioTestCase):
+
+    async def test_pagination(self) -> None:
+        async with StubServer(selling=120, per_page=50) as server:
+            async with YahooAuction([], urls=server.urls) as ya:
+                aIDs = await ya.get_aIDs_selling()
+        self.assertEqual(aIDs, [item.aID for item in server.listed(SELLING)])
+        self.assertEqual(server.requests['list'], 3)
+
+
+    async def test_info_selling(self) -> None:
+        async with StubServer(selling=3) as server:
+            item = server.listed(SELLING)[1]
+            async with YahooAuction([], urls=server.urls, parser='lxml') as ya:
+                info = await ya.get_info_selling(item.aID)
+        self.assertEqual(info.title, item.title)
+        self.assertEqual(info.count_access, item.count_access)
+
+
+    async def test_cancel(self) -> None:
+        async with StubServer(selling=2) as server:
+            aID = server.listed(SELLING)[0].aID
+            async with YahooAuction([], urls=server.urls) as ya:
+                await ya.cancel_http(aID)
+                with self.assertRaises(httpx.HTTPStatusError):
+                    await ya.cancel_http(aID)
+                self.assertEqual(len(await ya.get_aIDs_selling()), 1)
+        self.assertEqual(server.cancelled, [aID])
+
+
+    async def test_login(self) -> None:
+        async with StubServer(cookies={'Y': 'y'}) as server:
+            async with YahooAuction([{'name': 'Y', 'value': 'y'}], urls=server.urls) as ya:
+                self.assertTrue(await ya.check_login())
+            async with YahooAuction([{'name': 'Y', 'value': 'other'}], urls=server.urls) as ya:
+                self.assertFalse(await ya.check_login())
+
+
+    async def test_error_injection(self) -> None:
+        async with StubServer(selling=1, error_rate=1.0, error_statuses=[429], error_routes=['detail']) as server:
+            async with YahooAuction([], urls=server.urls) as ya:
+                aIDs = await ya.get_aIDs_selling()
+                with self.assertRaises(httpx.HTTPStatusError) as raised:
+                    await ya.get_info_selling(aIDs[0])
+        self.assertEqual(raised.exception.response.status_code, 429)
+        self.assertEqual(raised.exception.response.headers['Retry-After'], '1')
+
+
+    async def test_latency(self) -> None:
+        async with StubServer(selling=1, latency=0.05) as server:
+            async with YahooAuction([], urls=server.urls) as ya:
+                started = time.perf_counter()
+                await ya.check_login()
+                self.assertGreaterEqual(time.perf_counter() - started, 0.05)
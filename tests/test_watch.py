@@ -0,0 +1,45 @@
+from unittest import IsolatedAsyncioTestCase
+
+import httpx
+
+from yahoo_auction_auto import YahooAuction
+
+
+class TestWatch(IsolatedAsyncioTestCase):
+
+    async def test_watch_yields_changed_fields(self) -> None:
+        with open('tests/info/test_selling.html', 'rb') as f:
+            page: bytes = f.read()
+        watch_tag: bytes = b'<span class="StatisticsInfo__data">0</span>\r\n                </li>\r\n            </ul>'
+        self.assertIn(watch_tag, page)
+        pages: list[bytes] = [page, page, page.replace(watch_tag, watch_tag.replace(b'>0<', b'>5<'))]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=pages.pop(0))
+
+        async with YahooAuction(cookies=[], transport=httpx.MockTransport(handler)) as ya:
+            events = [event async for event in ya.watch(['a1'], interval=0, rounds=3)]
+
+        self.assertEqual(len(events), 2)
+        self.assertEqual(events[0].changes['count_watch'], 0)
+        self.assertEqual(events[0].changes['title'], 'title')
+        self.assertEqual(events[1].changes, {'count_watch': 5})
+
+
+    async def test_watch_skips_malformed_page(self) -> None:
+        with open('tests/info/test_selling.html', 'rb') as f:
+            page: bytes = f.read()
+        count_tag: bytes = b'<span class="StatisticsInfo__data">0</span>'
+        malformed: bytes = page.replace(count_tag, count_tag.replace(b'>0<', b'>x<'))
+        pages: list[bytes] = [page, malformed, page.replace(count_tag, count_tag.replace(b'>0<', b'>5<'))]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=pages.pop(0))
+
+        async with YahooAuction(cookies=[], transport=httpx.MockTransport(handler)) as ya:
+            with self.assertLogs('yahoo_auction_auto.yahoo_auction', 'ERROR') as logs:
+                events = [event async for event in ya.watch(['a1'], interval=0, rounds=3)]
+
+        self.assertEqual(len(events), 2)
+        self.assertIn('failed to parse page of a1', logs.output[0])
+        self.assertEqual(events[1].changes['count_watch'], 5)
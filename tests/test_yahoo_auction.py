@@ -0,0 +1,61 @@
+from unittest import IsolatedAsyncioTestCase
+
+import httpx
+
+from yahoo_auction_auto import YahooAuction
+from yahoo_auction_auto.urls import YahooAuctionURL
+
+
+def _list_page(page: int, last: int) -> str:
+    items = ''.join(
+        f'<a href="https://page.auctions.yahoo.co.jp/jp/auction/a{page}x{i}" data-ylk="rsec:itm;slk:tc;pos:{i}">item</a>'
+        for i in range(3)
+    )
+    next_link = ''
+    if page < last:
+        next_link = f'<a href="{YahooAuctionURL.SELLING}&apg={page + 1}" data-ylk="rsec:pagination;slk:next;pos:1">次へ</a>'
+    return f'<html><body>{items}{next_link}</body></html>'
+
+
+_requested: list[str] = []
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    url: str = str(request.url)
+    _requested.append(url)
+    if url == YahooAuctionURL.MYPAGE:
+        return httpx.Response(200, text='<html></html>')
+    if url.startswith(YahooAuctionURL.SELLING):
+        page: int = int(request.url.params.get('apg', '1'))
+        return httpx.Response(200, text=_list_page(page, 3))
+    return httpx.Response(404)
+
+
+class TestYahooAuction(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        _requested.clear()
+        self.ya = YahooAuction(cookies=[], transport=httpx.MockTransport(_handler))
+
+
+    async def asyncTearDown(self) -> None:
+        await self.ya.aclose()
+
+
+    async def test_check_login(self) -> None:
+        self.assertTrue(await self.ya.check_login())
+
+
+    async def test_get_aIDs_selling(self) -> None:
+        aIDs = await self.ya.get_aIDs_selling()
+        self.assertEqual(aIDs, [f'a{page}x{i}' for page in range(1, 4) for i in range(3)])
+
+
+    async def test_iter_urls_selling(self) -> None:
+        urls = self.ya.iter_urls_selling()
+        first = await urls.__anext__()
+        self.assertTrue(first.endswith('/a1x0'))
+        self.assertEqual(len(_requested), 1)
+        rest = [url async for url in urls]
+        self.assertEqual(len(rest), 8)
+        self.assertEqual(len(_requested), 3)
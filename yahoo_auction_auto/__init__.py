@@ -1,8 +1,24 @@
 __version__ = '0.0.4'
 
-from .yahoo_auction import YahooAuction
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .yahoo_auction import YahooAuction
+    from .accounts import AccountManager
 
 
 __all__ = [
-    'YahooAuction'
-]
\ No newline at end of file
+    'YahooAuction',
+    'AccountManager'
+]
+
+
+def __getattr__(name: str) -> Any:
+    # imported on first use, so that `yahoo_auction_auto.cli` starts without httpx
+    if name == 'YahooAuction':
+        from .yahoo_auction import YahooAuction
+        return YahooAuction
+    if name == 'AccountManager':
+        from .accounts import AccountManager
+        return AccountManager
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
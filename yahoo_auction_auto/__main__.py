@@ -0,0 +1,5 @@
+import sys
+
+from yahoo_auction_auto.cli import main
+
+sys.exit(main())
@@ -0,0 +1,381 @@
+""" Many accounts driven from one event loop.
+
+`AccountManager` holds a `YahooAuction` per account.
+They share one pool of connections and one `Limiter` but each has its own cookie jar,
+and work submitted for them runs in round-robin between accounts,
+so that an account with a long backlog does not starve the others.
+
+    async with AccountManager({'alice': cookies_a, 'bob': cookies_b}) as manager:
+        async for name, aID, result in manager.map(
+            lambda ya, aID: ya.get_info_selling(aID),
+            {'alice': aIDs_a, 'bob': aIDs_b}
+        ):
+            ...
+        print(manager.stats())
+"""
+import asyncio
+import collections
+import inspect
+import time
+from types import TracebackType
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional, Type, TypeVar, Union
+
+import httpx
+
+from yahoo_auction_auto.client import SharedTransport, pool_transport
+from yahoo_auction_auto.concurrency import as_completed_bounded
+from yahoo_auction_auto.limiter import Limiter
+from yahoo_auction_auto.metrics import Event, Metrics
+from yahoo_auction_auto.yahoo_auction import YahooAuction
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# parameters of `YahooAuction` the manager sets for every account
+_MANAGED: frozenset[str] = frozenset({'cookies', 'transport', 'limiter', 'metrics'})
+
+
+class AccountStats:
+    """ Counts of the work and requests of an account. """
+    name: str
+    calls: int
+    failed: int
+    running: int
+    waiting: int
+    busy_seconds: float
+    wait_seconds: float
+    requests: int
+    request_errors: int
+    bytes: int
+
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.failed = 0
+        self.running = 0
+        self.waiting = 0
+        self.busy_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.requests = 0
+        self.request_errors = 0
+        self.bytes = 0
+
+
+    def on_event(self, event: Event) -> None:
+        """ Hook of `Metrics` counting the requests of the account. """
+        if event.name != 'request' or event.labels.get('cache') == 'hit':
+            return
+        self.requests += 1
+        status: str = event.labels.get('status', 'error')
+        if not status.isdigit() or int(status) >= 400:
+            self.request_errors += 1
+        self.bytes += int(event.values.get('bytes', 0))
+
+
+    def __repr__(self) -> str:
+        return (
+            f'AccountStats(name={self.name!r}, calls={self.calls}, failed={self.failed}, '
+            f'running={self.running}, waiting={self.waiting}, busy_seconds={self.busy_seconds:.3f}, '
+            f'requests={self.requests}, request_errors={self.request_errors}, bytes={self.bytes})'
+        )
+
+
+
+class AccountManager:
+    """ `YahooAuction` per account sharing connections and a limiter, with fair scheduling. """
+
+    def __init__(
+        self,
+        accounts: Optional[dict[str, list[dict[str, Any]]]] = None,
+        concurrency: int = 16,
+        per_account: int = 4,
+        http2: bool = True,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        limiter: Optional[Limiter] = None,
+        metrics: Optional[Metrics] = None,
+        **options: Any
+    ) -> None:
+        """
+        Parameters
+        ----------
+        accounts : dict[str, list[dict[str, Any]]] | None
+            Cookies of each account by its name. More can be added by `add`.
+        concurrency : int
+            Max number of calls run at once over all accounts.
+        per_account : int
+            Max number of calls of an account run at once.
+        http2 : bool
+            Use HTTP/2 if the `h2` package is installed.
+        max_connections : int
+            Max number of connections in the pool shared by the accounts.
+        max_keepalive_connections : int
+            Max number of idle connections kept alive in the shared pool.
+        transport : httpx.AsyncBaseTransport | None
+            Transport shared by the accounts instead of a new pool, left open on `aclose`.
+        limiter : Limiter | None
+            Limiter of requests shared by the accounts. A new `Limiter()` if None.
+        metrics : Metrics | None
+            Receiver of the events of every account, labeled `account` with its name.
+        **options
+            Other parameters of `YahooAuction`, such as `parser`, `urls` and `retry`,
+            except those the manager sets: `cookies`, `transport`, `limiter` and `metrics`.
+        """
+        if concurrency < 1 or per_account < 1:
+            raise ValueError(f'concurrency must be positive: {concurrency}, {per_account}')
+        managed: list[str] = sorted(_MANAGED.intersection(options))
+        if managed:
+            raise ValueError(f'options set by the manager for each account: {managed}')
+        unknown: list[str] = sorted(set(options) - set(inspect.signature(YahooAuction).parameters))
+        if unknown:
+            raise ValueError(f'unknown options of YahooAuction: {unknown}')
+        self.concurrency: int = concurrency
+        self.per_account: int = per_account
+        self.limiter: Limiter = limiter if limiter is not None else Limiter()
+        self.metrics: Optional[Metrics] = metrics
+        self._options: dict[str, Any] = options
+        self._owns_transport: bool = transport is None
+        self._transport: httpx.AsyncBaseTransport = transport or pool_transport(
+            http2, max_connections, max_keepalive_connections
+        )
+        self._accounts: dict[str, YahooAuction] = {}
+        self._stats: dict[str, AccountStats] = {}
+        # names of accounts in round-robin order, and callers waiting for a slot of each
+        self._order: collections.deque[str] = collections.deque()
+        self._waiters: dict[str, collections.deque[asyncio.Future[None]]] = {}
+        self._running: int = 0
+        for name, cookies in (accounts or {}).items():
+            self.add(name, cookies)
+
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._accounts)
+
+
+    def __getitem__(self, name: str) -> YahooAuction:
+        return self._accounts[name]
+
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+
+    def add(self, name: str, cookies: list[dict[str, Any]]) -> YahooAuction:
+        """ Add an account and return its `YahooAuction`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the account, unique in the manager.
+        cookies : list[dict[str, Any]]
+            Cookies of the account.
+
+        Returns
+        -------
+        YahooAuction
+        """
+        if name in self._accounts:
+            raise ValueError(f'account already added: {name}')
+        stats: AccountStats = AccountStats(name)
+        metrics: Metrics = Metrics(stats.on_event)
+        if self.metrics is not None:
+            metrics.add_hook(_labeled(self.metrics, name))
+        self._accounts[name] = YahooAuction(
+            cookies,
+            transport=SharedTransport(self._transport),
+            limiter=self.limiter,
+            metrics=metrics,
+            **self._options
+        )
+        self._stats[name] = stats
+        self._waiters[name] = collections.deque()
+        self._order.append(name)
+        return self._accounts[name]
+
+
+    async def remove(self, name: str) -> None:
+        """ Close and remove an account.
+
+        Its calls waiting for a slot fail with `KeyError`,
+        and so do those given one but not started yet, giving it back.
+        """
+        ya: YahooAuction = self._accounts.pop(name)
+        del self._stats[name]
+        self._order.remove(name)
+        for waiter in self._waiters.pop(name):
+            if not waiter.done():
+                waiter.set_exception(KeyError(name))
+        await ya.aclose()
+
+
+    async def submit(self, name: str, func: Callable[[YahooAuction], Awaitable[R]]) -> R:
+        """ Run `func` with the `YahooAuction` of account `name` when its turn comes.
+
+        Parameters
+        ----------
+        name : str
+            Name of the account.
+        func : Callable[[YahooAuction], Awaitable[R]]
+            Coroutine function such as `lambda ya: ya.get_info_selling(aID)`.
+
+        Returns
+        -------
+        R
+            Result of `func`.
+        """
+        ya: YahooAuction = self._accounts[name]
+        stats: AccountStats = self._stats[name]
+        waited: float = time.monotonic()
+        await self._acquire(name, stats)
+        started: float = time.monotonic()
+        stats.wait_seconds += started - waited
+        stats.running += 1
+        try:
+            return await func(ya)
+        except Exception:
+            stats.failed += 1
+            raise
+        finally:
+            stats.calls += 1
+            stats.running -= 1
+            stats.busy_seconds += time.monotonic() - started
+            self._running -= 1
+            self._dispatch()
+
+
+    async def map(
+        self,
+        func: Callable[[YahooAuction, T], Awaitable[R]],
+        work: dict[str, Iterable[T]]
+    ) -> AsyncIterator[tuple[str, T, Union[R, Exception]]]:
+        """ Run `func` over the items of each account and yield results as they finish.
+
+        Items of an account are consumed lazily, at most `per_account` at once,
+        and the accounts take turns for the `concurrency` slots.
+
+        Parameters
+        ----------
+        func : Callable[[YahooAuction, T], Awaitable[R]]
+            Coroutine function applied to the `YahooAuction` of the account and an item.
+        work : dict[str, Iterable[T]]
+            Items by the name of the account.
+
+        Yields
+        ------
+        tuple[str, T, R | Exception]
+            Name of the account, item and its result, or the exception raised for it.
+        """
+        results: asyncio.Queue[Optional[tuple[str, T, Union[R, Exception]]]] = asyncio.Queue()
+
+        async def run(name: str, items: Iterable[T]) -> None:
+            async def call(item: T) -> R:
+                return await self.submit(name, lambda ya: func(ya, item))
+
+            try:
+                async for item, result in as_completed_bounded(call, items, self.per_account):
+                    await results.put((name, item, result))
+            finally:
+                await results.put(None)
+
+        tasks: list[asyncio.Task[None]] = [asyncio.ensure_future(run(name, items)) for name, items in work.items()]
+        running: int = len(tasks)
+        try:
+            while running > 0:
+                entry = await results.get()
+                if entry is None:
+                    running -= 1
+                    continue
+                yield entry
+            for task in tasks:
+                task.result()  # raise an error of iterating items
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+    def stats(self) -> dict[str, AccountStats]:
+        """ Return the counts of each account. """
+        for name, stats in self._stats.items():
+            stats.waiting = sum(not waiter.done() for waiter in self._waiters[name])
+        return dict(self._stats)
+
+
+    async def aclose(self) -> None:
+        """ Close every account, and the shared pool of connections if created by the manager. """
+        for name in list(self._accounts):
+            await self.remove(name)
+        if self._owns_transport:
+            await self._transport.aclose()
+
+
+    async def __aenter__(self) -> 'AccountManager':
+        return self
+
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        await self.aclose()
+
+
+    async def _acquire(self, name: str, stats: AccountStats) -> None:
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        waiters: collections.deque[asyncio.Future[None]] = self._waiters[name]
+        waiters.append(waiter)
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                # given a slot just before being cancelled
+                self._running -= 1
+                self._dispatch()
+            raise
+        finally:
+            if waiter in waiters:
+                waiters.remove(waiter)
+        if self._waiters.get(name) is not waiters:
+            # given a slot just before the account was removed
+            self._running -= 1
+            self._dispatch()
+            raise KeyError(name)
+
+
+    def _dispatch(self) -> None:
+        """ Give free slots to waiting calls, one account after another. """
+        while self._running < self.concurrency:
+            for _ in range(len(self._order)):
+                name: str = self._order[0]
+                self._order.rotate(-1)
+                waiters = self._waiters[name]
+                if waiters and self._stats[name].running + _granted(waiters) < self.per_account:
+                    waiter = next((w for w in waiters if not w.done()), None)
+                    if waiter is not None:
+                        waiter.set_result(None)
+                        self._running += 1
+                        break
+            else:
+                return
+
+
+    def __repr__(self) -> str:
+        return f'AccountManager({self.names!r}, concurrency={self.concurrency}, per_account={self.per_account})'
+
+
+
+def _granted(waiters: collections.deque[asyncio.Future[None]]) -> int:
+    """ Number of calls given a slot but not started yet. """
+    return sum(waiter.done() for waiter in waiters)
+
+
+def _labeled(metrics: Metrics, name: str) -> Callable[[Event], None]:
+    def hook(event: Event) -> None:
+        metrics.emit(event.name, event.seconds, {**event.labels, 'account': name}, **event.values)
+    return hook
@@ -0,0 +1,223 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class CacheEntry:
+    """ Cached response body and its validators. """
+    url: str
+    content: bytes
+    stored_at: float
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+    def __init__(
+        self,
+        url: str,
+        content: bytes,
+        stored_at: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> None:
+        self.url = url
+        self.content = content
+        self.stored_at = stored_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+    @property
+    def revalidatable(self) -> bool:
+        """ True if the server can be asked whether the entry is still valid. """
+        return bool(self.etag or self.last_modified)
+
+
+
+class ResponseCache:
+    """ On-disk cache of response bodies.
+
+    Entries are keyed by URL and a hash of the account's cookies,
+    so that accounts never see each other's pages.
+    Each URL class (`list`, `detail`) has its own TTL.
+    A stale entry having ETag or Last-Modified is revalidated by a conditional request.
+    When the total size exceeds `max_bytes`, least recently used entries are evicted.
+
+    `aget`, `aput` and `atouch` read and write files from a worker thread,
+    so that a slow disk does not stall other requests on the event loop.
+    """
+    DEFAULT_TTL: dict[str, float] = {
+        'list': 60.0,
+        'detail': 30.0,
+    }
+
+
+    def __init__(
+        self,
+        directory: str,
+        ttl: Optional[dict[str, float]] = None,
+        max_bytes: int = 256 * 1024 * 1024
+    ) -> None:
+        """
+        Parameters
+        ----------
+        directory : str
+            Directory to store entries in. Created if not exists.
+        ttl : dict[str, float] | None
+            Seconds an entry stays fresh per URL class.
+            Classes not in `ttl` are not cached. `DEFAULT_TTL` if None.
+        max_bytes : int
+            Max total size of cached bodies.
+        """
+        self.directory: str = directory
+        self.ttl: dict[str, float] = dict(self.DEFAULT_TTL if ttl is None else ttl)
+        self.max_bytes: int = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock: threading.Lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # key → body size, least recently used first
+        self._sizes: OrderedDict[str, int] = OrderedDict()
+        bodies: list[os.DirEntry[str]] = [entry for entry in os.scandir(directory) if entry.name.endswith('.body')]
+        for body in sorted(bodies, key=lambda body: body.stat().st_mtime):
+            self._sizes[body.name[:-5]] = body.stat().st_size
+        self._total: int = sum(self._sizes.values())  # kept up to date, not summed per put
+
+
+    @staticmethod
+    def key(url: str, cookies: dict[str, str]) -> str:
+        """ Return cache key of `url` requested with `cookies`. """
+        digest = hashlib.sha256(url.encode())
+        for name, value in sorted(cookies.items()):
+            digest.update(b'\0' + name.encode() + b'=' + value.encode())
+        return digest.hexdigest()
+
+
+    def is_fresh(self, entry: CacheEntry, kind: str) -> bool:
+        """ Return True if `entry` of URL class `kind` is within its TTL. """
+        return time.time() - entry.stored_at < self.ttl.get(kind, 0.0)
+
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """ Return the entry of `key` if exists, and mark it as recently used. """
+        with self._lock:
+            if key not in self._sizes:
+                return None
+            try:
+                with open(self._path(key, '.json'), encoding='utf-8') as f:
+                    meta: dict[str, Any] = json.load(f)
+                with open(self._path(key, '.body'), 'rb') as f:
+                    content: bytes = f.read()
+                os.utime(self._path(key, '.body'))
+            except (OSError, ValueError):
+                self._discard(key)
+                return None
+            self._sizes.move_to_end(key)
+        return CacheEntry(meta['url'], content, meta['stored_at'], meta.get('etag'), meta.get('last_modified'))
+
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        """ Store `entry` under `key` and evict old entries if over size. """
+        with self._lock:
+            self._put(key, entry)
+
+
+    def touch(self, key: str, entry: CacheEntry) -> None:
+        """ Mark `entry` as fresh again after successful revalidation. """
+        entry.stored_at = time.time()
+        with self._lock:
+            if key in self._sizes:
+                self._write_meta(key, entry)
+            else:
+                self._put(key, entry)
+
+
+    async def aget(self, key: str) -> Optional[CacheEntry]:
+        """ `get` from the worker thread. """
+        return await self._run(self.get, key)
+
+
+    async def aput(self, key: str, entry: CacheEntry) -> None:
+        """ `put` from the worker thread. """
+        await self._run(self.put, key, entry)
+
+
+    async def atouch(self, key: str, entry: CacheEntry) -> None:
+        """ `touch` from the worker thread. """
+        await self._run(self.touch, key, entry)
+
+
+    def clear(self) -> None:
+        """ Remove all entries. """
+        with self._lock:
+            for key in list(self._sizes):
+                self._discard(key)
+
+
+    def close(self) -> None:
+        """ Stop the worker thread. It is started again on the next async call. """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix='cache')
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+
+    def _put(self, key: str, entry: CacheEntry) -> None:
+        self._write(self._path(key, '.body'), entry.content)
+        self._write_meta(key, entry)
+        self._total += len(entry.content) - self._sizes.get(key, 0)
+        self._sizes[key] = len(entry.content)
+        self._sizes.move_to_end(key)
+        self._evict()
+
+
+    def _evict(self) -> None:
+        while self._total > self.max_bytes and len(self._sizes) > 1:
+            self._discard(next(iter(self._sizes)))
+
+
+    def _discard(self, key: str) -> None:
+        self._total -= self._sizes.pop(key, 0)
+        for suffix in ('.body', '.json'):
+            try:
+                os.remove(self._path(key, suffix))
+            except OSError:
+                pass
+
+
+    def _write_meta(self, key: str, entry: CacheEntry) -> None:
+        meta: dict[str, Any] = {
+            'url': entry.url,
+            'stored_at': entry.stored_at,
+            'etag': entry.etag,
+            'last_modified': entry.last_modified,
+        }
+        self._write(self._path(key, '.json'), json.dumps(meta).encode())
+
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, key + suffix)
+
+
+    def _write(self, path: str, data: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Optional, Pattern
+from urllib.parse import urlencode, urljoin, urlsplit, urlunsplit
+
+import httpx
+
+from yahoo_auction_auto.client import HTTPClient
+from yahoo_auction_auto.soup import make_soup
+from yahoo_auction_auto.urls import YahooAuctionURL
+
+if TYPE_CHECKING:
+    import bs4
+
+# default text of the page shown after a cancel is done, such as `オークションを取り消しました`
+CANCELLED_MARKER: Pattern[str] = re.compile(r'取り消し(?:まし|が完了しまし)た')
+
+
+
+class CancelUnconfirmed(ValueError):
+    """ Raised when the confirm of a cancel was accepted but its result page is not recognized.
+
+    The cancel may well be done, so it must not be tried again blindly.
+    """
+
+
+
+async def cancel_http(
+    client: HTTPClient, 
+    aID: str, 
+    timeout: Optional[float] = None, 
+    urls: Optional[YahooAuctionURL] = None,
+    marker: Optional[Pattern[str]] = CANCELLED_MARKER
+) -> None:
+    """ Cancel selling of `aID` without browser. 
+
+    Fetches the cancel page and submits its `confirm` form by its method,
+    including hidden fields such as crumb tokens, over the session of `client`,
+    then checks the page returned for it.
+    The cancel is rejected if that page has the confirm form again,
+    and unconfirmed if it does not have `marker`.
+    
+    Parameters
+    ----------
+    client : HTTPClient
+        Client having cookies of the seller.
+    aID : str
+        Auction ID of Yahoo Auction.
+    timeout : float | None
+        Timeout of each request in seconds. Default timeout of the client if None.
+    urls : YahooAuctionURL | None
+        URLs of the site. The real site if None.
+    marker : Pattern[str] | None
+        Text of the page shown after a cancel is done. `CANCELLED_MARKER` by default.
+        Any page without the confirm form is taken as done if None.
+
+    Raises
+    ------
+    CancelUnconfirmed
+        If the page returned for the confirm does not have `marker`.
+    ValueError
+        If the cancel page has no confirm form, or the confirm is rejected.
+    """
+    url: str = (urls or YahooAuctionURL()).cancel(aID)
+    response: httpx.Response = await client.get(url, kind='cancel', timeout=timeout)
+    form: Optional[tuple[str, str, dict[str, str]]] = _get_confirm_form(response.content, str(response.url))
+    if form is None:
+        raise ValueError(f'confirm form is not found on the cancel page of {aID}')
+    method, action, data = form
+    # cancelling is not idempotent, so the confirm is neither retried nor duplicated
+    if method == 'GET':
+        # the query of the action is replaced by the form data, as browsers do
+        split = urlsplit(action)
+        result: httpx.Response = await client.send_once(
+            'GET', urlunsplit((split.scheme, split.netloc, split.path, urlencode(data), '')), kind='cancel', timeout=timeout
+        )
+    else:
+        result = await client.send_once('POST', action, data, kind='cancel', timeout=timeout)
+    if _get_confirm_form(result.content, str(result.url)) is not None:
+        raise ValueError(f'cancel of {aID} is rejected, got the confirm form again')
+    if marker is not None and not marker.search(result.text):
+        raise CancelUnconfirmed(f'cancel of {aID} is sent but not confirmed by {result.url}')
+
+
+
+# scraping functions
+# content is from YahooAuctionURL.CANCEL()
+def _get_confirm_form(content: bytes, base_url: str) -> Optional[tuple[str, str, dict[str, str]]]:
+    """ Return method, action url and data of the form having `confirm` button. 
+    
+    Parameters
+    ----------
+    content : bytes
+        HTML of a cancel page.
+    base_url : str
+        URL of the page, against which a relative action is resolved.
+
+    Returns
+    -------
+    tuple[str, str, dict[str, str]] | None
+        Method, `GET` or `POST`, action url and form data as the confirm button is clicked, 
+        or None if not found.
+    """
+    soup: bs4.BeautifulSoup = make_soup(content)
+    for form in soup.find_all('form'):
+        confirm = form.find(['input', 'button'], attrs={'name': 'confirm'})
+        if confirm is None:
+            continue
+
+        data: dict[str, str] = {}
+        for field in form.find_all(['input', 'select', 'textarea']):
+            name = field.get('name')
+            if not isinstance(name, str) or field is confirm or field.has_attr('disabled'):
+                continue
+            if field.name == 'textarea':
+                data[name] = field.text
+            elif field.name == 'select':
+                option = field.find('option', selected=True) or field.find('option')
+                if option is not None:
+                    data[name] = str(option.get('value', option.text))
+            else:
+                kind: str = str(field.get('type', 'text')).lower()
+                if kind in ('submit', 'button', 'image', 'reset', 'file'):
+                    continue
+                if kind in ('checkbox', 'radio') and not field.has_attr('checked'):
+                    continue
+                data[name] = str(field.get('value', 'on' if kind in ('checkbox', 'radio') else ''))
+        data['confirm'] = str(confirm.get('value', ''))
+
+        action = form.get('action')
+        method = form.get('method')
+        return (
+            # GET unless it says POST, as browsers do
+            'POST' if isinstance(method, str) and method.strip().upper() == 'POST' else 'GET',
+            urljoin(base_url, action if isinstance(action, str) else ''),
+            data,
+        )
+    return None
@@ -1,16 +1,225 @@
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Iterator
+from types import TracebackType
+from typing import Any, Iterator, Optional, Type
 from selenium.webdriver import Chrome
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.ui import WebDriverWait
 import chromedriver_binary
 
+from yahoo_auction_auto.metrics import Metrics, measure
+from yahoo_auction_auto.urls import YahooAuctionURL
+
+logger = logging.getLogger(__name__)
+
 
 @contextmanager
-def chrome(options: Options) -> Iterator[Chrome]:
-    driver: Chrome = Chrome(options=options)
-    driver.implicitly_wait(30)
+def chrome(options: Options, metrics: Optional[Metrics] = None, implicit_wait: float = 30.0) -> Iterator[Chrome]:
+    """ Start a driver waiting `implicit_wait` seconds for a missing element, and quit it on exit.
+
+    Pass 0 for a driver used with `WebDriverWait`, which an implicit wait would hold up.
+    """
+    with measure(metrics, 'driver_start'):
+        driver: Chrome = Chrome(options=options)
+    driver.implicitly_wait(implicit_wait)
     try:
         yield driver
     finally:
         driver.close()
-        driver.quit()
\ No newline at end of file
+        driver.quit()
+
+
+
+class ChromePool:
+    """ Pool of pre-warmed Chrome drivers with cookies loaded. 
+    
+    Drivers are started once and borrowed by one thread at a time,
+    so that each task doesn't pay for starting Chrome and loading cookies.
+    They have no implicit wait, as `cancel_with` waits explicitly.
+    """
+
+    def __init__(
+        self, 
+        options: Options, 
+        cookies: list[dict[str, Any]], 
+        size: int = 2,
+        urls: Optional[YahooAuctionURL] = None,
+        metrics: Optional[Metrics] = None
+    ) -> None:
+        """
+        Parameters
+        ----------
+        options : Options
+            Options to start Chrome with.
+        cookies : list[dict[str, Any]]
+            Cookies loaded into every driver.
+        size : int
+            Number of drivers.
+        urls : YahooAuctionURL | None
+            URLs of the site. The real site if None.
+        metrics : Metrics | None
+            Receiver of a `driver_start` event per driver. Nothing is measured if None.
+        """
+        if size < 1:
+            raise ValueError(f'size must be positive: {size}')
+        self.size: int = size
+        self._options: Options = options
+        self._cookies: list[dict[str, Any]] = cookies
+        self.urls: YahooAuctionURL = urls or YahooAuctionURL()
+        self.metrics: Optional[Metrics] = metrics
+        # None wakes callers waiting for a driver after `close`
+        self._idle: queue.Queue[Optional[Chrome]] = queue.Queue()
+        self._drivers: list[Chrome] = []
+        self._lock: threading.Lock = threading.Lock()
+        self._closed: bool = False
+
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+
+    def start(self) -> None:
+        """ Start all drivers in parallel. Do nothing if already started. Raise `RuntimeError` if closed. """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('ChromePool is closed')
+            if self._drivers:
+                return
+            with ThreadPoolExecutor(max_workers=self.size) as executor:
+                futures = [executor.submit(self._start_driver) for _ in range(self.size)]
+                errors: list[BaseException] = []
+                for future in futures:
+                    try:
+                        driver: Chrome = future.result()
+                    except Exception as e:
+                        errors.append(e)
+                        continue
+                    self._drivers.append(driver)
+                    self._idle.put(driver)
+        if errors:
+            with self._lock:
+                drivers, self._drivers = self._drivers, []
+                self._take_idle()
+            _quit(drivers)
+            raise errors[0]
+
+
+    def _start_driver(self) -> Chrome:
+        with measure(self.metrics, 'driver_start'):
+            driver: Chrome = Chrome(options=self._options)
+            try:
+                driver.implicitly_wait(0)
+                driver.get(self.urls.HOME)
+                for cookie in self._cookies:
+                    driver.add_cookie(cookie)
+            except BaseException:
+                driver.quit()
+                raise
+        return driver
+
+
+    @contextmanager
+    def borrow(self, timeout: Optional[float] = None) -> Iterator[Chrome]:
+        """ Borrow an idle driver, waiting until one is returned if all are busy. 
+        
+        A driver returned after `close` is quit instead of being reused.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Seconds to wait for an idle driver. Wait forever if None.
+
+        Raises
+        ------
+        RuntimeError
+            If the pool is closed, before or while waiting.
+        """
+        self.start()
+        driver: Optional[Chrome] = self._idle.get(timeout=timeout)
+        if driver is None:
+            self._idle.put(None)  # for the next waiter
+            raise RuntimeError('ChromePool is closed')
+        try:
+            yield driver
+        finally:
+            with self._lock:
+                closed: bool = self._closed
+                if not closed:
+                    self._idle.put(driver)
+            if closed:
+                _quit([driver])
+
+
+    def close(self) -> None:
+        """ Quit idle drivers, and borrowed ones when they are returned. The pool cannot be started again. """
+        with self._lock:
+            self._closed = True
+            self._drivers = []
+            idle: list[Chrome] = self._take_idle()
+            self._idle.put(None)
+        _quit(idle)
+
+
+    def _take_idle(self) -> list[Chrome]:
+        drivers: list[Chrome] = []
+        while True:
+            try:
+                driver: Optional[Chrome] = self._idle.get_nowait()
+            except queue.Empty:
+                return drivers
+            if driver is not None:
+                drivers.append(driver)
+
+
+    def __enter__(self) -> 'ChromePool':
+        self.start()
+        return self
+
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        self.close()
+
+
+
+def _quit(drivers: list[Chrome]) -> None:
+    for driver in drivers:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+def cancel_with(driver: Chrome, aID: str, timeout: float, urls: Optional[YahooAuctionURL] = None) -> None:
+    """ Cancel selling of `aID` with `driver` having cookies loaded and no implicit wait. """
+    logger.debug(f'canceling {aID}')
+    driver.get((urls or YahooAuctionURL()).cancel(aID))
+    cancel_element: WebElement = WebDriverWait(driver, timeout).until(
+        lambda d: d.find_element(By.NAME, 'confirm')
+    )
+    cancel_element.click()
+
+
+def cancel_in_pool(pool: ChromePool, aIDs: list[str], timeout: float) -> dict[str, Optional[Exception]]:
+    """ Cancel sellings of `aIDs` in parallel with drivers of `pool`. """
+    def cancel(aID: str) -> Optional[Exception]:
+        try:
+            with pool.borrow() as driver:
+                cancel_with(driver, aID, timeout, pool.urls)
+        except Exception as e:
+            logger.error(f'failed to cancel {aID}: {e}')
+            return e
+        return None
+
+    with ThreadPoolExecutor(max_workers=pool.size) as executor:
+        return dict(zip(aIDs, executor.map(cancel, aIDs)))
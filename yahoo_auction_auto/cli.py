@@ -0,0 +1,258 @@
+""" Command-line interface for batch jobs.
+
+    yahoo-auction aids selling > aids.ndjson
+    yahoo-auction aids selling | yahoo-auction info --concurrency 16 --rate 10 --format csv
+    yahoo-auction cancel a1000000000 b2000000000
+
+Records are written to stdout one per line as they finish, as NDJSON or CSV,
+and errors of aIDs and a count of the records of each command go to stderr.
+`info` and `cancel` take aIDs as arguments, or read them from stdin,
+one per line either bare or as NDJSON records having `aID`.
+Cookies are read from a JSON file of a list of cookies as `get-cookies.py` saves,
+required unless `--base-url` points at a stand-in of the site.
+With `--profile`, expired cookies are refreshed from a logged-in Chrome profile
+and written back to the file.
+
+The library is imported when a command runs, and Chrome only by `cancel --fallback`
+and a refresh of `--profile`,
+so that `--help` and HTTP-only commands start quickly.
+"""
+from __future__ import annotations
+
+import abc
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Iterable, Optional, TextIO
+
+if TYPE_CHECKING:
+    from yahoo_auction_auto.yahoo_auction import YahooAuction
+
+LISTS: tuple[str, ...] = ('selling', 'closed-with-winner', 'closed-without-winner')
+INFO_FIELDS: tuple[str, ...] = (
+    'aID',
+    'title',
+    'seller_name',
+    'stack',
+    'start_datetime',
+    'end_datetime',
+    'refundable',
+    'startprice',
+    'timeleft',
+    'count_bid',
+    'count_access',
+    'count_watch',
+)
+
+
+class Writer(abc.ABC):
+    """ Writer of records to a stream, one line per record flushed at once. """
+
+    def __init__(self, stream: TextIO, fields: tuple[str, ...]) -> None:
+        self.stream: TextIO = stream
+        self.fields: tuple[str, ...] = fields
+
+
+    @abc.abstractmethod
+    def write(self, record: dict[str, Any]) -> None:
+        pass
+
+
+
+class NdjsonWriter(Writer):
+
+    def write(self, record: dict[str, Any]) -> None:
+        self.stream.write(json.dumps(record, ensure_ascii=False, default=_default) + '\n')
+        self.stream.flush()
+
+
+
+class CsvWriter(Writer):
+    """ Writer of CSV with a header of `fields`. Fields missing in a record are left empty. """
+
+    def __init__(self, stream: TextIO, fields: tuple[str, ...]) -> None:
+        super().__init__(stream, fields)
+        self._writer = csv.DictWriter(stream, fields, extrasaction='ignore', lineterminator='\n')
+        self._writer.writeheader()
+
+
+    def write(self, record: dict[str, Any]) -> None:
+        self._writer.writerow({key: _default(value) for key, value in record.items()})
+        self.stream.flush()
+
+
+
+def _default(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _writer(args: argparse.Namespace, fields: tuple[str, ...]) -> Writer:
+    return (CsvWriter if args.format == 'csv' else NdjsonWriter)(sys.stdout, fields)
+
+
+def _progress(message: str) -> None:
+    print(f'yahoo-auction: {message}', file=sys.stderr, flush=True)
+
+
+def read_aIDs(lines: Iterable[str]) -> list[str]:
+    """ Return aIDs of `lines`, each a bare aID or an NDJSON record having `aID`. Blank lines are skipped. """
+    aIDs: list[str] = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        aIDs.append(str(json.loads(line)['aID']) if line.startswith('{') else line)
+    return aIDs
+
+
+def _aIDs(args: argparse.Namespace) -> list[str]:
+    if args.aIDs and args.aIDs != ['-']:
+        return list(args.aIDs)
+    return read_aIDs(sys.stdin)
+
+
+def _open(args: argparse.Namespace) -> YahooAuction:
+    from yahoo_auction_auto.limiter import Limiter
+    from yahoo_auction_auto.retry import RetryPolicy
+    from yahoo_auction_auto.urls import YahooAuctionURL
+    from yahoo_auction_auto.yahoo_auction import YahooAuction
+
+    cookies: list[dict[str, Any]] = []
+    if args.cookies:
+        with open(args.cookies, encoding='utf-8') as f:
+            cookies = json.load(f)
+    concurrency: float = float(args.concurrency)
+    ya: YahooAuction = YahooAuction(
+        cookies,
+        parser=args.parser,
+        urls=YahooAuctionURL.local(args.base_url) if args.base_url else None,
+        max_connections=max(20, args.concurrency * 2),
+        limiter=Limiter(rate=args.rate, burst=max(1.0, args.rate or 1.0), concurrency=min(4.0, concurrency), max_concurrency=concurrency),
+        retry=RetryPolicy(attempts=args.retries + 1) if args.retries > 0 else None,
+    )
+    if args.profile:
+        ya.open_session(args.profile, path=args.cookies)
+    return ya
+
+
+async def _list_aIDs(args: argparse.Namespace) -> int:
+    from yahoo_auction_auto.urls import aID_of
+
+    writer: Writer = _writer(args, ('aID',))
+    count: int = 0
+    async with _open(args) as ya:
+        iterate = {
+            'selling': ya.iter_urls_selling,
+            'closed-with-winner': ya.iter_urls_closed_with_winner,
+            'closed-without-winner': ya.iter_urls_closed_without_winner,
+        }[args.list]
+        async for url in iterate():
+            writer.write({'aID': aID_of(url)})
+            count += 1
+    _progress(f'aids {args.list}: {count} aIDs')
+    return 0
+
+
+async def _info(args: argparse.Namespace) -> int:
+    aIDs: list[str] = _aIDs(args)
+    writer: Writer = _writer(args, INFO_FIELDS + ('error',))
+    failed: int = 0
+    async with _open(args) as ya:
+        async for aID, info in ya.get_info_selling_many(aIDs, args.concurrency):
+            if isinstance(info, Exception):
+                failed += 1
+                error: str = str(info) or type(info).__name__
+                writer.write({'aID': aID, 'error': error})
+                _progress(f'info {aID}: {error}')
+            else:
+                writer.write({field: getattr(info, field, None) for field in INFO_FIELDS})
+    _progress(f'info: {len(aIDs)} aIDs, {failed} failed')
+    return 1 if failed else 0
+
+
+async def _cancel(args: argparse.Namespace) -> int:
+    aIDs: list[str] = _aIDs(args)
+    writer: Writer = _writer(args, ('aID', 'cancelled', 'error'))
+    failed: int = 0
+    async with _open(args) as ya:
+        async for aID, error in ya.cancel_many_http(aIDs, args.concurrency, fallback=args.fallback):
+            if error is not None:
+                failed += 1
+                message: str = str(error) or type(error).__name__
+                writer.write({'aID': aID, 'cancelled': False, 'error': message})
+                _progress(f'cancel {aID}: {message}')
+            else:
+                writer.write({'aID': aID, 'cancelled': True})
+    _progress(f'cancel: {len(aIDs)} aIDs, {failed} failed')
+    return 1 if failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='yahoo-auction',
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--cookies', '-c', default=os.environ.get('YAHOO_AUCTION_COOKIES'),
+        help='JSON file of cookies, $YAHOO_AUCTION_COOKIES by default')
+    common.add_argument('--profile', default=os.environ.get('YAHOO_AUCTION_PROFILE'),
+        help='Chrome profile logged in to Yahoo, to refresh expired cookies from and write them to --cookies, '
+        '$YAHOO_AUCTION_PROFILE by default')
+    common.add_argument('--concurrency', '-j', type=int, default=8, help='max requests in flight (default: 8)')
+    common.add_argument('--rate', '-r', type=float, default=None, help='max requests per second (default: unlimited)')
+    common.add_argument('--retries', type=int, default=2, help='retries of a failed GET request (default: 2)')
+    common.add_argument('--format', '-f', choices=['ndjson', 'csv'], default='ndjson', help='output format (default: ndjson)')
+    common.add_argument('--parser', choices=['bs4', 'bs4-partial', 'lxml'], default='lxml', help='parser backend (default: lxml)')
+    common.add_argument('--base-url', default=None, help='serve every page from this URL, such as a stub server')
+
+    commands = parser.add_subparsers(dest='command', required=True)
+    aids = commands.add_parser('aids', parents=[common], help='list aIDs of a mystatus list')
+    aids.add_argument('list', choices=LISTS)
+    aids.set_defaults(run=_list_aIDs)
+
+    info = commands.add_parser('info', parents=[common], help='fetch selling information of aIDs')
+    info.add_argument('aIDs', nargs='*', help='aIDs, read from stdin if omitted or -')
+    info.set_defaults(run=_info)
+
+    cancel = commands.add_parser('cancel', parents=[common], help='cancel sellings of aIDs')
+    cancel.add_argument('aIDs', nargs='*', help='aIDs, read from stdin if omitted or -')
+    cancel.add_argument('--fallback', action='store_true', help='retry failed aIDs with Chrome')
+    cancel.set_defaults(run=_cancel)
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """ Run the command of `argv`, or of the command line, and return the exit status. """
+    args: argparse.Namespace = build_parser().parse_args(argv)
+    if args.concurrency < 1:
+        print('yahoo-auction: --concurrency must be positive', file=sys.stderr)
+        return 2
+    if args.rate is not None and args.rate <= 0:
+        print('yahoo-auction: --rate must be positive', file=sys.stderr)
+        return 2
+    if args.retries < 0:
+        print('yahoo-auction: --retries must not be negative', file=sys.stderr)
+        return 2
+    # without cookies every list is empty, which looks like a success
+    if not args.cookies and not args.base_url:
+        print('yahoo-auction: --cookies or $YAHOO_AUCTION_COOKIES is required', file=sys.stderr)
+        return 2
+    try:
+        status: int = asyncio.run(args.run(args))
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # the reader, such as `head`, has gone; stop quietly instead of a traceback on exit
+        devnull: int = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
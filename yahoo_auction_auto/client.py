@@ -0,0 +1,482 @@
+import asyncio
+import email.utils
+import importlib.util
+import logging
+import time
+from types import TracebackType
+from typing import Any, Awaitable, Callable, Optional, Type
+
+import httpx
+
+from yahoo_auction_auto.cache import CacheEntry, ResponseCache
+from yahoo_auction_auto.limiter import HostLimiter, Limiter
+from yahoo_auction_auto.metrics import Metrics, RequestTrace
+from yahoo_auction_auto.retry import RETRY_STATUSES, Hedging, RetryBudget, RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+
+def _h2_available() -> bool:
+    return importlib.util.find_spec('h2') is not None
+
+
+def pool_transport(
+    http2: bool = True,
+    max_connections: int = 20,
+    max_keepalive_connections: int = 10,
+    keepalive_expiry: float = 30.0
+) -> httpx.AsyncHTTPTransport:
+    """ Return a transport pooling connections, with HTTP/2 if `http2` and the `h2` package is installed. """
+    limits: httpx.Limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry
+    )
+    return httpx.AsyncHTTPTransport(http2=http2 and _h2_available(), limits=limits)
+
+
+
+class SharedTransport(httpx.AsyncBaseTransport):
+    """ Transport sending requests over `transport` but not closing it on `aclose`.
+
+    Clients with their own cookie jars given this share the connections of `transport`,
+    which its owner closes after them.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self.transport: httpx.AsyncBaseTransport = transport
+
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.transport.handle_async_request(request)
+
+
+    async def aclose(self) -> None:
+        pass
+
+
+
+class HTTPClient:
+    """ Async HTTP client with keep-alive connection pooling.
+
+    One instance is owned by `YahooAuction` and every list, detail, cancel and login
+    request goes through it, so that connections to Yahoo Auction are reused
+    instead of doing a new TCP+TLS handshake per request,
+    and requests to a host are throttled together by `limiter`.
+    """
+
+    def __init__(
+        self,
+        cookies: dict[str, str],
+        *,
+        http2: bool = True,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 60.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        cache: Optional[ResponseCache] = None,
+        metrics: Optional[Metrics] = None,
+        limiter: Optional[Limiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        hedging: Optional[Hedging] = None
+    ) -> None:
+        """
+        Parameters
+        ----------
+        cookies : dict[str, str]
+            Cookies to get session.
+        http2 : bool
+            Use HTTP/2 if the `h2` package is installed.
+        max_connections : int
+            Max number of connections in the pool.
+        max_keepalive_connections : int
+            Max number of idle connections kept alive.
+        keepalive_expiry : float
+            Seconds an idle connection is kept alive.
+        timeout : float
+            Default timeout of a request in seconds.
+        transport : httpx.AsyncBaseTransport | None
+            Transport to send requests with.
+            If given, `http2` and the pool limits are ignored.
+        cache : ResponseCache | None
+            Cache of GET responses. Nothing is cached if None.
+        metrics : Metrics | None
+            Receiver of a `request` event per request. Nothing is measured if None.
+        limiter : Limiter | None
+            Rate and adaptive concurrency limit per host. Not limited if None.
+        retry : RetryPolicy | None
+            Retries of failed requests. Not retried if None.
+        hedging : Hedging | None
+            Duplicates of slow GET requests. Not duplicated if None.
+        """
+        self.metrics: Optional[Metrics] = metrics
+        # awaited for a request redirected to the login page, which is sent again once if it returns True
+        self.on_login_required: Optional[Callable[[], Awaitable[bool]]] = None
+        self.limiter: Optional[Limiter] = limiter
+        self.retry: Optional[RetryPolicy] = retry
+        self.hedging: Optional[Hedging] = hedging
+        self._budgets: list[RetryBudget] = []
+        for budget in (retry.budget if retry else None, hedging.budget if hedging else None):
+            if budget is not None and all(budget is not b for b in self._budgets):
+                self._budgets.append(budget)
+        self._cache: Optional[ResponseCache] = cache
+        self._cookies: dict[str, str] = dict(cookies)
+        if transport is None:
+            transport = pool_transport(http2, max_connections, max_keepalive_connections, keepalive_expiry)
+        self._client: httpx.AsyncClient = httpx.AsyncClient(
+            cookies=cookies,
+            transport=transport,
+            timeout=timeout,
+            follow_redirects=True
+        )
+
+
+    @property
+    def cookies(self) -> httpx.Cookies:
+        """ Cookie jar of the session. """
+        return self._client.cookies
+
+
+    def set_cookies(self, cookies: dict[str, str]) -> None:
+        """ Replace the cookies of the session. Responses cached with the old cookies are not used. """
+        self._cookies = dict(cookies)
+        self._client.cookies.clear()
+        self._client.cookies.update(cookies)
+
+
+    async def get(
+        self, 
+        url: str, 
+        *, 
+        kind: Optional[str] = None, 
+        timeout: Optional[float] = None
+    ) -> httpx.Response:
+        """ Send GET request to `url` and raise for error status.
+
+        Parameters
+        ----------
+        url : str
+            URL to get.
+        kind : str | None
+            URL class such as `list` or `detail`, which selects the TTL of the cache
+            and labels the request in metrics. The response is not cached if None.
+        timeout : float | None
+            Timeout in seconds. Default timeout of the client if None.
+
+        Returns
+        -------
+        httpx.Response
+        """
+        if self._cache is None or kind is None or kind not in self._cache.ttl:
+            response: httpx.Response = await self._send('GET', url, kind, 'off', **_timeout(timeout))
+            response.raise_for_status()
+            return response
+        return await self._get_cached(self._cache, url, kind, timeout)
+
+
+    async def _send(self, method: str, url: str, kind: Optional[str], cache: str, **kwargs: Any) -> httpx.Response:
+        response: httpx.Response = await self._retried(method, url, kind, cache, **kwargs)
+        hook: Optional[Callable[[], Awaitable[bool]]] = self.on_login_required
+        # the login check itself reports a redirect instead of refreshing
+        if hook is not None and kind != 'login' and _is_login_redirect(response) and await hook():
+            response = await self._retried(method, url, kind, cache, **kwargs)
+        return response
+
+
+    async def _retried(self, method: str, url: str, kind: Optional[str], cache: str, **kwargs: Any) -> httpx.Response:
+        for budget in self._budgets:
+            budget.deposit()
+        retry: Optional[RetryPolicy] = self.retry
+        if retry is None or method not in retry.methods:
+            return await self._hedged(method, url, kind, cache, **kwargs)
+
+        attempt: int = 0
+        while True:
+            delay: Optional[float]
+            try:
+                response: httpx.Response = await self._hedged(method, url, kind, cache, **kwargs)
+            except httpx.TransportError as e:
+                delay = retry.delay(attempt)
+                if delay is None:
+                    raise
+                logger.warning(f'retrying {method} {url} in {delay:.2f}s after {type(e).__name__}: {e}')
+            else:
+                if response.status_code not in retry.statuses:
+                    return response
+                delay = retry.delay(attempt, _retry_after(response))
+                if delay is None:
+                    return response
+                logger.warning(f'retrying {method} {url} in {delay:.2f}s after status {response.status_code}')
+            attempt += 1
+            await asyncio.sleep(delay)
+
+
+    async def _hedged(self, method: str, url: str, kind: Optional[str], cache: str, **kwargs: Any) -> httpx.Response:
+        """ Send a request, and a duplicate if it is still pending after the delay of `hedging`.
+
+        A response of a retryable status is kept only if the other request fails too.
+        """
+        hedging: Optional[Hedging] = self.hedging
+        if hedging is None or method != 'GET':
+            return await self._limited(method, url, kind, cache, **kwargs)
+
+        statuses: frozenset[int] = self.retry.statuses if self.retry is not None else frozenset(RETRY_STATUSES)
+        acquired: list[float] = []  # times the requests got through the limiter
+        first: asyncio.Task[httpx.Response] = asyncio.ensure_future(
+            self._limited(method, url, kind, cache, acquired=acquired, **kwargs)
+        )
+        pending: set[asyncio.Task[httpx.Response]] = {first}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=hedging.delay(kind))
+            if not done and hedging.try_hedge():
+                pending.add(asyncio.ensure_future(self._limited(method, url, kind, cache, acquired=acquired, **kwargs)))
+            failed: Optional[httpx.Response] = None
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # prefer the first request if both are done
+                for task in sorted(done, key=lambda task: task is not first):
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                    elif task.result().status_code in statuses:
+                        failed = failed or task.result()
+                    else:
+                        if task is not first:
+                            hedging.won += 1
+                        hedging.observe(kind, time.monotonic() - acquired[0])
+                        return task.result()
+            if failed is not None:
+                return failed
+            assert error is not None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+
+
+    async def _limited(
+        self,
+        method: str,
+        url: str,
+        kind: Optional[str],
+        cache: str,
+        acquired: Optional[list[float]] = None,
+        **kwargs: Any
+    ) -> httpx.Response:
+        """ Send a request once the limiter of its host allows, and append the time it did to `acquired`. """
+        if self.limiter is None:
+            if acquired is not None:
+                acquired.append(time.monotonic())
+            return await self._request(method, url, kind, cache, **kwargs)
+
+        limiter: HostLimiter = self.limiter.host(url)
+        await limiter.acquire()
+        start: float = time.monotonic()
+        if acquired is not None:
+            acquired.append(start)
+        try:
+            response: httpx.Response = await self._request(method, url, kind, cache, **kwargs)
+        except asyncio.CancelledError:  # such as the slower of hedged requests
+            limiter.release(None, time.monotonic() - start, count=False)
+            raise
+        except BaseException:
+            limiter.release(None, time.monotonic() - start)
+            raise
+        limiter.release(response.status_code, time.monotonic() - start, _retry_after(response))
+        return response
+
+
+    async def _request(self, method: str, url: str, kind: Optional[str], cache: str, **kwargs: Any) -> httpx.Response:
+        metrics: Optional[Metrics] = self.metrics
+        if metrics is None:
+            return await self._client.request(method, url, **kwargs)
+
+        trace: RequestTrace = RequestTrace()
+        status: str = 'error'
+        downloaded: int = 0
+        start: float = time.perf_counter()
+        try:
+            response: httpx.Response = await self._client.request(method, url, extensions={'trace': trace}, **kwargs)
+            status = str(response.status_code)
+            downloaded = response.num_bytes_downloaded
+            return response
+        except asyncio.CancelledError:
+            status = 'cancelled'
+            raise
+        finally:
+            seconds: float = time.perf_counter() - start
+            metrics.emit(
+                'request',
+                seconds,
+                {'kind': kind or 'other', 'method': method, 'status': status, 'cache': cache},
+                connect_seconds=trace.connect,
+                transfer_seconds=seconds - trace.connect,
+                bytes=downloaded
+            )
+
+
+    async def _get_cached(
+        self, 
+        cache: ResponseCache, 
+        url: str, 
+        kind: str, 
+        timeout: Optional[float]
+    ) -> httpx.Response:
+        key: str = cache.key(url, self._cookies)
+        entry: Optional[CacheEntry] = await cache.aget(key)
+        if entry is not None and cache.is_fresh(entry, kind):
+            if self.metrics is not None:
+                self.metrics.emit('request', 0.0, {'kind': kind, 'method': 'GET', 'status': '200', 'cache': 'hit'})
+            return _cached_response(url, entry)
+
+        if entry is not None and not entry.revalidatable:
+            entry = None  # stale, and the server cannot tell if it is still valid
+        headers: dict[str, str] = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        response: httpx.Response = await self._send(
+            'GET', 
+            url, 
+            kind, 
+            'miss' if entry is None else 'revalidate', 
+            headers=headers, 
+            **_timeout(timeout)
+        )
+        if entry is not None and response.status_code == httpx.codes.NOT_MODIFIED:
+            await cache.atouch(key, entry)
+            return _cached_response(url, entry)
+        response.raise_for_status()
+
+        # a redirected response is usually the login page, not the page of `url`
+        if response.status_code == httpx.codes.OK and str(response.url) == url:
+            await cache.aput(key, CacheEntry(
+                url, 
+                response.content, 
+                time.time(), 
+                response.headers.get('ETag'), 
+                response.headers.get('Last-Modified')
+            ))
+        return response
+
+
+    async def post(
+        self,
+        url: str,
+        data: dict[str, str],
+        *,
+        kind: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> httpx.Response:
+        """ Send POST request of form `data` to `url` and raise for error status.
+
+        Parameters
+        ----------
+        url : str
+            URL to post.
+        data : dict[str, str]
+            Form data.
+        kind : str | None
+            URL class labeling the request in metrics.
+        timeout : float | None
+            Timeout in seconds. Default timeout of the client if None.
+
+        Returns
+        -------
+        httpx.Response
+        """
+        response: httpx.Response = await self._send('POST', url, kind, 'off', data=data, **_timeout(timeout))
+        response.raise_for_status()
+        return response
+
+
+    async def send_once(
+        self,
+        method: str,
+        url: str,
+        data: Optional[dict[str, str]] = None,
+        *,
+        kind: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> httpx.Response:
+        """ Send a request exactly once and raise for error status.
+
+        For a request that must not be repeated, such as the confirm of a cancel:
+        it is neither retried nor hedged, nor sent again when redirected to the login page.
+        It is still throttled by `limiter` and measured by `metrics`.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method such as `GET` or `POST`.
+        url : str
+            URL to send to.
+        data : dict[str, str] | None
+            Form data of the body. No body if None.
+        kind : str | None
+            URL class labeling the request in metrics.
+        timeout : float | None
+            Timeout in seconds. Default timeout of the client if None.
+
+        Returns
+        -------
+        httpx.Response
+        """
+        if data is not None:
+            response: httpx.Response = await self._limited(method, url, kind, 'off', data=data, **_timeout(timeout))
+        else:
+            response = await self._limited(method, url, kind, 'off', **_timeout(timeout))
+        response.raise_for_status()
+        return response
+
+
+    async def aclose(self) -> None:
+        """ Close all connections in the pool. """
+        await self._client.aclose()
+
+
+    async def __aenter__(self) -> 'HTTPClient':
+        return self
+
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        await self.aclose()
+
+
+
+def _cached_response(url: str, entry: CacheEntry) -> httpx.Response:
+    return httpx.Response(httpx.codes.OK, content=entry.content, request=httpx.Request('GET', url))
+
+
+def _is_login_redirect(response: httpx.Response) -> bool:
+    """ True if `response` was redirected to the login page, such as of expired cookies. """
+    return bool(response.history) and (response.url.host.startswith('login.') or response.url.path.startswith('/login'))
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """ Seconds of `Retry-After` of `response`, given in seconds or as a date. """
+    value: Optional[str] = response.headers.get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _timeout(timeout: Optional[float]) -> dict[str, Any]:
+    return {} if timeout is None else {'timeout': timeout}
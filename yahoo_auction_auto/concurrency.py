@@ -0,0 +1,76 @@
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Iterable, TypeVar, Union
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+_DONE = object()
+
+
+class _Failed:
+    """ Marks an error raised by `items` itself. """
+
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+
+
+async def as_completed_bounded(
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    concurrency: int
+) -> AsyncIterator[tuple[T, Union[R, Exception]]]:
+    """ Run `func` over `items` concurrently and yield results as they finish.
+
+    At most `concurrency` calls run at once.
+    An exception raised by one call is yielded in place of its result,
+    so that one bad item doesn't stop the others.
+
+    Parameters
+    ----------
+    func : Callable[[T], Awaitable[R]]
+        Coroutine function applied to each item.
+    items : Iterable[T]
+        Items to process. Consumed lazily.
+    concurrency : int
+        Max number of calls running at once.
+
+    Yields
+    ------
+    tuple[T, R | Exception]
+        Item and its result, or the exception raised for it.
+    """
+    if concurrency < 1:
+        raise ValueError(f'concurrency must be positive: {concurrency}')
+
+    iterator = iter(items)
+    results: asyncio.Queue[object] = asyncio.Queue(maxsize=concurrency)
+
+    async def worker() -> None:
+        try:
+            for item in iterator:
+                result: Union[R, Exception]
+                try:
+                    result = await func(item)
+                except Exception as e:
+                    result = e
+                await results.put((item, result))
+        except Exception as e:
+            await results.put(_Failed(e))
+            return
+        await results.put(_DONE)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    running: int = len(workers)
+    try:
+        while running > 0:
+            entry = await results.get()
+            if entry is _DONE:
+                running -= 1
+                continue
+            if isinstance(entry, _Failed):
+                raise entry.error
+            yield entry  # type: ignore[misc]
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
@@ -1,8 +1,11 @@
+import os
 import time
-from typing import Any
+from typing import Any, Optional
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from .chrome import chrome
+from .metrics import Metrics
+from .session import LoginRequired
 from .urls import YahooAuctionURL
 
 def get_cookies() -> list[dict[str, Any]]:
@@ -11,9 +14,19 @@ def get_cookies() -> list[dict[str, Any]]:
     
 
 
-def get_username_and_cookies() -> tuple[str, list[dict[str, Any]]]:
+def get_username_and_cookies(profile_dir: Optional[str] = None) -> tuple[str, list[dict[str, Any]]]:
+    """ Open Chrome, wait for a login by hand and return the username and cookies.
+
+    Parameters
+    ----------
+    profile_dir : str | None
+        Chrome user-data directory the login is kept in,
+        for `get_cookies_from_profile` to refresh cookies from later. A temporary one if None.
+    """
     options = Options()
     options.add_experimental_option('excludeSwitches', ['enable-logging', 'enable-automation'])
+    if profile_dir is not None:
+        options.add_argument(f'--user-data-dir={os.path.abspath(profile_dir)}')
 
     with chrome(options) as driver:
         driver.get(YahooAuctionURL.MYPAGE)
@@ -22,12 +35,53 @@ def get_username_and_cookies() -> tuple[str, list[dict[str, Any]]]:
                 break
             time.sleep(1)
         username = driver. \
-            find_element_by_class_name('yjmthloginarea'). \
+            find_element(By.CLASS_NAME, 'yjmthloginarea'). \
             find_element(By.TAG_NAME, 'strong'). \
             text
         cookies = driver.get_cookies()
     return username, cookies
 
 
+def get_cookies_from_profile(
+    profile_dir: str,
+    urls: Optional[YahooAuctionURL] = None,
+    headless: bool = True,
+    metrics: Optional[Metrics] = None
+) -> list[dict[str, Any]]:
+    """ Return fresh cookies of the login kept in a Chrome profile, without logging in again.
+
+    Chrome locks the profile, so only one call may use `profile_dir` at a time.
 
+    Parameters
+    ----------
+    profile_dir : str
+        Chrome user-data directory logged in by `get_username_and_cookies(profile_dir)`.
+    urls : YahooAuctionURL | None
+        URLs of the site. The real site if None.
+    headless : bool
+        Run Chrome in headless mode.
+    metrics : Metrics | None
+        Receiver of a `driver_start` event. Nothing is measured if None.
 
+    Returns
+    -------
+    list[dict[str, Any]]
+
+    Raises
+    ------
+    LoginRequired
+        If the login of the profile has expired too.
+    """
+    urls = urls or YahooAuctionURL()
+    options = Options()
+    options.add_experimental_option('excludeSwitches', ['enable-logging', 'enable-automation'])
+    options.add_argument(f'--user-data-dir={os.path.abspath(profile_dir)}')
+    if headless:
+        options.add_argument('--headless')
+
+    with chrome(options, metrics) as driver:
+        driver.get(urls.MYPAGE)
+        if driver.current_url != urls.MYPAGE:
+            raise LoginRequired(f'profile is logged out, log in by get_username_and_cookies: {profile_dir}')
+        cookies: list[dict[str, Any]] = driver.get_cookies()
+    return cookies
@@ -1,6 +1,8 @@
+from yahoo_auction_auto.info.summary import InfoSummary
 
 
+class InfoClosedWithWinner(InfoSummary):
+    """ Product closed with a winner, read from a row of the closed list page.
 
-class InfoClosedWithWinner:
-    
-    pass
\ No newline at end of file
+    `price` is the winning price and `end_datetime` the closing time.
+    """
@@ -1,5 +1,9 @@
+from yahoo_auction_auto.info.summary import InfoSummary
 
 
+class InfoClosedWithoutWinner(InfoSummary):
+    """ Product closed with no winner, read from a row of the closed list page.
 
-class InfoClosedWithoutWinner:
-    pass
\ No newline at end of file
+    `price` is the last price shown, the start price as nobody bid,
+    and `end_datetime` the closing time.
+    """
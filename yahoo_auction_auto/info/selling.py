@@ -1,14 +1,23 @@
-from http.client import INSUFFICIENT_STORAGE
+from __future__ import annotations
+
 import re
 from datetime import datetime
-from typing import Optional, Pattern
+from typing import TYPE_CHECKING, Optional, Pattern, Union
 
-import requests
-import requests_async
-import bs4
+import httpx
 
+from yahoo_auction_auto.client import HTTPClient
+from yahoo_auction_auto.metrics import Metrics, measure
+from yahoo_auction_auto.parsers import Parser, get_parser
 from yahoo_auction_auto.urls import YahooAuctionURL
 
+if TYPE_CHECKING:
+    import bs4
+    from yahoo_auction_auto.parsers.pool import ParsePool
+
+# datetime of a field not found on the page
+MISSING_DATETIME: datetime = datetime(2000, 1, 1)
+
 class InfoSelling:
     aID: str
     title: str
@@ -28,28 +37,242 @@ class InfoSelling:
         self.aID = aID
 
     
-    async def update(self, cookies: dict[str, str], timeout: int=60) -> None:
-        url: str = YahooAuctionURL.AUCTION(self.aID)
-        response: requests.Response = await requests_async.get(url, cookies=cookies, timeout=timeout)
-        response.raise_for_status()
-        soup: bs4.BeautifulSoup = bs4.BeautifulSoup(response.content, 'lxml')
-
-        self.title = _get_title(soup)
-        self.seller_name = _get_seller_name(soup)
-        self.stack = _get_stack(soup)
-        self.start_datetime = _get_start_datetime(soup)
-        self.end_datetime = _get_end_datetime(soup)
-        self.refundable = _get_refundable(soup)
-        self.startprice = _get_startprice(soup)
-        self.timeleft = _get_timeleft(soup)
-        self.count_bid = _get_count_bid(soup)
-        self.count_access = _get_count_access(soup)
-        self.count_watch = _get_count_watch(soup)
+    async def update(
+        self, 
+        client: Union[HTTPClient, dict[str, str]], 
+        timeout: int=60, 
+        partial: bool = False,
+        parser: Optional[Union[str, Parser]] = None,
+        urls: Optional[YahooAuctionURL] = None,
+        pool: Optional[ParsePool] = None
+    ) -> None:
+        """ Fetch the auction page and update the fields. 
+        
+        Parameters
+        ----------
+        client : HTTPClient | dict[str, str]
+            Client to send the request with. 
+            Cookies are also accepted, in which case a one-off client is used.
+        timeout : int
+            Timeout in seconds.
+        partial : bool
+            Parse only the blocks read by the scrapers.
+        parser : str | Parser | None
+            Parser backend, which overrides `partial`. See `parsers.PARSERS`.
+        urls : YahooAuctionURL | None
+            URLs of the site. The real site if None.
+        pool : ParsePool | None
+            Pool to parse the page in. Parsed on the event loop if None.
+        """
+        if isinstance(client, dict):
+            async with HTTPClient(client) as one_off:
+                await self.update(one_off, timeout, partial, parser, urls, pool)
+            return
+
+        metrics: Optional[Metrics] = client.metrics
+        with measure(metrics, 'call', call='InfoSelling.update'):
+            url: str = (urls or YahooAuctionURL()).auction(self.aID)
+            response: httpx.Response = await client.get(url, kind='detail', timeout=timeout)
+            backend: Parser = get_parser(parser or ('bs4-partial' if partial else 'bs4'))
+            with measure(metrics, 'parse', kind='detail', parser=backend.name) as values:
+                values['bytes'] = len(response.content)
+                if pool is None:
+                    self.parse(response.content, parser=backend)
+                else:
+                    self.apply(await pool.run(backend.detail, response.content))
+
+
+    def parse(
+        self, 
+        content: bytes, 
+        partial: bool = False, 
+        parser: Optional[Union[str, Parser]] = None
+    ) -> None:
+        """ Update the fields from HTML of the auction page. 
+        
+        Parameters
+        ----------
+        content : bytes
+            HTML of the page of YahooAuctionURL.AUCTION(aID).
+        partial : bool
+            Parse only the blocks read by the scrapers, 
+            which gives the same fields with less time and memory.
+        parser : str | Parser | None
+            Parser backend, which overrides `partial`. See `parsers.PARSERS`.
+        """
+        if parser is None:
+            parser = 'bs4-partial' if partial else 'bs4'
+        self.apply(get_parser(parser).detail(content))
+
+
+    def apply(self, index: _PageIndex) -> None:
+        """ Update the fields from the index of the auction page built by a parser backend. """
+        self.title = index.title
+        self.seller_name = index.seller_name
+        self.stack = _parse_stack(index)
+        self.start_datetime = _parse_start_datetime(index)
+        self.end_datetime = _parse_end_datetime(index)
+        self.refundable = _parse_refundable(index)
+        self.startprice = _parse_startprice(index)
+        self.timeleft = _parse_timeleft(index)
+        self.count_bid = _parse_count_bid(index)
+        self.count_access = _parse_count_access(index)
+        self.count_watch = _parse_count_watch(index)
 
 
 
 # scraping functions
 # soup is from YahooAuctionURL.AUCTION()
+class _PageIndex:
+    """ Label → value index of a Yahoo Auction page. 
+    
+    Built by a parser backend in a single pass over the page, 
+    so that every field can be filled without searching the tree again.
+    """
+    title: str
+    seller_name: str
+    details: dict[str, str]     # ProductDetail__title → ProductDetail__description
+    counts: dict[str, str]      # Count__title → Count__number
+    statistics: dict[str, str]  # StatisticsInfo__term--{key} → StatisticsInfo__data
+
+
+    def __init__(self) -> None:
+        self.title = ''
+        self.seller_name = ''
+        self.details = {}
+        self.counts = {}
+        self.statistics = {}
+
+
+
+_INDEXED_CLASSES: frozenset[str] = frozenset((
+    'ProductTitle__text',
+    'ProductDetail__title',
+    'Count__title',
+    'StatisticsInfo__term',
+))
+_SELLER_PATTERN: Pattern[str] = re.compile(r'^rsec:seller;slk:slfinfo;')
+_STATISTICS_PREFIX: str = 'StatisticsInfo__term--'
+
+
+def _is_indexed(tag: bs4.element.Tag) -> bool:
+    if tag.name == 'a':
+        return bool(_SELLER_PATTERN.match(str(tag.get('data-ylk', ''))))
+    return not _INDEXED_CLASSES.isdisjoint(tag.get_attribute_list('class'))
+
+
+def _index_page(soup: bs4.BeautifulSoup) -> _PageIndex:
+    """ Build label → value index from `soup`. 
+    
+    Parameters
+    ----------
+    soup : bs4.BeautifulSoup
+        Soup of a Yahoo Auction page.
+
+    Returns
+    -------
+    _PageIndex
+        Index of ProductTitle, ProductDetail, Count, StatisticsInfo and seller.
+        The first occurrence wins for every label.
+    """
+    index: _PageIndex = _PageIndex()
+    seller_found: bool = False
+    title_found: bool = False
+    for tag in soup.find_all(_is_indexed):
+        if tag.name == 'a':
+            if not seller_found:
+                index.seller_name = str(tag.text)
+                seller_found = True
+            continue
+
+        classes: list[str] = tag.get_attribute_list('class')
+        if 'ProductTitle__text' in classes:
+            if tag.name == 'h1' and not title_found:
+                index.title = str(tag.text)
+                title_found = True
+        elif 'ProductDetail__title' in classes:
+            value = tag.find_next_sibling('dd', {'class': 'ProductDetail__description'})
+            if value:
+                index.details.setdefault(tag.text.strip(), str(value.text))
+        elif 'Count__title' in classes:
+            value = tag.find_next_sibling('dd', {'class': 'Count__number'})
+            if value:
+                index.counts.setdefault(tag.text.strip(), str(value.text))
+        else:
+            value = tag.find_next_sibling('span', {'class': 'StatisticsInfo__data'})
+            if value:
+                for cls in classes:
+                    if cls.startswith(_STATISTICS_PREFIX):
+                        index.statistics.setdefault(cls[len(_STATISTICS_PREFIX):], str(value.text))
+    return index
+
+
+def _parse_stack(index: _PageIndex) -> int:
+    text: Optional[str] = index.details.get('個数')
+    return int(text[1:]) if text else 0
+
+
+def _parse_start_datetime(index: _PageIndex) -> datetime:
+    text: Optional[str] = index.details.get('開始日時')
+    return _from_yahoo_datetime(text[1:]) if text else MISSING_DATETIME
+
+
+def _parse_end_datetime(index: _PageIndex) -> datetime:
+    text: Optional[str] = index.details.get('終了日時')
+    return _from_yahoo_datetime(text[1:]) if text else MISSING_DATETIME
+
+
+def _parse_refundable(index: _PageIndex) -> bool:
+    text: Optional[str] = index.details.get('返品')
+    return bool(text[1:] != '返品不可') if text else False
+
+
+def _parse_startprice(index: _PageIndex) -> str:
+    text: Optional[str] = index.details.get('開始価格')
+    return str(text[1:]) if text else ''
+
+
+def _parse_timeleft(index: _PageIndex) -> str:
+    text: Optional[str] = index.counts.get('残り時間')
+    return str(text.splitlines()[0]) if text else ''
+
+
+def _parse_count_bid(index: _PageIndex) -> int:
+    text: Optional[str] = index.counts.get('入札件数')
+    return int(text[:-4]) if text else 0
+
+
+def _parse_count_access(index: _PageIndex) -> int:
+    text: Optional[str] = index.statistics.get('access')
+    return int(text) if text else 0
+
+
+def _parse_count_watch(index: _PageIndex) -> int:
+    text: Optional[str] = index.statistics.get('watch')
+    return int(text) if text else 0
+
+
+def _from_yahoo_datetime(datetimestr: str) -> datetime:
+    """ From format `YYYY.MM.DD（d）HH:MM 
+    
+    Parameters
+    ----------
+    datetimestr : str
+        String of datetime on a Yahoo Auction page.
+
+    Returns
+    -------
+    datetime
+    """
+    year: int = int(datetimestr[:4])
+    month: int = int(datetimestr[5:7])
+    day: int = int(datetimestr[8:10])
+    hour: int = int(datetimestr[13:15])
+    min: int = int(datetimestr[16:18])
+    return datetime(year, month, day, hour, min)
+
+
+# thin wrappers of the index, kept for compatibility
 def _get_title(soup: bs4.BeautifulSoup) -> str:
     """ Return product title from `soup`. 
     
@@ -64,11 +287,7 @@ def _get_title(soup: bs4.BeautifulSoup) -> str:
         Product title.
 
     """
-    titles: bs4.element.ResultSet = soup.find_all('h1', {'class': 'ProductTitle__text'})
-    if len(titles) > 0:
-        return str(titles[0].text)
-    else:
-        return ''
+    return _index_page(soup).title
 
 
 def _get_seller_name(soup: bs4.BeautifulSoup) -> str:
@@ -85,12 +304,7 @@ def _get_seller_name(soup: bs4.BeautifulSoup) -> str:
         Seller name.
 
     """
-    pattern: Pattern[str] = re.compile(r'^rsec:seller;slk:slfinfo;')
-    seller_names = soup.find_all('a', {'data-ylk': pattern})
-    if len(seller_names) > 0:
-        return str(seller_names[0].text)
-    else:
-        return ''
+    return _index_page(soup).seller_name
 
 
 def _get_stack(soup: bs4.BeautifulSoup) -> int:
@@ -107,33 +321,7 @@ def _get_stack(soup: bs4.BeautifulSoup) -> int:
         Stack count.
 
     """
-    tags = soup.find_all('dt', text='個数')
-    if len(tags) > 0:
-        tag = tags[0]
-        if isinstance(tag, bs4.element.Tag):
-            tag = tag.find_next_sibling('dd', {'class': 'ProductDetail__description'})
-            return int(tag.text[1:]) if tag else 0
-    return 0
-
-
-def _from_yahoo_datetime(datetimestr: str) -> datetime:
-    """ From format `YYYY.MM.DD（d）HH:MM 
-    
-    Parameters
-    ----------
-    datetimestr : str
-        String of datetime on a Yahoo Auction page.
-
-    Returns
-    -------
-    datetime
-    """
-    year: int = int(datetimestr[:4])
-    month: int = int(datetimestr[5:7])
-    day: int = int(datetimestr[8:10])
-    hour: int = int(datetimestr[13:15])
-    min: int = int(datetimestr[16:18])
-    return datetime(year, month, day, hour, min)
+    return _parse_stack(_index_page(soup))
 
 
 def _get_start_datetime(soup: bs4.BeautifulSoup) -> datetime:
@@ -150,13 +338,7 @@ def _get_start_datetime(soup: bs4.BeautifulSoup) -> datetime:
         Start datetime.
 
     """
-    tags = soup.find_all('dt', text='開始日時')
-    if len(tags) > 0:
-        tag = tags[0]
-        if isinstance(tag, bs4.element.Tag):
-            tag = tag.find_next_sibling('dd', {'class': 'ProductDetail__description'})
-            return _from_yahoo_datetime(tag.text[1:])
-    return datetime(2000, 1, 1)
+    return _parse_start_datetime(_index_page(soup))
 
 
 def _get_end_datetime(soup: bs4.BeautifulSoup) -> datetime:
@@ -173,13 +355,7 @@ def _get_end_datetime(soup: bs4.BeautifulSoup) -> datetime:
         End datetime.
 
     """
-    tags = soup.find_all('dt', text='終了日時')
-    if len(tags) > 0:
-        tag = tags[0]
-        if isinstance(tag, bs4.element.Tag):
-            tag = tag.find_next_sibling('dd', {'class': 'ProductDetail__description'})
-            return _from_yahoo_datetime(tag.text[1:])
-    return datetime(2000, 1, 1)
+    return _parse_end_datetime(_index_page(soup))
 
 
 def _get_refundable(soup: bs4.BeautifulSoup) -> bool:
@@ -196,13 +372,7 @@ def _get_refundable(soup: bs4.BeautifulSoup) -> bool:
         Return True if the product of `soup` is refundable.
 
     """
-    tags = soup.find_all('dt', text='返品')
-    if len(tags) > 0:
-        tag = tags[0]
-        if isinstance(tag, bs4.element.Tag):
-            tag = tag.find_next_sibling('dd', {'class': 'ProductDetail__description'})
-            return bool(tag.text[1:] != '返品不可')
-    return False
+    return _parse_refundable(_index_page(soup))
 
 
 def _get_startprice(soup: bs4.BeautifulSoup) -> str:
@@ -218,13 +388,7 @@ def _get_startprice(soup: bs4.BeautifulSoup) -> str:
     str
         Start price. e.g. 10,000 円（税 0 円）
     """
-    tags = soup.find_all('dt', text='開始価格')
-    if len(tags) > 0:
-        tag = tags[0]
-        if isinstance(tag, bs4.element.Tag):
-            tag = tag.find_next_sibling('dd', {'class': 'ProductDetail__description'})
-            return str(tag.text[1:])
-    return ''
+    return _parse_startprice(_index_page(soup))
 
 
 def _get_timeleft(soup: bs4.BeautifulSoup) -> str:
@@ -240,13 +404,8 @@ def _get_timeleft(soup: bs4.BeautifulSoup) -> str:
     str
         String of timeleft.
     """
-    tags = soup.find_all('dt', text='残り時間')
-    if len(tags) > 0:
-        tag = tags[0]
-        if isinstance(tag, bs4.element.Tag):
-            tag = tag.find_next_sibling('dd', {'class': 'Count__number'})
-            return str(tag.text.splitlines()[0])
-    return ''
+    return _parse_timeleft(_index_page(soup))
+
 
 def _get_count_bid(soup: bs4.BeautifulSoup) -> int:
     """ Return bidding count from `soup`. 
@@ -261,13 +420,7 @@ def _get_count_bid(soup: bs4.BeautifulSoup) -> int:
     int
         Count of total bidding.
     """
-    tags = soup.find_all('dt', text='入札件数')
-    if len(tags) > 0:
-        tag = tags[0]
-        if isinstance(tag, bs4.element.Tag):
-            tag = tag.find_next_sibling('dd', {'class': 'Count__number'})
-            return int(tag.text[:-4])
-    return 0
+    return _parse_count_bid(_index_page(soup))
 
 
 def _get_count_access(soup: bs4.BeautifulSoup) -> int:
@@ -283,13 +436,7 @@ def _get_count_access(soup: bs4.BeautifulSoup) -> int:
     int
         Count of access.
     """
-    tags = soup.find_all('span', {'class': 'StatisticsInfo__term--access'})
-    if len(tags) > 0:
-        tag = tags[0]
-        if isinstance(tag, bs4.element.Tag):
-            tag = tag.find_next_sibling('span', {'class': 'StatisticsInfo__data'})
-            return int(tag.text)
-    return 0
+    return _parse_count_access(_index_page(soup))
 
 
 def _get_count_watch(soup: bs4.BeautifulSoup) -> int:
@@ -305,10 +452,4 @@ def _get_count_watch(soup: bs4.BeautifulSoup) -> int:
     int
         Count of watch.
     """
-    tags = soup.find_all('span', {'class': 'StatisticsInfo__term--watch'})
-    if len(tags) > 0:
-        tag = tags[0]
-        if isinstance(tag, bs4.element.Tag):
-            tag = tag.find_next_sibling('span', {'class': 'StatisticsInfo__data'})
-            return int(tag.text)
-    return 0
\ No newline at end of file
+    return _parse_count_watch(_index_page(soup))
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import re
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional, Pattern, Type, TypeVar
+
+from yahoo_auction_auto.info.table import parse_yen
+from yahoo_auction_auto.urls import aID_of
+
+if TYPE_CHECKING:
+    import bs4
+
+S = TypeVar('S', bound='InfoSummary')
+
+
+class InfoSummary:
+    """ Summary of a product read from a row of a mystatus list page.
+
+    Needs no request per product, unlike `InfoSelling`.
+    """
+    aID: str
+    url: str
+    title: str
+    price: int
+    count_bid: int
+    end_datetime: Optional[datetime]
+
+
+    def __init__(self, aID: str, url: str) -> None:
+        self.aID = aID
+        self.url = url
+        self.title = ''
+        self.price = 0
+        self.count_bid = 0
+        self.end_datetime = None
+
+
+    @classmethod
+    def from_summary(cls: Type[S], summary: InfoSummary) -> S:
+        """ Return an instance of `cls` with the fields of `summary`. """
+        info: S = cls(summary.aID, summary.url)
+        info.title = summary.title
+        info.price = summary.price
+        info.count_bid = summary.count_bid
+        info.end_datetime = summary.end_datetime
+        return info
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(aID={self.aID!r}, price={self.price}, end_datetime={self.end_datetime!r})'
+
+
+
+_PRICE_PATTERN: Pattern[str] = re.compile(r'([\d,]+)\s*円')
+_MONTH_DAY_PATTERN: Pattern[str] = re.compile(r'(\d{1,2})月(\d{1,2})日\D*?(\d{1,2})時(\d{1,2})分')
+_FULL_DATE_PATTERN: Pattern[str] = re.compile(r'(\d{4})[./](\d{1,2})[./](\d{1,2})\D*?(\d{1,2}):(\d{2})')
+
+
+# scraping functions
+# soup is from YahooAuctionURL.SELLING, CLOSED_WITH_WINNER or CLOSED_WITHOUT_WINNER
+def _get_summaries(
+    soup: bs4.BeautifulSoup,
+    pattern: Pattern[str],
+    now: Optional[datetime] = None
+) -> list[InfoSummary]:
+    """ Return summaries of products listed in `soup`.
+
+    Parameters
+    ----------
+    soup : bs4.BeautifulSoup
+        Soup of a Yahoo Auction list page.
+    pattern : Pattern[str]
+        Pattern of `data-ylk` of product links.
+    now : datetime | None
+        Reference to complete the year of end datetime, which list pages omit.
+        Current datetime if None.
+
+    Returns
+    -------
+    list[InfoSummary]
+        Summaries in the order of the page.
+    """
+    now = now or datetime.now()
+    summaries: list[InfoSummary] = []
+    headers: dict[int, list[str]] = {}
+    for tag in soup.find_all('a', attrs={'data-ylk': pattern}):
+        url = tag.get('href')
+        if not isinstance(url, str):
+            continue
+        summary: InfoSummary = _new_summary(url, tag.text)
+
+        row = tag.find_parent('tr')
+        if row is not None:
+            table = row.find_parent('table')
+            if table is not None and id(table) not in headers:
+                headers[id(table)] = _get_header_labels(table)
+            labels: list[str] = headers[id(table)] if table is not None else []
+            _fill_from_row(summary, row, labels, now)
+        summaries.append(summary)
+    return summaries
+
+
+def _new_summary(url: str, title: str) -> InfoSummary:
+    """ Return summary of the product linked by `url` with anchor text `title`. """
+    summary: InfoSummary = InfoSummary(aID_of(url), url)
+    summary.title = title.strip()
+    return summary
+
+
+def _get_header_labels(table: bs4.element.Tag) -> list[str]:
+    """ Return column labels of `table` from its first row having `th`. """
+    for row in table.find_all('tr'):
+        cells = row.find_all('th', recursive=False)
+        if cells:
+            return [cell.text.strip() for cell in row.find_all(['th', 'td'], recursive=False)]
+    return []
+
+
+def _fill_from_row(
+    summary: InfoSummary,
+    row: bs4.element.Tag,
+    labels: list[str],
+    now: datetime
+) -> None:
+    """ Fill price, bid count and end datetime of `summary` from cells of `row`. """
+    texts: list[str] = [cell.text.strip() for cell in row.find_all('td', recursive=False)]
+    _fill_from_cells(summary, texts, labels, now)
+
+
+def _fill_from_cells(
+    summary: InfoSummary,
+    texts: list[str],
+    labels: list[str],
+    now: datetime
+) -> None:
+    """ Fill price, bid count and end datetime of `summary` from stripped cell texts of a row.
+
+    Cells are located by the column labels if exist,
+    otherwise by the format of the cell text.
+    """
+    price: Optional[str] = None
+    count_bid: Optional[str] = None
+    end: Optional[str] = None
+    for label, text in zip(labels, texts):
+        if '価格' in label and price is None:
+            price = text
+        elif '入札' in label and count_bid is None:
+            count_bid = text
+        elif '終了' in label and end is None:
+            end = text
+
+    if price is None:
+        price = next((text for text in texts if _PRICE_PATTERN.search(text)), None)
+    if end is None:
+        end = next((text for text in texts if _parse_list_datetime(text, now)), None)
+
+    if price:
+        summary.price = parse_yen(price)
+    if count_bid:
+        summary.count_bid = parse_yen(count_bid)
+    if end:
+        summary.end_datetime = _parse_list_datetime(end, now)
+
+
+def _parse_list_datetime(text: str, now: datetime) -> Optional[datetime]:
+    """ Parse datetime shown on a list page.
+
+    Accepts `YYYY.MM.DD HH:MM` and `M月D日 H時M分`.
+    The latter has no year, so the year putting it closest to `now` is taken.
+
+    Parameters
+    ----------
+    text : str
+        Text including datetime.
+    now : datetime
+        Reference datetime.
+
+    Returns
+    -------
+    datetime | None
+        Parsed datetime, or None if `text` has no datetime.
+    """
+    match = _FULL_DATE_PATTERN.search(text)
+    if match:
+        year, month, day, hour, minute = (int(group) for group in match.groups())
+        return datetime(year, month, day, hour, minute)
+
+    match = _MONTH_DAY_PATTERN.search(text)
+    if match is None:
+        return None
+    month, day, hour, minute = (int(group) for group in match.groups())
+    candidates: list[datetime] = []
+    for year in (now.year - 1, now.year, now.year + 1):
+        try:
+            candidates.append(datetime(year, month, day, hour, minute))
+        except ValueError:  # 2/29
+            pass
+    if not candidates:
+        return None
+    return min(candidates, key=lambda candidate: abs(candidate - now))
@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import itertools
+import re
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, Optional, Pattern, Union
+
+from yahoo_auction_auto.info.selling import InfoSelling
+
+JST: timezone = timezone(timedelta(hours=9), 'JST')
+
+_NUMBER_PATTERN: Pattern[str] = re.compile(r'\d[\d,]*')
+
+
+def parse_yen(text: str) -> int:
+    """ Return price in yen from text such as `10,000 円（税 0 円）`, or 0 if not found.
+
+    Reads the first number, so it also reads counts such as `3件`.
+    """
+    match = _NUMBER_PATTERN.search(text)
+    return int(match.group().replace(',', '')) if match else 0
+
+
+def to_epoch(dt: datetime) -> int:
+    """ Return epoch seconds of `dt`. Naive datetime is taken as JST, as shown on Yahoo Auction. """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=JST)
+    return int(dt.timestamp())
+
+
+def from_epoch(epoch: int) -> datetime:
+    """ Return naive JST datetime of `epoch`, as `InfoSelling` holds. """
+    return datetime.fromtimestamp(epoch, JST).replace(tzinfo=None)
+
+
+def format_timeleft(seconds: float) -> str:
+    """ Return timeleft in the format of Yahoo Auction such as `19時間`. """
+    if seconds <= 0:
+        return '終了'
+    if seconds >= 86400:
+        return f'{int(seconds // 86400)}日'
+    if seconds >= 3600:
+        return f'{int(seconds // 3600)}時間'
+    return f'{max(1, int(seconds // 60))}分'
+
+
+
+class SellingRecord:
+    """ Compact snapshot of `InfoSelling`.
+
+    Prices are in yen and datetimes are epoch seconds,
+    so that snapshots are cheap to hold and compare.
+    """
+    __slots__ = (
+        'aID',
+        'title',
+        'seller_name',
+        'stack',
+        'start_time',
+        'end_time',
+        'refundable',
+        'startprice',
+        'count_bid',
+        'count_access',
+        'count_watch',
+        'fetched_at',
+    )
+    aID: str
+    title: str
+    seller_name: str
+    stack: int
+    start_time: int
+    end_time: int
+    refundable: bool
+    startprice: int
+    count_bid: int
+    count_access: int
+    count_watch: int
+    fetched_at: int
+
+
+    def __init__(
+        self,
+        aID: str,
+        title: str = '',
+        seller_name: str = '',
+        stack: int = 0,
+        start_time: int = 0,
+        end_time: int = 0,
+        refundable: bool = False,
+        startprice: int = 0,
+        count_bid: int = 0,
+        count_access: int = 0,
+        count_watch: int = 0,
+        fetched_at: int = 0
+    ) -> None:
+        self.aID = aID
+        self.title = title
+        self.seller_name = seller_name
+        self.stack = stack
+        self.start_time = start_time
+        self.end_time = end_time
+        self.refundable = refundable
+        self.startprice = startprice
+        self.count_bid = count_bid
+        self.count_access = count_access
+        self.count_watch = count_watch
+        self.fetched_at = fetched_at
+
+
+    @classmethod
+    def from_info(cls, info: InfoSelling, fetched_at: Optional[float] = None) -> SellingRecord:
+        """ Return record of `info`.
+
+        Parameters
+        ----------
+        info : InfoSelling
+            Updated selling information.
+        fetched_at : float | None
+            Epoch seconds `info` was fetched at. Current time if None.
+        """
+        return cls(
+            info.aID,
+            info.title,
+            info.seller_name,
+            info.stack,
+            to_epoch(info.start_datetime),
+            to_epoch(info.end_datetime),
+            info.refundable,
+            parse_yen(info.startprice),
+            info.count_bid,
+            info.count_access,
+            info.count_watch,
+            int(time.time() if fetched_at is None else fetched_at),
+        )
+
+
+    def to_info(self) -> InfoSelling:
+        """ Return `InfoSelling` of the record.
+
+        `startprice` is formatted like `10,000 円` without tax,
+        and `timeleft` is derived from `end_time` and `fetched_at`.
+        """
+        info: InfoSelling = InfoSelling(self.aID)
+        info.title = self.title
+        info.seller_name = self.seller_name
+        info.stack = self.stack
+        info.start_datetime = from_epoch(self.start_time)
+        info.end_datetime = from_epoch(self.end_time)
+        info.refundable = self.refundable
+        info.startprice = f'{self.startprice:,} 円'
+        info.timeleft = format_timeleft(self.end_time - self.fetched_at)
+        info.count_bid = self.count_bid
+        info.count_access = self.count_access
+        info.count_watch = self.count_watch
+        return info
+
+
+    def __repr__(self) -> str:
+        return f'SellingRecord(aID={self.aID!r}, end_time={self.end_time}, count_bid={self.count_bid})'
+
+
+
+class SellingTable:
+    """ Columnar store of many `SellingRecord`.
+
+    Numeric fields are held in typed arrays and seller names are
+    dictionary-encoded, so 100k snapshots take a few MB
+    and aggregates run over flat columns instead of objects.
+
+    Columns are stdlib `array` rather than NumPy arrays, to keep the package free of NumPy.
+    Filters therefore compute the kept indices once from a column
+    and copy every column at them, without building a `SellingRecord` per row.
+    """
+    INT_COLUMNS: tuple[str, ...] = (
+        'stack',
+        'start_time',
+        'end_time',
+        'startprice',
+        'count_bid',
+        'count_access',
+        'count_watch',
+        'fetched_at',
+    )
+
+
+    def __init__(self, records: Iterable[Union[SellingRecord, InfoSelling]] = ()) -> None:
+        self.aIDs: list[str] = []
+        self.titles: list[str] = []
+        self._seller_ids: array[int] = array('l')
+        self._sellers: list[str] = []
+        self._seller_index: dict[str, int] = {}
+        self._refundable: array[int] = array('b')
+        self._columns: dict[str, array[int]] = {name: array('q') for name in self.INT_COLUMNS}
+        self.extend(records)
+
+
+    def __len__(self) -> int:
+        return len(self.aIDs)
+
+
+    def __iter__(self) -> Iterator[SellingRecord]:
+        return (self[i] for i in range(len(self)))
+
+
+    def __getitem__(self, i: int) -> SellingRecord:
+        columns = self._columns
+        return SellingRecord(
+            self.aIDs[i],
+            self.titles[i],
+            self._sellers[self._seller_ids[i]],
+            columns['stack'][i],
+            columns['start_time'][i],
+            columns['end_time'][i],
+            bool(self._refundable[i]),
+            columns['startprice'][i],
+            columns['count_bid'][i],
+            columns['count_access'][i],
+            columns['count_watch'][i],
+            columns['fetched_at'][i],
+        )
+
+
+    def append(self, record: Union[SellingRecord, InfoSelling]) -> None:
+        """ Append `record`. `InfoSelling` is converted with the current time as fetched time. """
+        if isinstance(record, InfoSelling):
+            record = SellingRecord.from_info(record)
+        self.aIDs.append(record.aID)
+        self.titles.append(record.title)
+        seller_id: Optional[int] = self._seller_index.get(record.seller_name)
+        if seller_id is None:
+            seller_id = len(self._sellers)
+            self._sellers.append(record.seller_name)
+            self._seller_index[record.seller_name] = seller_id
+        self._seller_ids.append(seller_id)
+        self._refundable.append(int(record.refundable))
+        for name, column in self._columns.items():
+            column.append(getattr(record, name))
+
+
+    def extend(self, records: Iterable[Union[SellingRecord, InfoSelling]]) -> None:
+        """ Append all of `records`. """
+        for record in records:
+            self.append(record)
+
+
+    def column(self, name: str) -> array[int]:
+        """ Return the typed array of an integer column, such as `count_watch`. """
+        return self._columns[name]
+
+
+    def to_infos(self) -> list[InfoSelling]:
+        """ Return `InfoSelling` of every record. """
+        return [record.to_info() for record in self]
+
+
+    def select(self, indices: Iterable[int]) -> SellingTable:
+        """ Return a new table of records at `indices`, copied column by column. """
+        index: list[int] = list(indices)
+        table: SellingTable = SellingTable()
+        aIDs, titles, seller_ids, refundable = self.aIDs, self.titles, self._seller_ids, self._refundable
+        table.aIDs = [aIDs[i] for i in index]
+        table.titles = [titles[i] for i in index]
+        # the seller dictionary is shared in content, so seller ids are copied as they are
+        table._sellers = list(self._sellers)
+        table._seller_index = dict(self._seller_index)
+        table._seller_ids = array('l', [seller_ids[i] for i in index])
+        table._refundable = array('b', [refundable[i] for i in index])
+        table._columns = {name: array('q', [column[i] for i in index]) for name, column in self._columns.items()}
+        return table
+
+
+    def where(self, mask: Iterable[bool]) -> SellingTable:
+        """ Return a new table of records where `mask` is True. """
+        return self.select(itertools.compress(range(len(self)), mask))
+
+
+    def total(self, name: str) -> int:
+        """ Return sum of an integer column, such as `count_watch`. """
+        return sum(self._columns[name])
+
+
+    def total_watches(self) -> int:
+        """ Return total watch count. """
+        return self.total('count_watch')
+
+
+    def ending_within(self, seconds: float, now: Optional[float] = None) -> SellingTable:
+        """ Return records ending in the next `seconds`.
+
+        Parameters
+        ----------
+        seconds : float
+            Length of the window.
+        now : float | None
+            Epoch seconds the window starts at. Current time if None.
+        """
+        start: float = time.time() if now is None else now
+        stop: float = start + seconds
+        return self.select([i for i, end in enumerate(self._columns['end_time']) if start <= end < stop])
+
+
+    def with_bids(self) -> SellingTable:
+        """ Return records having at least one bid. """
+        return self.select([i for i, count in enumerate(self._columns['count_bid']) if count > 0])
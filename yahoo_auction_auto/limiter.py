@@ -0,0 +1,337 @@
+import asyncio
+import collections
+import time
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """ Token bucket refilled at a constant rate. 
+    
+    Allows bursts up to `capacity` and `rate` tokens per second on average.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """
+        Parameters
+        ----------
+        rate : float
+            Tokens added per second.
+        capacity : float
+            Max number of tokens held. The bucket starts full.
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError(f'rate and capacity must be positive: {rate}, {capacity}')
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self._tokens: float = capacity
+        self._updated: float = time.monotonic()
+
+
+    @property
+    def tokens(self) -> float:
+        """ Tokens available now. """
+        self._refill()
+        return self._tokens
+
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """ Take `tokens` if available now, and return True if taken. """
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return True
+        return False
+
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """ Take `tokens`, waiting until they are available. """
+        while not self.try_acquire(tokens):
+            await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+    def _refill(self) -> None:
+        now: float = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+
+class LimiterStats:
+    """ Snapshot of the state of a `HostLimiter`. """
+    host: str
+    concurrency: float
+    in_flight: int
+    rate: Optional[float]
+    tokens: Optional[float]
+    latency: float
+    baseline: float
+    paused: float
+    successes: int
+    failures: int
+    throttled: int
+    decreases: int
+
+
+    def __init__(self, limiter: 'HostLimiter') -> None:
+        now: float = time.monotonic()
+        self.host = limiter.host
+        self.concurrency = limiter.concurrency
+        self.in_flight = limiter.in_flight
+        self.rate = limiter.bucket.rate if limiter.bucket is not None else None
+        self.tokens = limiter.bucket.tokens if limiter.bucket is not None else None
+        self.latency = limiter.latency
+        self.baseline = limiter.baseline
+        self.paused = max(0.0, limiter._paused_until - now)
+        self.successes = limiter.successes
+        self.failures = limiter.failures
+        self.throttled = limiter.throttled
+        self.decreases = limiter.decreases
+
+
+    def __repr__(self) -> str:
+        return (
+            f'LimiterStats(host={self.host!r}, concurrency={self.concurrency:.2f}, in_flight={self.in_flight}, '
+            f'rate={self.rate!r}, latency={self.latency:.3f}, baseline={self.baseline:.3f}, '
+            f'successes={self.successes}, failures={self.failures}, throttled={self.throttled}, '
+            f'decreases={self.decreases})'
+        )
+
+
+
+class HostLimiter:
+    """ Rate limit and adaptive concurrency limit of requests to a host.
+
+    Requests wait for a token of `bucket`, if any, and then for a slot
+    while `in_flight` is below `concurrency`.
+    The concurrency grows additively by `increase` per `concurrency` healthy responses,
+    and shrinks multiplicatively by `decrease` on 429, 5xx, a failed request,
+    or when the smoothed latency grows beyond `tolerance` times the baseline,
+    the lowest latency seen recently.
+    A shrink is not repeated until the requests in flight at the time of it
+    have completed, so that one burst of errors shrinks it once.
+    A `Retry-After` of 429 or 503 pauses all requests to the host.
+    """
+    host: str
+    concurrency: float
+    in_flight: int
+    latency: float
+    baseline: float
+    successes: int
+    failures: int
+    throttled: int
+    decreases: int
+
+
+    def __init__(
+        self,
+        host: str,
+        rate: Optional[float] = None,
+        burst: float = 1.0,
+        concurrency: float = 4.0,
+        min_concurrency: float = 1.0,
+        max_concurrency: float = 64.0,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        tolerance: float = 2.0,
+        smoothing: float = 0.2,
+        max_pause: float = 60.0
+    ) -> None:
+        """
+        Parameters
+        ----------
+        host : str
+            Host the requests are sent to.
+        rate : float | None
+            Max requests per second on average. Not limited if None.
+        burst : float
+            Max requests sent at once regardless of `rate`.
+        concurrency : float
+            Initial number of requests in flight allowed.
+        min_concurrency, max_concurrency : float
+            Bounds of the number of requests in flight allowed.
+        increase : float
+            Growth of the concurrency per round of healthy responses.
+        decrease : float
+            Factor the concurrency is multiplied by on backing off.
+        tolerance : float
+            Ratio of the smoothed latency to the baseline regarded as congestion.
+        smoothing : float
+            Weight of a new latency in the exponentially smoothed latency.
+        max_pause : float
+            Max seconds of a pause by `Retry-After`.
+        """
+        if not 0 < decrease < 1:
+            raise ValueError(f'decrease must be between 0 and 1: {decrease}')
+        if not 1 <= min_concurrency <= concurrency <= max_concurrency:
+            raise ValueError(f'concurrency out of bounds: {min_concurrency}, {concurrency}, {max_concurrency}')
+        self.host = host
+        self.bucket: Optional[TokenBucket] = TokenBucket(rate, burst) if rate is not None else None
+        self.concurrency = concurrency
+        self.min_concurrency: float = min_concurrency
+        self.max_concurrency: float = max_concurrency
+        self.increase: float = increase
+        self.decrease: float = decrease
+        self.tolerance: float = tolerance
+        self.smoothing: float = smoothing
+        self.max_pause: float = max_pause
+        self.in_flight = 0
+        self.latency = 0.0
+        self.baseline = 0.0
+        self.successes = 0
+        self.failures = 0
+        self.throttled = 0
+        self.decreases = 0
+        self._cooldown: int = 0
+        self._paused_until: float = 0.0
+        self._waiters: collections.deque[asyncio.Future[None]] = collections.deque()
+
+
+    async def acquire(self) -> None:
+        """ Wait for a token and a slot, and take them.
+
+        A pause by `Retry-After` is waited for on entry, and again after waiting for a slot,
+        as it may have begun while waiting.
+        """
+        await self._wait_pause()
+        if self.bucket is not None:
+            await self.bucket.acquire()
+        while True:
+            while self._waiters or self.in_flight >= int(self.concurrency):
+                waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+                self._waiters.append(waiter)
+                try:
+                    await waiter
+                except asyncio.CancelledError:
+                    self._wake()  # pass the slot this waiter may have been given on
+                    raise
+                finally:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+                if self.in_flight < int(self.concurrency):
+                    break
+            if self._paused_until <= time.monotonic():
+                break
+            self._wake()  # let the other waiters see the pause too
+            await self._wait_pause()
+        self.in_flight += 1
+        self._wake()
+
+
+    def release(
+        self, 
+        status: Optional[int], 
+        latency: float, 
+        retry_after: Optional[float] = None, 
+        count: bool = True
+    ) -> None:
+        """ Give back the slot of a completed request and adapt the concurrency to its outcome.
+
+        Parameters
+        ----------
+        status : int | None
+            Status code of the response, or None if the request failed.
+        latency : float
+            Seconds the request took.
+        retry_after : float | None
+            Seconds of `Retry-After` of the response.
+        count : bool
+            Adapt nothing, as for a cancelled request, if False.
+        """
+        self.in_flight -= 1
+        if count:
+            if status is None or status == 429 or status >= 500:
+                self.failures += 1
+                if status == 429:
+                    self.throttled += 1
+                if retry_after is not None and status in (429, 503):
+                    self._paused_until = max(self._paused_until, time.monotonic() + min(retry_after, self.max_pause))
+                self._back_off()
+            else:
+                self.successes += 1
+                self._observe(latency)
+        if self._cooldown > 0:
+            self._cooldown -= 1
+        self._wake()
+
+
+    def stats(self) -> LimiterStats:
+        return LimiterStats(self)
+
+
+    async def _wait_pause(self) -> None:
+        delay: float = self._paused_until - time.monotonic()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self._paused_until - time.monotonic()
+
+
+    def _observe(self, latency: float) -> None:
+        if self.baseline == 0.0:
+            self.latency = self.baseline = latency
+        else:
+            self.latency += self.smoothing * (latency - self.latency)
+            # let the baseline rise slowly to follow a lasting change of the server
+            self.baseline = min(latency, self.baseline * (1.0 + self.smoothing / 100))
+        if self.baseline > 0 and self.latency > self.tolerance * self.baseline:
+            self._back_off()
+        else:
+            self.concurrency = min(self.max_concurrency, self.concurrency + self.increase / self.concurrency)
+
+
+    def _back_off(self) -> None:
+        if self._cooldown > 0:
+            return
+        self.concurrency = max(self.min_concurrency, self.concurrency * self.decrease)
+        self.decreases += 1
+        self._cooldown = self.in_flight + 1  # counting down from this release
+
+
+    def _wake(self) -> None:
+        free: int = int(self.concurrency) - self.in_flight
+        for waiter in self._waiters:
+            if free <= 0:
+                break
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+
+    def __repr__(self) -> str:
+        return f'HostLimiter({self.host!r}, concurrency={self.concurrency:.2f}, in_flight={self.in_flight})'
+
+
+
+class Limiter:
+    """ `HostLimiter` per host, created on first request to the host with the same settings.
+
+        limiter = Limiter(rate=5.0)
+        async with YahooAuction(cookies, limiter=limiter) as ya:
+            ...
+        print(limiter.stats())
+    """
+
+    def __init__(self, **settings: Any) -> None:
+        """
+        Parameters
+        ----------
+        **settings
+            Parameters of `HostLimiter` except `host`, such as `rate` and `concurrency`.
+        """
+        HostLimiter('', **settings)  # validate early
+        self.settings: dict[str, Any] = settings
+        self._hosts: dict[str, HostLimiter] = {}
+
+
+    def host(self, url: str) -> HostLimiter:
+        """ Return the limiter of the host of `url`. """
+        host: str = urlsplit(url).netloc
+        limiter: Optional[HostLimiter] = self._hosts.get(host)
+        if limiter is None:
+            limiter = self._hosts[host] = HostLimiter(host, **self.settings)
+        return limiter
+
+
+    def stats(self) -> dict[str, LimiterStats]:
+        """ Return the current state of the limiter of each host. """
+        return {host: limiter.stats() for host, limiter in self._hosts.items()}
@@ -0,0 +1,236 @@
+""" Instrumentation of requests, parsing, pagination and Chrome.
+
+Components given a `Metrics` report an `Event` to its hooks:
+
+- `request`: an HTTP request. Labels `kind`, `method`, `status`, `cache`.
+  `status` is `error` for a failed request and `cancelled` for the slower of hedged requests.
+  Values `connect_seconds`, `transfer_seconds` and `bytes`.
+- `parse`: parsing of a page. Labels `kind`, `parser`. Value `bytes`.
+- `pagination`: a walk over list pages, as by `_get_urls`. Values `pages` and `items`.
+- `driver_start`: start of a Chrome driver including loading cookies.
+- `call`: a call of `InfoSelling.update`, `check_login`, `cancel` or `cancel_items`.
+  Labels `call` and `error`, the exception type or `none`.
+
+Every component takes None instead, which is the default,
+and then skips measuring altogether.
+
+`PrometheusExporter` is a hook aggregating events into counters and histograms
+rendered in the Prometheus text format or OpenMetrics.
+"""
+import math
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, ContextManager, Iterator, Optional
+
+Hook = Callable[['Event'], None]
+
+
+class Event:
+    """ Measurement reported to hooks of `Metrics`. """
+    name: str
+    seconds: float
+    labels: dict[str, str]
+    values: dict[str, float]
+
+
+    def __init__(self, name: str, seconds: float, labels: dict[str, str], values: dict[str, float]) -> None:
+        self.name = name
+        self.seconds = seconds
+        self.labels = labels
+        self.values = values
+
+
+    def __repr__(self) -> str:
+        return f'Event(name={self.name!r}, seconds={self.seconds:.6f}, labels={self.labels!r}, values={self.values!r})'
+
+
+
+class Metrics:
+    """ Dispatcher of events to hooks. """
+
+    def __init__(self, *hooks: Hook) -> None:
+        self._hooks: list[Hook] = list(hooks)
+
+
+    def add_hook(self, hook: Hook) -> None:
+        """ Call `hook` with every event from now on. """
+        self._hooks.append(hook)
+
+
+    def remove_hook(self, hook: Hook) -> None:
+        self._hooks.remove(hook)
+
+
+    def emit(self, name: str, seconds: float, labels: Optional[dict[str, str]] = None, **values: float) -> None:
+        """ Report an event to every hook. """
+        event: Event = Event(name, seconds, labels or {}, values)
+        for hook in self._hooks:
+            hook(event)
+
+
+    @contextmanager
+    def measure(self, name: str, **labels: str) -> Iterator[dict[str, float]]:
+        """ Report the time spent in the block as event `name`.
+
+        Yields a dict which values of the event can be added to.
+        Label `error` is the type of the exception raised in the block, or `none`.
+        """
+        values: dict[str, float] = {}
+        labels.setdefault('error', 'none')
+        start: float = time.perf_counter()
+        try:
+            yield values
+        except GeneratorExit:  # an iterator closed by its consumer
+            raise
+        except BaseException as e:
+            labels['error'] = type(e).__name__
+            raise
+        finally:
+            self.emit(name, time.perf_counter() - start, labels, **values)
+
+
+
+def measure(metrics: Optional[Metrics], name: str, **labels: str) -> ContextManager[dict[str, float]]:
+    """ `Metrics.measure` of `metrics`, or a context doing nothing if None. """
+    if metrics is None:
+        return nullcontext({})
+    return metrics.measure(name, **labels)
+
+
+
+class RequestTrace:
+    """ httpx trace extension summing the time spent connecting. """
+    connect: float
+
+
+    def __init__(self) -> None:
+        self.connect = 0.0
+        self._started: float = 0.0
+        self._pending: float = 0.0
+
+
+    async def __call__(self, name: str, info: dict[str, Any]) -> None:
+        if name == 'connection.connect_tcp.started':
+            self._started = time.perf_counter()
+        elif name in ('connection.connect_tcp.complete', 'connection.start_tls.complete'):
+            self._pending = time.perf_counter() - self._started
+        elif name.endswith('.send_request_headers.started') and self._pending:
+            self.connect += self._pending
+            self._pending = 0.0
+
+
+
+class PrometheusExporter:
+    """ Hook aggregating events into metric families.
+
+    For every event name, `yahoo_auction_{name}` counts events
+    and `yahoo_auction_{name}_seconds` is a histogram of their durations, both by labels.
+    Values ending with `_seconds` become histograms too and the others counters,
+    such as `yahoo_auction_request_bytes`.
+
+        exporter = PrometheusExporter()
+        ya = YahooAuction(cookies, metrics=Metrics(exporter))
+        ...
+        exporter.write_textfile('/var/lib/node_exporter/yahoo_auction.prom')
+    """
+    BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+    def __init__(self, prefix: str = 'yahoo_auction', buckets: tuple[float, ...] = BUCKETS) -> None:
+        self.prefix: str = prefix
+        self.buckets: tuple[float, ...] = buckets
+        self._lock: threading.Lock = threading.Lock()
+        # family → labels → value
+        self._counters: dict[str, dict[tuple[tuple[str, str], ...], float]] = {}
+        # family → labels → (bucket counts, sum, count)
+        self._histograms: dict[str, dict[tuple[tuple[str, str], ...], tuple[list[int], float, int]]] = {}
+
+
+    def __call__(self, event: Event) -> None:
+        labels: tuple[tuple[str, str], ...] = tuple(sorted(event.labels.items()))
+        family: str = f'{self.prefix}_{event.name}'
+        with self._lock:
+            self._count(family, labels, 1.0)
+            self._observe(f'{family}_seconds', labels, event.seconds)
+            for key, value in event.values.items():
+                if key.endswith('_seconds'):
+                    self._observe(f'{family}_{key}', labels, value)
+                else:
+                    self._count(f'{family}_{key}', labels, value)
+
+
+    def render(self, openmetrics: bool = False) -> str:
+        """ Return the metrics in the Prometheus text format, or OpenMetrics if `openmetrics`. """
+        lines: list[str] = []
+        with self._lock:
+            for family, series in sorted(self._counters.items()):
+                lines.append(f'# TYPE {family if openmetrics else family + "_total"} counter')
+                for labels, value in series.items():
+                    lines.append(f'{family}_total{_format_labels(labels)} {_format_value(value)}')
+            for family, histograms in sorted(self._histograms.items()):
+                lines.append(f'# TYPE {family} histogram')
+                for labels, (counts, total, count) in histograms.items():
+                    cumulative: int = 0
+                    for bound, n in zip(self.buckets, counts):
+                        cumulative += n
+                        if math.isinf(bound):  # written as the last bucket below
+                            continue
+                        lines.append(f'{family}_bucket{_format_labels(labels + (("le", _format_value(bound)),))} {cumulative}')
+                    lines.append(f'{family}_bucket{_format_labels(labels + (("le", "+Inf"),))} {count}')
+                    lines.append(f'{family}_sum{_format_labels(labels)} {_format_value(total)}')
+                    lines.append(f'{family}_count{_format_labels(labels)} {count}')
+        if openmetrics:
+            lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+
+    def write_textfile(self, path: str, openmetrics: bool = False) -> None:
+        """ Write `render()` to `path` atomically, as the textfile collector of node_exporter reads. """
+        directory: str = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.render(openmetrics))
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+
+    def _count(self, family: str, labels: tuple[tuple[str, str], ...], value: float) -> None:
+        series = self._counters.setdefault(family, {})
+        series[labels] = series.get(labels, 0.0) + value
+
+
+    def _observe(self, family: str, labels: tuple[tuple[str, str], ...], value: float) -> None:
+        histograms = self._histograms.setdefault(family, {})
+        counts, total, count = histograms.get(labels) or ([0] * len(self.buckets), 0.0, 0)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        histograms[labels] = (counts, total + value, count + 1)
+
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ''
+    escaped = (f'{name}="{_escape(value)}"' for name, value in labels)
+    return '{' + ','.join(escaped) + '}'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    """ Return `value` as the text formats write a float, such as `1.0`, `+Inf` or `NaN`. """
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
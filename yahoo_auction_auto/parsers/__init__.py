@@ -0,0 +1,147 @@
+""" Backends extracting what the scrapers read from Yahoo Auction pages.
+
+Every backend returns the same records from the same HTML,
+so that one can be swapped for another per `YahooAuction` instance.
+
+- `bs4`: BeautifulSoup over lxml, builds the whole tree.
+- `bs4-partial`: BeautifulSoup building only the subtrees the scrapers read.
+- `lxml`: lxml.html with compiled XPath, no BeautifulSoup tree at all.
+
+Backends are imported on first use, like the parsers they wrap.
+A registered backend is pickled by name, so that a `ParsePool` of processes
+builds its own in every worker.
+"""
+from __future__ import annotations
+
+import re
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Optional, Pattern, Union
+
+if TYPE_CHECKING:
+    from yahoo_auction_auto.info.selling import _PageIndex
+    from yahoo_auction_auto.info.summary import InfoSummary
+
+PATTERN_NEXT_PAGE: Pattern[str] = re.compile(r'^rsec:pagination;slk:next;')
+
+
+class Parser:
+    """ Interface of a parser backend. """
+    name: str = ''
+
+
+    def detail(self, content: bytes) -> _PageIndex:
+        """ Return label → value index of an auction page.
+
+        Parameters
+        ----------
+        content : bytes
+            HTML of the page of YahooAuctionURL.AUCTION(aID).
+
+        Returns
+        -------
+        _PageIndex
+            Index of ProductTitle, ProductDetail, Count, StatisticsInfo and seller.
+            The first occurrence wins for every label.
+        """
+        raise NotImplementedError()
+
+
+    def list_page(self, content: bytes, pattern: Pattern[str]) -> tuple[list[str], Optional[str]]:
+        """ Return product urls and next page url from a list page.
+
+        Parameters
+        ----------
+        content : bytes
+            HTML of a Yahoo Auction list page.
+        pattern : Pattern[str]
+            Pattern of `data-ylk` of product links.
+
+        Returns
+        -------
+        tuple[list[str], str | None]
+            Product urls and next page url if exists.
+        """
+        raise NotImplementedError()
+
+
+    def summary_page(
+        self,
+        content: bytes,
+        pattern: Pattern[str],
+        now: Optional[datetime] = None
+    ) -> tuple[list[InfoSummary], Optional[str]]:
+        """ Return product summaries and next page url from a list page.
+
+        Parameters
+        ----------
+        content : bytes
+            HTML of a Yahoo Auction list page.
+        pattern : Pattern[str]
+            Pattern of `data-ylk` of product links.
+        now : datetime | None
+            Reference to complete the year of end datetime. Current datetime if None.
+
+        Returns
+        -------
+        tuple[list[InfoSummary], str | None]
+            Product summaries and next page url if exists.
+        """
+        raise NotImplementedError()
+
+
+    def __reduce__(self) -> Union[str, tuple[Any, ...]]:
+        if self.name in _FACTORIES:
+            return (get_parser, (self.name,))
+        return super().__reduce__()
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(name={self.name!r})'
+
+
+
+def _bs4() -> Parser:
+    from yahoo_auction_auto.parsers.bs4_parser import Bs4Parser
+    return Bs4Parser()
+
+
+def _bs4_partial() -> Parser:
+    from yahoo_auction_auto.parsers.bs4_parser import Bs4Parser
+    return Bs4Parser(partial=True)
+
+
+def _lxml() -> Parser:
+    from yahoo_auction_auto.parsers.lxml_parser import LxmlParser
+    return LxmlParser()
+
+
+_FACTORIES: dict[str, Callable[[], Parser]] = {
+    'bs4': _bs4,
+    'bs4-partial': _bs4_partial,
+    'lxml': _lxml,
+}
+PARSERS: tuple[str, ...] = tuple(_FACTORIES)
+_instances: dict[str, Parser] = {}
+
+
+def get_parser(parser: Union[str, Parser] = 'bs4') -> Parser:
+    """ Return the backend named `parser`.
+
+    Backends hold no state per page, so one instance per name is shared.
+
+    Parameters
+    ----------
+    parser : str | Parser
+        One of `PARSERS`, or a backend returned as is.
+
+    Returns
+    -------
+    Parser
+    """
+    if isinstance(parser, Parser):
+        return parser
+    if parser not in _FACTORIES:
+        raise ValueError(f'unknown parser {parser!r}, expected one of {", ".join(PARSERS)}')
+    if parser not in _instances:
+        _instances[parser] = _FACTORIES[parser]()
+    return _instances[parser]
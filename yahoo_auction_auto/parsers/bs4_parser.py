@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional, Pattern
+
+from yahoo_auction_auto.info.selling import _PageIndex, _index_page
+from yahoo_auction_auto.info.summary import InfoSummary, _get_summaries
+from yahoo_auction_auto.parsers import PATTERN_NEXT_PAGE, Parser
+from yahoo_auction_auto.soup import detail_soup, list_soup
+
+if TYPE_CHECKING:
+    import bs4
+
+
+class Bs4Parser(Parser):
+    """ Backend on BeautifulSoup with the lxml tree builder. """
+
+    def __init__(self, partial: bool = False) -> None:
+        """
+        Parameters
+        ----------
+        partial : bool
+            Build only the subtrees read by the scrapers,
+            which gives the same records with less time and memory.
+        """
+        self.partial: bool = partial
+        self.name = 'bs4-partial' if partial else 'bs4'
+
+
+    def detail(self, content: bytes) -> _PageIndex:
+        return _index_page(detail_soup(content, self.partial))
+
+
+    def list_page(self, content: bytes, pattern: Pattern[str]) -> tuple[list[str], Optional[str]]:
+        soup = list_soup(content, self.partial)
+        urls: list[str] = []
+        for tag in soup.find_all('a', attrs={'data-ylk': pattern}):
+            href = tag.get('href')
+            if isinstance(href, str):
+                urls.append(href)
+        return urls, _get_next_page(soup)
+
+
+    def summary_page(
+        self,
+        content: bytes,
+        pattern: Pattern[str],
+        now: Optional[datetime] = None
+    ) -> tuple[list[InfoSummary], Optional[str]]:
+        soup = list_soup(content, self.partial, tables=True)
+        return _get_summaries(soup, pattern, now), _get_next_page(soup)
+
+
+
+def _get_next_page(soup: bs4.BeautifulSoup) -> Optional[str]:
+    """ Return next page url from `soup`.
+
+    Parameters
+    ----------
+    soup : bs4.BeautifulSoup
+        Soup of a Yahoo Auction page.
+
+    Returns
+    -------
+    str | None
+        URL of next page if exists, else None.
+
+    """
+    tag = soup.find('a', attrs={'data-ylk': PATTERN_NEXT_PAGE})
+    if tag is None:
+        return None
+    href = tag.get('href')
+    return href if isinstance(href, str) else None
@@ -0,0 +1,172 @@
+""" Backend on lxml.html with compiled XPath.
+
+Builds no BeautifulSoup tree, so it is several times faster than `bs4`
+on the same pages while giving the same records.
+"""
+from __future__ import annotations
+
+import codecs
+import re
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Optional, Pattern
+
+from yahoo_auction_auto.info.selling import _PageIndex, _SELLER_PATTERN, _STATISTICS_PREFIX
+from yahoo_auction_auto.info.summary import InfoSummary, _fill_from_cells, _new_summary
+from yahoo_auction_auto.parsers import PATTERN_NEXT_PAGE, Parser
+
+if TYPE_CHECKING:
+    from lxml import etree
+
+
+_CHARSET_PATTERN: Pattern[bytes] = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+_BOMS: tuple[tuple[bytes, str], ...] = (
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+def sniff_encoding(content: bytes) -> str:
+    """ Return the encoding of an HTML page by its BOM or a known `<meta charset>`, or UTF-8 if neither is found.
+
+    The same page is read by the `bs4` backends, whose detection also looks at them first.
+    """
+    for bom, encoding in _BOMS:
+        if content.startswith(bom):
+            return encoding
+    match = _CHARSET_PATTERN.search(content, 0, 4096)
+    if match:
+        declared: str = match.group(1).decode('ascii')
+        try:
+            codecs.lookup(declared)
+        except LookupError:
+            return 'utf-8'
+        return declared.lower()
+    return 'utf-8'
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+class LxmlParser(Parser):
+    """ Backend on lxml.html with compiled XPath. """
+    name = 'lxml'
+
+
+    def __init__(self) -> None:
+        from lxml import etree, html
+        # by the encoding of pages, which lxml would take as Latin-1 without `<meta charset>`
+        self._parsers: dict[str, etree.HTMLParser] = {'utf-8': html.HTMLParser(encoding='utf-8')}
+        self._title: etree.XPath = etree.XPath(f'//h1[{_has_class("ProductTitle__text")}]')
+        self._seller: etree.XPath = etree.XPath('//a[@data-ylk]')
+        # attribute of `_PageIndex` → (label tags, value tag next to a label)
+        self._pairs: dict[str, tuple[etree.XPath, etree.XPath]] = {
+            key: (
+                etree.XPath(f'//*[not(self::a)][{_has_class(title)}]'),
+                etree.XPath(f'following-sibling::{tag}[{_has_class(value)}][1]'),
+            )
+            for key, tag, title, value in (
+                ('details', 'dd', 'ProductDetail__title', 'ProductDetail__description'),
+                ('counts', 'dd', 'Count__title', 'Count__number'),
+                ('statistics', 'span', 'StatisticsInfo__term', 'StatisticsInfo__data'),
+            )
+        }
+        self._links: etree.XPath = etree.XPath('//a[@data-ylk]')
+
+
+    def detail(self, content: bytes) -> _PageIndex:
+        root = self._parse(content)
+        index: _PageIndex = _PageIndex()
+        titles = self._title(root)
+        if titles:
+            index.title = _text(titles[0])
+        for link in self._seller(root):
+            if _SELLER_PATTERN.match(link.get('data-ylk')):
+                index.seller_name = _text(link)
+                break
+
+        for key, (find_titles, find_value) in self._pairs.items():
+            labels: dict[str, str] = getattr(index, key)
+            for title in find_titles(root):
+                values = find_value(title)
+                if not values:
+                    continue
+                if key == 'statistics':
+                    for cls in (title.get('class') or '').split():
+                        if cls.startswith(_STATISTICS_PREFIX):
+                            labels.setdefault(cls[len(_STATISTICS_PREFIX):], _text(values[0]))
+                else:
+                    labels.setdefault(_text(title).strip(), _text(values[0]))
+        return index
+
+
+    def list_page(self, content: bytes, pattern: Pattern[str]) -> tuple[list[str], Optional[str]]:
+        root = self._parse(content)
+        urls: list[str] = []
+        next_page: Optional[str] = None
+        found_next: bool = False
+        for link in self._links(root):
+            ylk: str = link.get('data-ylk')
+            href: Optional[str] = link.get('href')
+            if pattern.search(ylk):
+                if href is not None:
+                    urls.append(href)
+            if not found_next and PATTERN_NEXT_PAGE.search(ylk):
+                next_page, found_next = href, True
+        return urls, next_page
+
+
+    def summary_page(
+        self,
+        content: bytes,
+        pattern: Pattern[str],
+        now: Optional[datetime] = None
+    ) -> tuple[list[InfoSummary], Optional[str]]:
+        now = now or datetime.now()
+        root = self._parse(content)
+        summaries: list[InfoSummary] = []
+        headers: dict[Any, list[str]] = {}
+        next_page: Optional[str] = None
+        found_next: bool = False
+        for link in self._links(root):
+            ylk: str = link.get('data-ylk')
+            href: Optional[str] = link.get('href')
+            if not found_next and PATTERN_NEXT_PAGE.search(ylk):
+                next_page, found_next = href, True
+            if not pattern.search(ylk) or href is None:
+                continue
+            summary: InfoSummary = _new_summary(href, _text(link))
+
+            row = next(link.iterancestors('tr'), None)
+            if row is not None:
+                table = next(row.iterancestors('table'), None)
+                if table is not None and table not in headers:
+                    headers[table] = _get_header_labels(table)
+                labels: list[str] = headers[table] if table is not None else []
+                texts: list[str] = [_text(cell).strip() for cell in row if cell.tag == 'td']
+                _fill_from_cells(summary, texts, labels, now)
+            summaries.append(summary)
+        return summaries, next_page
+
+
+    def _parse(self, content: bytes) -> etree._Element:
+        from lxml import html
+        encoding: str = sniff_encoding(content)
+        parser: Optional[etree.HTMLParser] = self._parsers.get(encoding)
+        if parser is None:
+            parser = self._parsers[encoding] = html.HTMLParser(encoding=encoding)
+        return html.document_fromstring(content, parser=parser)
+
+
+
+def _text(element: etree._Element) -> str:
+    return str(element.xpath('string()'))
+
+
+def _get_header_labels(table: etree._Element) -> list[str]:
+    """ Return column labels of `table` from its first row having `th`. """
+    for row in table.iter('tr'):
+        if row is not table and row.find('th') is not None:
+            return [_text(cell).strip() for cell in row if cell.tag in ('th', 'td')]
+    return []
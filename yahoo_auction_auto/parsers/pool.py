@@ -0,0 +1,87 @@
+""" Parsing off the event loop.
+
+Parsing a page is CPU-bound and blocks every request in flight while it runs.
+`ParsePool` runs parser backends in a pool of processes, or threads,
+instead of on the event loop. Workers get the raw bytes of a page
+and return the records of `Parser`, such as `_PageIndex`, not trees,
+so that little is pickled between processes.
+
+    with ParsePool(workers=4) as pool:
+        async with YahooAuction(cookies, parser='lxml', parse_pool=pool) as ya:
+            ...
+"""
+import asyncio
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from types import TracebackType
+from typing import Any, Callable, Optional, Type, TypeVar
+
+R = TypeVar('R')
+
+
+class ParsePool:
+    """ Executor of parser backends, started on first use. """
+    workers: Optional[int]
+    threads: bool
+
+
+    def __init__(self, workers: Optional[int] = None, threads: bool = False, executor: Optional[Executor] = None) -> None:
+        """
+        Parameters
+        ----------
+        workers : int | None
+            Number of workers. The default of `concurrent.futures` if None, about the number of CPUs.
+        threads : bool
+            Use threads instead of processes.
+            Threads keep the event loop responsive but share one core for pure Python parsing.
+        executor : Executor | None
+            Executor to run in instead of a new one, left open on `close`.
+        """
+        self.workers = workers
+        self.threads = threads
+        self._executor: Optional[Executor] = executor
+        self._owns_executor: bool = executor is None
+
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.threads:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='parse')
+            else:
+                self._executor = ProcessPoolExecutor(self.workers)
+        return self._executor
+
+
+    async def run(self, func: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        """ Return `func(*args, **kwargs)` computed by a worker.
+
+        `func` and the arguments must be picklable for processes,
+        such as a method of a registered `Parser`.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+
+    def close(self, wait: bool = True) -> None:
+        """ Shut the workers down, if started by the pool. """
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait)
+            self._executor = None
+
+
+    def __enter__(self) -> 'ParsePool':
+        return self
+
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        self.close()
+
+
+    def __repr__(self) -> str:
+        return f'ParsePool(workers={self.workers!r}, threads={self.threads!r})'
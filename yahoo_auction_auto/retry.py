@@ -0,0 +1,233 @@
+""" Retries and hedging of HTTP requests.
+
+`RetryPolicy` resends a request failed with a transport error or a retryable status
+after a jittered exponential backoff.
+`Hedging` sends a duplicate of a GET request still pending after a delay,
+the p95 of recent latencies, and keeps the response coming first.
+Both draw extra requests from a `RetryBudget`, so that retries and duplicates
+stay a fraction of the requests and do not pile onto an overloaded server.
+
+    budget = RetryBudget()
+    ya = YahooAuction(cookies, retry=RetryPolicy(budget=budget), hedging=Hedging(budget=budget))
+"""
+import collections
+import math
+import random
+from typing import Optional
+
+# statuses of a transient failure, such as of overload or a restarting server
+RETRY_STATUSES: tuple[int, ...] = (429, 500, 502, 503, 504)
+
+
+class RetryBudget:
+    """ Tokens of extra requests, earned by the requests sent.
+
+    Every request deposits `ratio` tokens up to `capacity`,
+    and every retry or hedged request withdraws one token.
+    The budget starts full so that a client with few requests can still retry.
+    """
+    ratio: float
+    capacity: float
+    withdrawn: int
+    rejected: int
+
+
+    def __init__(self, ratio: float = 0.1, capacity: float = 10.0) -> None:
+        """
+        Parameters
+        ----------
+        ratio : float
+            Extra requests allowed per request sent.
+        capacity : float
+            Max tokens saved up.
+        """
+        if ratio < 0 or capacity < 1:
+            raise ValueError(f'ratio must not be negative and capacity must be at least 1: {ratio}, {capacity}')
+        self.ratio = ratio
+        self.capacity = capacity
+        self.withdrawn = 0
+        self.rejected = 0
+        self._tokens: float = capacity
+
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+
+    def deposit(self) -> None:
+        """ Earn tokens for a request sent. """
+        self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+
+    def try_withdraw(self) -> bool:
+        """ Take a token for an extra request, and return True if taken. """
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            self.withdrawn += 1
+            return True
+        self.rejected += 1
+        return False
+
+
+    def __repr__(self) -> str:
+        return f'RetryBudget(ratio={self.ratio}, capacity={self.capacity}, tokens={self._tokens:.2f})'
+
+
+
+class RetryPolicy:
+    """ When and after how long a failed request is sent again.
+
+    The delay before the n-th retry is drawn uniformly from
+    `[0, min(max_backoff, backoff * 2 ** n))`, "full jitter",
+    so that clients failed at once do not retry at once.
+    `Retry-After` of the response, if any, is the least delay.
+    """
+    attempts: int
+    backoff: float
+    max_backoff: float
+    statuses: frozenset[int]
+    methods: frozenset[str]
+    budget: RetryBudget
+
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 10.0,
+        statuses: tuple[int, ...] = RETRY_STATUSES,
+        methods: tuple[str, ...] = ('GET',),
+        budget: Optional[RetryBudget] = None
+    ) -> None:
+        """
+        Parameters
+        ----------
+        attempts : int
+            Max number of times a request is sent, including the first.
+        backoff : float
+            Base of the delay before a retry in seconds.
+        max_backoff : float
+            Max delay before a retry in seconds.
+        statuses : tuple[int, ...]
+            Response statuses retried. Transport errors, such as timeouts, are always retried.
+        methods : tuple[str, ...]
+            Methods retried. POST, such as of cancelling, is not idempotent and not retried by default.
+        budget : RetryBudget | None
+            Budget of retries. A new `RetryBudget()` if None.
+        """
+        if attempts < 1:
+            raise ValueError(f'attempts must be positive: {attempts}')
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(methods)
+        self.budget = budget if budget is not None else RetryBudget()
+
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """ Return seconds to wait before retrying a request failed at `attempt`, counted from 0,
+        or None if it is not retried. """
+        if attempt + 1 >= self.attempts:
+            return None
+        if not self.budget.try_withdraw():
+            return None
+        delay: float = random.uniform(0.0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_backoff))
+        return delay
+
+
+    def __repr__(self) -> str:
+        return f'RetryPolicy(attempts={self.attempts}, backoff={self.backoff}, max_backoff={self.max_backoff})'
+
+
+
+class Hedging:
+    """ Delay after which a duplicate of a pending GET request is sent.
+
+    The delay is the `quantile` of the latencies of the last `window` responses
+    of the same kind of request, within `[min_delay, max_delay]`,
+    or `initial` until `min_samples` responses are seen.
+    """
+    quantile: float
+    initial: float
+    min_delay: float
+    max_delay: float
+    min_samples: int
+    budget: Optional[RetryBudget]
+    hedged: int
+    won: int
+
+
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        initial: float = 1.0,
+        min_delay: float = 0.05,
+        max_delay: float = 10.0,
+        window: int = 200,
+        min_samples: int = 20,
+        budget: Optional[RetryBudget] = None
+    ) -> None:
+        """
+        Parameters
+        ----------
+        quantile : float
+            Quantile of latencies used as the delay.
+        initial : float
+            Delay in seconds until enough latencies are seen.
+        min_delay, max_delay : float
+            Bounds of the delay in seconds.
+        window : int
+            Number of recent latencies kept per kind of request.
+        min_samples : int
+            Number of latencies needed before the quantile is used.
+        budget : RetryBudget | None
+            Budget of duplicates, which can be shared with `RetryPolicy`.
+            Not limited if None.
+        """
+        if not 0 < quantile < 1:
+            raise ValueError(f'quantile must be between 0 and 1: {quantile}')
+        self.quantile = quantile
+        self.initial = initial
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.budget = budget
+        self.hedged = 0
+        self.won = 0
+        self._window: int = window
+        self._latencies: dict[str, collections.deque[float]] = {}
+
+
+    def delay(self, kind: Optional[str]) -> float:
+        """ Return seconds after which a request of `kind` is duplicated. """
+        latencies: Optional[collections.deque[float]] = self._latencies.get(kind or 'other')
+        if latencies is None or len(latencies) < self.min_samples:
+            return self.initial
+        ordered: list[float] = sorted(latencies)
+        value: float = ordered[min(len(ordered) - 1, math.ceil(self.quantile * len(ordered)) - 1)]
+        return min(self.max_delay, max(self.min_delay, value))
+
+
+    def observe(self, kind: Optional[str], latency: float) -> None:
+        """ Record the latency of a response of `kind`. """
+        key: str = kind or 'other'
+        latencies: Optional[collections.deque[float]] = self._latencies.get(key)
+        if latencies is None:
+            latencies = self._latencies[key] = collections.deque(maxlen=self._window)
+        latencies.append(latency)
+
+
+    def try_hedge(self) -> bool:
+        """ Return True if a duplicate may be sent now, and count it. """
+        if self.budget is not None and not self.budget.try_withdraw():
+            return False
+        self.hedged += 1
+        return True
+
+
+    def __repr__(self) -> str:
+        return f'Hedging(quantile={self.quantile}, hedged={self.hedged}, won={self.won})'
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import time
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Iterable, Optional, Union
+
+from yahoo_auction_auto.info.selling import MISSING_DATETIME, InfoSelling
+from yahoo_auction_auto.info.table import to_epoch
+from yahoo_auction_auto.limiter import TokenBucket
+
+if TYPE_CHECKING:
+    from yahoo_auction_auto.yahoo_auction import YahooAuction
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshScheduler:
+    """ Re-fetch selling information, more often as the end of an auction nears.
+
+    aIDs are kept in a heap ordered on the next due time.
+    The interval of an aID is a fraction of its remaining time clamped into
+    [`min_interval`, `max_interval`], shortened while it is getting bids,
+    and every refresh draws from a global budget of requests per minute.
+    An aID is refreshed once more right after its end, then dropped.
+    Up to `concurrency` fetches run at once, and a slot freed by one
+    is given to the next aID due without waiting for the others.
+    An aID is never fetched twice at once: one added again while it is fetched
+    is scheduled when that fetch finishes.
+    """
+
+    def __init__(
+        self,
+        ya: YahooAuction,
+        budget_per_minute: float = 60.0,
+        min_interval: float = 30.0,
+        max_interval: float = 6 * 3600.0,
+        fraction: float = 0.1,
+        active_factor: float = 0.25,
+        concurrency: int = 4
+    ) -> None:
+        """
+        Parameters
+        ----------
+        ya : YahooAuction
+            Session to fetch with.
+        budget_per_minute : float
+            Max number of requests per minute across all aIDs.
+        min_interval : float
+            Shortest interval in seconds.
+        max_interval : float
+            Longest interval in seconds.
+        fraction : float
+            Interval as a fraction of the remaining time of the auction.
+        active_factor : float
+            Multiplier of the interval while bids are increasing.
+        concurrency : int
+            Max number of pages fetched at once.
+        """
+        self._ya: YahooAuction = ya
+        self._budget: TokenBucket = TokenBucket(budget_per_minute / 60.0, max(1.0, float(concurrency)))
+        self.min_interval: float = min_interval
+        self.max_interval: float = max_interval
+        self.fraction: float = fraction
+        self.active_factor: float = active_factor
+        self.concurrency: int = concurrency
+        self._heap: list[tuple[float, str]] = []
+        self._due: dict[str, float] = {}  # aID → due time of its live heap entry
+        self._last: dict[str, InfoSelling] = {}
+        self._running: set[str] = set()  # aIDs being fetched
+        self._readded: dict[str, float] = {}  # aID being fetched → due time it was added again with
+        self._wakeup: Optional[asyncio.Event] = None  # set by `_push` while `run` waits
+
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+
+    def add(self, aIDs: Union[str, Iterable[str]], due: Optional[float] = None) -> None:
+        """ Schedule `aIDs`.
+
+        Parameters
+        ----------
+        aIDs : str | Iterable[str]
+            Auction IDs.
+        due : float | None
+            Epoch seconds of the first refresh. Now if None.
+            Of the next refresh after the running one, for an aID being fetched.
+        """
+        for aID in [aIDs] if isinstance(aIDs, str) else aIDs:
+            at: float = time.time() if due is None else due
+            if aID in self._running:
+                self._readded[aID] = at
+                self._due.setdefault(aID, at)  # kept scheduled if removed while fetching
+            else:
+                self._push(aID, at)
+
+
+    def remove(self, aID: str) -> None:
+        """ Stop refreshing `aID`. """
+        self._due.pop(aID, None)
+        self._last.pop(aID, None)
+        self._readded.pop(aID, None)
+
+
+    def next_due(self, info: InfoSelling, previous: Optional[InfoSelling], now: float) -> Optional[float]:
+        """ Return epoch seconds to refresh `info` next, or None if the auction is over.
+
+        An end time not found on the page, such as of a login or error page,
+        is logged and the aID is refreshed again after `max_interval`.
+
+        Parameters
+        ----------
+        info : InfoSelling
+            State just fetched.
+        previous : InfoSelling | None
+            State fetched before, used to detect bid activity.
+        now : float
+            Epoch seconds `info` was fetched at.
+        """
+        if info.end_datetime == MISSING_DATETIME:
+            logger.warning(f'no end time on the page of {info.aID}, refreshing after {self.max_interval}s')
+            return now + self.max_interval
+        end: float = float(to_epoch(info.end_datetime))
+        remaining: float = end - now
+        if remaining <= 0:
+            return None
+
+        interval: float = min(self.max_interval, max(self.min_interval, remaining * self.fraction))
+        if previous is not None and info.count_bid > previous.count_bid:
+            interval = max(self.min_interval, interval * self.active_factor)
+        # refresh once right after the end to catch the final state
+        return min(now + interval, end + 1.0)
+
+
+    async def run(self) -> AsyncGenerator[tuple[str, Union[InfoSelling, Exception]], None]:
+        """ Refresh aIDs as they fall due until none is left.
+
+        aIDs added while running are picked up as soon as they are due.
+
+        Yields
+        ------
+        tuple[str, InfoSelling | Exception]
+            aID and its selling information, or the exception raised while getting it.
+            A failed aID is retried after `min_interval`.
+        """
+        wakeup: asyncio.Event = asyncio.Event()
+        self._wakeup = wakeup
+        running: dict[asyncio.Future[InfoSelling], str] = {}
+        try:
+            while self._due:
+                while len(running) < self.concurrency:
+                    aID: Optional[str] = self._pop_due(time.time())
+                    if aID is None:
+                        break
+                    running[asyncio.ensure_future(self._fetch(aID))] = aID
+
+                wakeup.clear()
+                waiter: asyncio.Future[bool] = asyncio.ensure_future(wakeup.wait())
+                delay: Optional[float] = self._next_delay() if len(running) < self.concurrency else None
+                pending: set[asyncio.Future[Any]] = {waiter, *running}
+                try:
+                    await asyncio.wait(pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    waiter.cancel()
+
+                for task in [task for task in running if task.done()]:
+                    aID = running.pop(task)
+                    self._running.discard(aID)
+                    readded: Optional[float] = self._readded.pop(aID, None)
+                    result: Union[InfoSelling, Exception] = _result(task)
+                    now: float = time.time()
+                    if aID not in self._due:  # removed while fetching
+                        continue
+                    due: Optional[float]
+                    if isinstance(result, Exception):
+                        logger.error(f'failed to refresh {aID}: {result}')
+                        due = now + self.min_interval
+                    else:
+                        due = self.next_due(result, self._last.get(aID), now)
+                        self._last[aID] = result
+                    if readded is not None:
+                        due = readded if due is None else min(due, readded)
+                    if due is None:
+                        self.remove(aID)
+                    else:
+                        self._push(aID, due)
+                    yield aID, result
+        finally:
+            self._wakeup = None
+            self._running.clear()
+            self._readded.clear()
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.wait(running)
+
+
+    async def _fetch(self, aID: str) -> InfoSelling:
+        await self._budget.acquire()
+        return await self._ya.get_info_selling(aID)
+
+
+    def _pop_due(self, now: float) -> Optional[str]:
+        """ Pop the earliest aID due by `now`, or return None if none is. """
+        while self._heap:
+            due, aID = self._heap[0]
+            if self._due.get(aID) != due:  # stale entry of a rescheduled or removed aID
+                heapq.heappop(self._heap)
+                continue
+            if due > now:
+                return None
+            heapq.heappop(self._heap)
+            self._running.add(aID)
+            return aID
+        return None
+
+
+    def _next_delay(self) -> Optional[float]:
+        """ Seconds until the earliest due time, or None if nothing is scheduled. """
+        while self._heap:
+            due, aID = self._heap[0]
+            if self._due.get(aID) != due:
+                heapq.heappop(self._heap)
+                continue
+            return max(0.0, due - time.time())
+        return None
+
+
+    def _push(self, aID: str, due: float) -> None:
+        self._due[aID] = due
+        heapq.heappush(self._heap, (due, aID))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+
+
+def _result(task: asyncio.Future[InfoSelling]) -> Union[InfoSelling, Exception]:
+    error: Optional[BaseException] = task.exception()
+    if error is None:
+        return task.result()
+    if isinstance(error, Exception):
+        return error
+    raise error
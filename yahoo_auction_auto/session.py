@@ -0,0 +1,225 @@
+""" Login state and cookie refresh of a session.
+
+Cookies of Yahoo Auction expire, and logging in again by `get_username_and_cookies`
+needs a person at a visible Chrome.
+A Chrome user-data profile logged in once keeps a longer-lived login,
+so `SessionManager` gets fresh cookies by loading a page with that profile headlessly,
+sets them on the `YahooAuction` and writes them to the cookie file.
+
+The refresh runs once for all the requests redirected to the login page at the same time,
+which are sent again with the new cookies,
+and the result of `check_login` is reused for `login_ttl` seconds.
+
+    _, cookies = get_username_and_cookies(profile_dir='profile')  # once, by hand
+    ...
+    session = ya.open_session('profile', path='cookies.json')
+    await session.ensure_login()
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from yahoo_auction_auto.metrics import measure
+
+if TYPE_CHECKING:
+    from yahoo_auction_auto.yahoo_auction import YahooAuction
+
+logger = logging.getLogger(__name__)
+
+
+class LoginRequired(Exception):
+    """ Raised when cookies cannot be refreshed without logging in by hand. """
+
+
+
+def load_cookies(path: str) -> list[dict[str, Any]]:
+    """ Return the cookies saved at `path` as a JSON list, as `get-cookies.py` saves. """
+    with open(path, encoding='utf-8') as f:
+        cookies: list[dict[str, Any]] = json.load(f)
+    return cookies
+
+
+def save_cookies(path: str, cookies: list[dict[str, Any]]) -> None:
+    """ Write `cookies` to `path` atomically, readable only by the owner. """
+    directory: str = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')  # created with mode 0600
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(cookies, f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+
+class SessionManager:
+    """ Cached login check and single-flight cookie refresh of a `YahooAuction`.
+
+    Made by `YahooAuction.open_session`, which makes requests redirected to the login page
+    call `on_login_required` and be sent again once if it returns True.
+    """
+    ya: YahooAuction
+    profile_dir: Optional[str]
+    path: Optional[str]
+    login_ttl: float
+    min_interval: float
+    refreshes: int
+    failures: int
+
+
+    def __init__(
+        self,
+        ya: YahooAuction,
+        profile_dir: Optional[str] = None,
+        path: Optional[str] = None,
+        login_ttl: float = 60.0,
+        min_interval: float = 30.0,
+        fetch: Optional[Callable[[], list[dict[str, Any]]]] = None
+    ) -> None:
+        """
+        Parameters
+        ----------
+        ya : YahooAuction
+            Session to manage.
+        profile_dir : str | None
+            Chrome user-data directory logged in to Yahoo, cookies are read from.
+        path : str | None
+            File refreshed cookies are written to, such as the one `ya` was made from.
+            Not written if None.
+        login_ttl : float
+            Seconds the result of `check_login` is reused for.
+        min_interval : float
+            Seconds after a refresh in which requests redirected to the login page
+            do not start another one. They are sent again if the refresh succeeded,
+            as they may have been sent with the old cookies.
+        fetch : Callable[[], list[dict[str, Any]]] | None
+            Blocking function returning fresh cookies, run in a thread,
+            instead of reading them from `profile_dir`.
+        """
+        if fetch is None and profile_dir is None:
+            raise ValueError('profile_dir or fetch is required')
+        self.ya = ya
+        self.profile_dir = profile_dir
+        self.path = path
+        self.login_ttl = login_ttl
+        self.min_interval = min_interval
+        self.refreshes = 0
+        self.failures = 0
+        self._fetch: Callable[[], list[dict[str, Any]]] = fetch or self._from_profile
+        self._logged_in: bool = False
+        self._checked_at: Optional[float] = None
+        self._checking: Optional[asyncio.Future[bool]] = None
+        self._refreshing: Optional[asyncio.Future[list[dict[str, Any]]]] = None
+        self._refreshed_at: Optional[float] = None
+        self._error: Optional[BaseException] = None
+
+
+    async def check_login(self, max_age: Optional[float] = None) -> bool:
+        """ Return True if logged in, checked at most `max_age` seconds ago.
+
+        Callers at the same time share one request.
+
+        Parameters
+        ----------
+        max_age : float | None
+            Max seconds since the last check. `login_ttl` if None, 0 to check now.
+        """
+        max_age = self.login_ttl if max_age is None else max_age
+        if self._checked_at is not None and time.monotonic() - self._checked_at < max_age:
+            return self._logged_in
+        if self._checking is None:
+            self._checking = asyncio.ensure_future(self._check())
+        return await asyncio.shield(self._checking)
+
+
+    async def refresh(self) -> list[dict[str, Any]]:
+        """ Get fresh cookies, set them on the session and write them to `path`.
+
+        Callers while a refresh is running wait for it instead of starting another.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            New cookies.
+
+        Raises
+        ------
+        LoginRequired
+            If the profile is logged out too.
+        """
+        if self._refreshing is None:
+            self._refreshing = asyncio.ensure_future(self._refresh())
+        return await asyncio.shield(self._refreshing)
+
+
+    async def ensure_login(self) -> None:
+        """ Refresh the cookies unless logged in. Raise `LoginRequired` if it fails. """
+        if not await self.check_login():
+            await self.refresh()
+
+
+    async def on_login_required(self) -> bool:
+        """ Refresh the cookies for a request redirected to the login page.
+
+        Returns
+        -------
+        bool
+            True if the request should be sent again with the current cookies.
+        """
+        self._checked_at = None
+        if self._refreshing is None and self._refreshed_at is not None \
+                and time.monotonic() - self._refreshed_at < self.min_interval:
+            return self._error is None
+        await self.refresh()
+        return True
+
+
+    def _from_profile(self) -> list[dict[str, Any]]:
+        # selenium is imported by the first refresh, not by opening the session
+        from yahoo_auction_auto.cookie import get_cookies_from_profile
+        assert self.profile_dir is not None
+        return get_cookies_from_profile(self.profile_dir, self.ya.urls, metrics=self.ya.metrics)
+
+
+    async def _check(self) -> bool:
+        try:
+            self._logged_in = await self.ya.check_login()
+            self._checked_at = time.monotonic()
+            return self._logged_in
+        finally:
+            self._checking = None
+
+
+    async def _refresh(self) -> list[dict[str, Any]]:
+        try:
+            with measure(self.ya.metrics, 'call', call='refresh_cookies'):
+                cookies: list[dict[str, Any]] = await asyncio.get_running_loop().run_in_executor(None, self._fetch)
+                self.ya.set_cookies(cookies)
+                if self.path is not None:
+                    await asyncio.get_running_loop().run_in_executor(None, save_cookies, self.path, cookies)
+        except BaseException as e:
+            self.failures += 1
+            self._error = e
+            logger.warning(f'failed to refresh cookies: {type(e).__name__}: {e}')
+            raise
+        else:
+            self.refreshes += 1
+            self._error = None
+            self._logged_in = True
+            self._checked_at = time.monotonic()
+            logger.info(f'refreshed {len(cookies)} cookies')
+            return cookies
+        finally:
+            self._refreshed_at = time.monotonic()
+            self._refreshing = None
+
+
+    def __repr__(self) -> str:
+        return f'SessionManager(path={self.path!r}, refreshes={self.refreshes}, failures={self.failures})'
@@ -0,0 +1,72 @@
+""" Entry point to bs4 and lxml.
+
+They are imported on the first page parsed instead of on package import,
+since scripts that never parse a page shouldn't pay for them.
+
+With `partial`, only the subtrees the scrapers read are built,
+which saves most of the tree construction of large Yahoo Auction pages.
+"""
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+if TYPE_CHECKING:
+    import bs4
+
+DETAIL_BLOCKS: frozenset[str] = frozenset((
+    'ProductTitle',
+    'ProductDetail',
+    'Count',
+    'StatisticsInfo',
+    'Seller',
+))
+
+
+def make_soup(content: Union[bytes, str], parse_only: Optional[Any] = None) -> 'bs4.BeautifulSoup':
+    """ Parse `content` with lxml. 
+    
+    Parameters
+    ----------
+    content : bytes | str
+        HTML of a page.
+    parse_only : bs4.SoupStrainer | None
+        Build only the tags matching it and their descendants. 
+        Whole tree if None.
+
+    Returns
+    -------
+    bs4.BeautifulSoup
+    """
+    import bs4
+    return bs4.BeautifulSoup(content, 'lxml', parse_only=parse_only)
+
+
+def detail_soup(content: Union[bytes, str], partial: bool = False) -> 'bs4.BeautifulSoup':
+    """ Parse an auction page, only the blocks of `DETAIL_BLOCKS` if `partial`. """
+    if not partial:
+        return make_soup(content)
+    from bs4 import SoupStrainer  # type: ignore[attr-defined]
+    return make_soup(content, SoupStrainer(class_=_is_detail_block))
+
+
+def list_soup(content: Union[bytes, str], partial: bool = False, tables: bool = False) -> 'bs4.BeautifulSoup':
+    """ Parse a list page, only anchors having `data-ylk` if `partial`. 
+
+    Parameters
+    ----------
+    content : bytes | str
+        HTML of a list page.
+    partial : bool
+        Build only the subtrees read by the scrapers.
+    tables : bool
+        Keep tables too, which summaries are read from.
+    """
+    if not partial:
+        return make_soup(content)
+    from bs4 import SoupStrainer  # type: ignore[attr-defined]
+    if tables:
+        return make_soup(content, SoupStrainer(['table', 'a']))
+    return make_soup(content, SoupStrainer('a', attrs={'data-ylk': True}))
+
+
+def _is_detail_block(value: Optional[str]) -> bool:
+    # bs4 passes either one class or the whole class attribute depending on the version
+    return isinstance(value, str) and not DETAIL_BLOCKS.isdisjoint(value.split())
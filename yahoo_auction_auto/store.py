@@ -0,0 +1,334 @@
+""" History of listings in SQLite.
+
+`HistoryStore` keeps `InfoSelling` snapshots as `SellingRecord` rows,
+and aID lists such as of `get_aIDs_selling`, in one SQLite file.
+Rows are buffered and written in batches, one transaction per batch,
+by a single writer thread, so that polling does not wait for the disk.
+
+    store = HistoryStore('history.db')
+    aIDs = await ya.get_aIDs_selling()
+    await store.put_aIDs('selling', aIDs)
+    async for aID, info in ya.get_info_selling_many(aIDs):
+        if isinstance(info, InfoSelling):
+            await store.put(info)
+    await store.aclose()
+
+    store.latest().ending_within(3600)
+    store.series(aID).column('count_watch')
+"""
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import TracebackType
+from typing import Any, Iterable, Optional, Type, Union
+
+from yahoo_auction_auto.info.selling import InfoSelling
+from yahoo_auction_auto.info.table import SellingRecord, SellingTable
+
+_COLUMNS: tuple[str, ...] = (
+    'aID',
+    'fetched_at',
+    'title',
+    'seller_name',
+    'stack',
+    'start_time',
+    'end_time',
+    'refundable',
+    'startprice',
+    'count_bid',
+    'count_access',
+    'count_watch',
+)
+_COLUMN_LIST: str = ', '.join(_COLUMNS)
+_PLACEHOLDERS: str = ', '.join('?' * len(_COLUMNS))
+_UPDATES: str = ', '.join(f'{name} = excluded.{name}' for name in _COLUMNS[1:])
+
+_FIELDS: str = """
+    title TEXT NOT NULL,
+    seller_name TEXT NOT NULL,
+    stack INTEGER NOT NULL,
+    start_time INTEGER NOT NULL,
+    end_time INTEGER NOT NULL,
+    refundable INTEGER NOT NULL,
+    startprice INTEGER NOT NULL,
+    count_bid INTEGER NOT NULL,
+    count_access INTEGER NOT NULL,
+    count_watch INTEGER NOT NULL"""
+_SCHEMA: str = f"""
+CREATE TABLE IF NOT EXISTS selling (
+    id INTEGER PRIMARY KEY,
+    aID TEXT NOT NULL,
+    fetched_at INTEGER NOT NULL,{_FIELDS}
+);
+CREATE INDEX IF NOT EXISTS selling_aID ON selling (aID, fetched_at);
+CREATE INDEX IF NOT EXISTS selling_end_time ON selling (end_time);
+CREATE TABLE IF NOT EXISTS selling_latest (
+    aID TEXT PRIMARY KEY,
+    fetched_at INTEGER NOT NULL,{_FIELDS}
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS selling_latest_end_time ON selling_latest (end_time);
+CREATE TABLE IF NOT EXISTS aid_lists (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    fetched_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS aid_lists_kind ON aid_lists (kind, fetched_at);
+CREATE TABLE IF NOT EXISTS aid_list_items (
+    list INTEGER NOT NULL REFERENCES aid_lists (id),
+    position INTEGER NOT NULL,
+    aID TEXT NOT NULL,
+    PRIMARY KEY (list, position)
+) WITHOUT ROWID;
+"""
+
+Row = tuple[Any, ...]
+
+
+class HistoryStore:
+    """ SQLite store of `SellingRecord` snapshots and aID lists.
+
+    Tables:
+
+    - `selling`: every snapshot, indexed by (aID, fetched_at) and by end_time,
+      the epoch seconds of `InfoSelling.end_datetime`.
+      Snapshots fetched in the same second are all kept, in the order written.
+    - `selling_latest`: the latest snapshot per aID, upserted with every snapshot
+      so that the current state is read without scanning the history.
+    - `aid_lists`: a row per fetch of a list, such as `selling`,
+      and `aid_list_items`: the aIDs of each fetch in order.
+
+    The database is in WAL mode, so that reads are not blocked by the writer.
+    `put` and `put_aIDs` buffer rows and write them from a worker thread
+    every `batch_size` rows, and `add` and `add_aIDs` buffer them for `flush`.
+    """
+    path: str
+    batch_size: int
+
+
+    def __init__(self, path: str, batch_size: int = 500) -> None:
+        """
+        Parameters
+        ----------
+        path : str
+            Path of the database file, created if missing. `:memory:` for a temporary one.
+        batch_size : int
+            Number of buffered rows written at once by `put` and `put_aIDs`.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._lock: threading.Lock = threading.Lock()
+        self._db: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode = WAL')
+        self._db.execute('PRAGMA synchronous = NORMAL')
+        self._db.execute('PRAGMA busy_timeout = 5000')
+        self._db.executescript(_SCHEMA)
+        self._records: list[Row] = []
+        self._aIDs: list[Row] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+
+    def add(self, record: Union[SellingRecord, InfoSelling], fetched_at: Optional[float] = None) -> None:
+        """ Buffer a snapshot until `flush`.
+
+        Parameters
+        ----------
+        record : SellingRecord | InfoSelling
+            Snapshot. `InfoSelling` is converted to `SellingRecord`.
+        fetched_at : float | None
+            Epoch seconds `InfoSelling` was fetched at. Current time if None.
+        """
+        if isinstance(record, InfoSelling):
+            record = SellingRecord.from_info(record, fetched_at)
+        self._records.append(tuple(getattr(record, name) for name in _COLUMNS))
+
+
+    def add_aIDs(self, kind: str, aIDs: Iterable[str], fetched_at: Optional[float] = None) -> None:
+        """ Buffer an aID list until `flush`.
+
+        Parameters
+        ----------
+        kind : str
+            Name of the list, such as `selling` or `closed_with_winner`.
+        aIDs : Iterable[str]
+            aIDs in the order of the list.
+        fetched_at : float | None
+            Epoch seconds the list was fetched at. Current time if None.
+        """
+        at: int = int(time.time() if fetched_at is None else fetched_at)
+        self._aIDs.extend((kind, at, position, aID) for position, aID in enumerate(aIDs))
+
+
+    def flush(self) -> None:
+        """ Write the buffered rows in a transaction. """
+        records, aIDs = self._take()
+        self._write(records, aIDs)
+
+
+    async def put(self, record: Union[SellingRecord, InfoSelling], fetched_at: Optional[float] = None) -> None:
+        """ `add` a snapshot, and write the buffer from the worker thread once `batch_size` rows are buffered. """
+        self.add(record, fetched_at)
+        if len(self._records) + len(self._aIDs) >= self.batch_size:
+            await self.aflush()
+
+
+    async def put_aIDs(self, kind: str, aIDs: Iterable[str], fetched_at: Optional[float] = None) -> None:
+        """ `add_aIDs`, and write the buffer from the worker thread once `batch_size` rows are buffered. """
+        self.add_aIDs(kind, aIDs, fetched_at)
+        if len(self._records) + len(self._aIDs) >= self.batch_size:
+            await self.aflush()
+
+
+    async def aflush(self) -> None:
+        """ Write the buffered rows in a transaction from the worker thread. """
+        records, aIDs = self._take()
+        if not records and not aIDs:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix='store')
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._write, records, aIDs)
+
+
+    def latest(self, aIDs: Optional[Iterable[str]] = None) -> SellingTable:
+        """ Return the latest snapshot of every aID, or of `aIDs`, ordered by aID. """
+        sql: str = f'SELECT {_COLUMN_LIST} FROM selling_latest'
+        if aIDs is None:
+            return _table(self._query(f'{sql} ORDER BY aID'))
+        wanted: list[str] = list(aIDs)
+        rows: list[Row] = []
+        for i in range(0, len(wanted), 500):  # below the limit of host parameters
+            chunk: list[str] = wanted[i:i + 500]
+            rows += self._query(f'{sql} WHERE aID IN ({", ".join("?" * len(chunk))})', chunk)
+        return _table(sorted(rows))
+
+
+    def series(self, aID: str, since: Optional[float] = None, until: Optional[float] = None) -> SellingTable:
+        """ Return snapshots of `aID` in the order fetched.
+
+        Parameters
+        ----------
+        aID : str
+            Auction ID.
+        since, until : float | None
+            Epoch seconds bounding `fetched_at`, inclusive. Not bounded if None.
+        """
+        return _table(self._query(
+            f'SELECT {_COLUMN_LIST} FROM selling WHERE aID = ? AND fetched_at BETWEEN ? AND ? ORDER BY fetched_at, id',
+            (aID, int(since) if since is not None else -2 ** 63, int(until) if until is not None else 2 ** 63 - 1)
+        ))
+
+
+    def ending_between(self, start: float, stop: float) -> SellingTable:
+        """ Return the latest snapshots of auctions ending in `[start, stop)` epoch seconds, by end time. """
+        return _table(self._query(
+            f'SELECT {_COLUMN_LIST} FROM selling_latest WHERE end_time >= ? AND end_time < ? ORDER BY end_time',
+            (int(start), int(stop))
+        ))
+
+
+    def aIDs(self, kind: str, at: Optional[float] = None) -> list[str]:
+        """ Return the latest aID list of `kind`, or the latest fetched at or before `at`. """
+        rows: list[Row] = self._query(
+            'SELECT aID FROM aid_list_items WHERE list = ('
+            'SELECT id FROM aid_lists WHERE kind = ? AND fetched_at <= ? ORDER BY fetched_at DESC, id DESC LIMIT 1'
+            ') ORDER BY position',
+            (kind, int(at) if at is not None else 2 ** 63 - 1)
+        )
+        return [aID for aID, in rows]
+
+
+    def close(self) -> None:
+        """ Write the buffered rows and close the database. """
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self._db.close()
+
+
+    async def aclose(self) -> None:
+        """ Write the buffered rows from the worker thread and close the database. """
+        await self.aflush()
+        self.close()
+
+
+    def __enter__(self) -> HistoryStore:
+        return self
+
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        self.close()
+
+
+    async def __aenter__(self) -> HistoryStore:
+        return self
+
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        await self.aclose()
+
+
+    def _take(self) -> tuple[list[Row], list[Row]]:
+        records, aIDs = self._records, self._aIDs
+        self._records, self._aIDs = [], []
+        return records, aIDs
+
+
+    def _write(self, records: list[Row], aIDs: list[Row]) -> None:
+        if not records and not aIDs:
+            return
+        with self._lock:
+            self._db.execute('BEGIN')
+            try:
+                self._db.executemany(f'INSERT INTO selling ({_COLUMN_LIST}) VALUES ({_PLACEHOLDERS})', records)
+                self._db.executemany(
+                    f'INSERT INTO selling_latest ({_COLUMN_LIST}) VALUES ({_PLACEHOLDERS}) '
+                    f'ON CONFLICT (aID) DO UPDATE SET {_UPDATES} WHERE excluded.fetched_at >= selling_latest.fetched_at',
+                    records
+                )
+                self._db.executemany('INSERT INTO aid_list_items VALUES (?, ?, ?)', self._lists(aIDs))
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+            self._db.execute('COMMIT')
+
+
+    def _lists(self, aIDs: list[Row]) -> list[Row]:
+        """ Insert a row of `aid_lists` for each list of `aIDs`, and return the rows of their items. """
+        items: list[Row] = []
+        list_id: Optional[int] = None
+        for kind, at, position, aID in aIDs:
+            if position == 0 or list_id is None:  # the first aID of a list
+                list_id = self._db.execute('INSERT INTO aid_lists (kind, fetched_at) VALUES (?, ?)', (kind, at)).lastrowid
+            items.append((list_id, position, aID))
+        return items
+
+
+    def _query(self, sql: str, parameters: Iterable[Any] = ()) -> list[Row]:
+        with self._lock:
+            return self._db.execute(sql, tuple(parameters)).fetchall()
+
+
+    def __repr__(self) -> str:
+        return f'HistoryStore({self.path!r})'
+
+
+
+def _table(rows: Iterable[Row]) -> SellingTable:
+    return SellingTable(
+        SellingRecord(aID, title, seller, stack, start, end, bool(refundable), price, bids, access, watch, fetched_at)
+        for aID, fetched_at, title, seller, stack, start, end, refundable, price, bids, access, watch in rows
+    )
@@ -0,0 +1,506 @@
+""" Local stand-in of Yahoo Auction for load testing.
+
+Serves generated mystatus list pages linked by `rsec:pagination;slk:next;`,
+auction pages in the format the scrapers read, and the cancel confirm flow,
+over plain HTTP/1.1 with keep-alive. Latency and error responses can be injected.
+
+    async with StubServer(selling=500, latency=0.05, error_rate=0.01) as server:
+        async with YahooAuction([], urls=server.urls) as ya:
+            aIDs = await ya.get_aIDs_selling()
+
+It also runs standalone:
+
+    python -m yahoo_auction_auto.stub --port 8080 --selling 500 --latency 0.05
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+from html import escape
+from http import HTTPStatus
+from types import TracebackType
+from typing import Iterable, Optional, Sequence, Type
+from urllib.parse import parse_qs, urlsplit
+
+from yahoo_auction_auto.info.table import JST, format_timeleft
+from yahoo_auction_auto.urls import YahooAuctionURL
+
+SELLING: str = 'selling'
+CLOSED_WITH_WINNER: str = 'closed_with_winner'
+CLOSED_WITHOUT_WINNER: str = 'closed_without_winner'
+CANCELLED: str = 'cancelled'
+
+# path of a list page → state of items it lists by default
+_LISTS: dict[str, str] = {
+    '/openuser/jp/show/mystatus': SELLING,
+    '/closeduser/jp/show/mystatus': CLOSED_WITH_WINNER,
+}
+_WEEKDAYS: str = '月火水木金土日'
+
+
+class StubItem:
+    """ Product served by `StubServer`. """
+    aID: str
+    title: str
+    state: str
+    price: int
+    count_bid: int
+    count_access: int
+    count_watch: int
+    start_datetime: datetime
+    end_datetime: datetime
+
+
+    def __init__(
+        self,
+        aID: str,
+        state: str,
+        start_datetime: datetime,
+        end_datetime: datetime,
+        price: int = 1000,
+        count_bid: int = 0,
+        count_access: int = 0,
+        count_watch: int = 0
+    ) -> None:
+        self.aID = aID
+        self.title = f'item {aID}'
+        self.state = state
+        self.price = price
+        self.count_bid = count_bid
+        self.count_access = count_access
+        self.count_watch = count_watch
+        self.start_datetime = start_datetime
+        self.end_datetime = end_datetime
+
+
+    def __repr__(self) -> str:
+        return f'StubItem(aID={self.aID!r}, state={self.state!r})'
+
+
+
+def make_items(count: int, state: str = SELLING, start: int = 0, seed: int = 0, now: Optional[datetime] = None) -> list[StubItem]:
+    """ Return `count` items of `state` with aIDs numbered from `start`.
+
+    Selling items end one hour apart from `now`, closed items ended one hour apart before it.
+    Counts are drawn from a generator seeded with `seed`, so the same arguments give the same items.
+    """
+    rng: random.Random = random.Random(seed)
+    now = now or datetime.now(JST).replace(tzinfo=None, second=0, microsecond=0)
+    prefix: str = {SELLING: 's', CLOSED_WITH_WINNER: 'w', CLOSED_WITHOUT_WINNER: 'n'}.get(state, 'x')
+    items: list[StubItem] = []
+    for i in range(start, start + count):
+        offset: timedelta = timedelta(hours=i + 1)
+        end: datetime = now + offset if state == SELLING else now - offset
+        bids: int = 0 if state == CLOSED_WITHOUT_WINNER else rng.randrange(0 if state == SELLING else 1, 20)
+        items.append(StubItem(
+            f'{prefix}{i:010d}',
+            state,
+            end - timedelta(days=7),
+            end,
+            price=rng.randrange(1, 1000) * 100,
+            count_bid=bids,
+            count_access=rng.randrange(0, 1000),
+            count_watch=rng.randrange(0, 100),
+        ))
+    return items
+
+
+def render_list_page(items: Sequence[StubItem], urls: YahooAuctionURL, next_url: Optional[str], slk: str = 'tc') -> bytes:
+    """ Return HTML of a mystatus list page of `items` linking `next_url`.
+
+    Parameters
+    ----------
+    items : Sequence[StubItem]
+        Items of the page.
+    urls : YahooAuctionURL
+        URLs the auction links point to.
+    next_url : str | None
+        URL of the next page. No next link if None.
+    slk : str
+        `slk` of product links, `tc` on the selling list and `ttlc` on the closed lists.
+    """
+    rows: list[str] = []
+    for i, item in enumerate(items):
+        end: datetime = item.end_datetime
+        rows.append(
+            f'<tr><td>{item.aID}</td>'
+            f'<td><a href="{escape(urls.auction(item.aID))}" data-ylk="rsec:itm;slk:{slk};pos:{i + 1}">{escape(item.title)}</a></td>'
+            f'<td>{item.price:,} 円</td><td>{item.count_bid}</td><td>{item.count_watch}</td>'
+            f'<td>{end.month}月{end.day}日 {end.hour}時{end.minute:02d}分</td></tr>'
+        )
+    next_link: str = ''
+    if next_url is not None:
+        next_link = f'<a href="{escape(next_url)}" data-ylk="rsec:pagination;slk:next;pos:1">次へ</a>'
+    return (
+        '<!DOCTYPE html><html lang="ja"><head><meta charset="utf-8"><title>マイ・オークション</title></head><body>'
+        '<table class="MyStatus"><tr><th>商品ID</th><th>商品名</th><th>現在価格</th>'
+        '<th>入札</th><th>ウォッチ</th><th>終了日時</th></tr>'
+        f'{"".join(rows)}</table>{next_link}</body></html>'
+    ).encode()
+
+
+def render_detail_page(item: StubItem, now: Optional[datetime] = None) -> bytes:
+    """ Return HTML of the auction page of `item`, in the block structure of the real page. """
+    now = now or datetime.now(JST).replace(tzinfo=None)
+    timeleft: str = format_timeleft((item.end_datetime - now).total_seconds())
+    number: str = timeleft.rstrip('日時間分終了')
+    unit: str = timeleft[len(number):]
+    details: list[tuple[str, str]] = [
+        ('個数', '1'),
+        ('開始日時', _yahoo_datetime(item.start_datetime)),
+        ('終了日時', _yahoo_datetime(item.end_datetime)),
+        ('返品', '返品不可'),
+        ('開始価格', f'{item.price:,} 円（税 0 円）'),
+        ('オークションID', item.aID),
+    ]
+    rows: str = ''.join(
+        f'<li class="ProductDetail__item"><dl><dt class="ProductDetail__title">{label}</dt>'
+        f'<dd class="ProductDetail__description"><span class="ProductDetail__bullet">：</span>{escape(value)}</dd></dl></li>'
+        for label, value in details
+    )
+    return (
+        '<!DOCTYPE html><html lang="ja"><head><meta charset="utf-8">'
+        f'<title>{escape(item.title)} - ヤフオク!</title></head><body>'
+        '<div class="ProductTitle" id="ProductTitle"><div class="ProductTitle__title">'
+        f'<h1 class="ProductTitle__text">{escape(item.title)}</h1></div></div>'
+        f'<div class="ProductDetail"><ul class="ProductDetail__items">{rows}</ul></div>'
+        '<div class="Count"><ul class="Count__counts">'
+        f'<li class="Count__count"><dl><dt class="Count__title">入札件数</dt>'
+        f'<dd class="Count__number">{item.count_bid}<a class="Count__note" href="#">入札履歴</a></dd></dl></li>'
+        f'<li class="Count__count"><dl><dt class="Count__title">残り時間</dt>'
+        f'<dd class="Count__number">{number}<span class="Count__unit">{unit}</span>\n'
+        '<a class="Count__note" href="#">詳細</a></dd></dl></li></ul></div>'
+        '<dl class="StatisticsInfo"><dd class="StatisticsInfo__body"><ul class="StatisticsInfo__list">'
+        '<li class="StatisticsInfo__item"><span class="StatisticsInfo__term StatisticsInfo__term--access">アクセス</span>'
+        f'<span class="StatisticsInfo__data">{item.count_access}</span></li>'
+        '<li class="StatisticsInfo__item"><span class="StatisticsInfo__term StatisticsInfo__term--watch">ウォッチ</span>'
+        f'<span class="StatisticsInfo__data">{item.count_watch}</span></li></ul></dd></dl>'
+        '<dl class="Seller"><dd class="Seller__card"><span class="Seller__name">'
+        '<a href="#" data-ylk="rsec:seller;slk:slfinfo;pos:1">stub_seller</a></span></dd></dl>'
+        '</body></html>'
+    ).encode()
+
+
+def render_cancel_page(aID: str, crumb: str) -> bytes:
+    """ Return HTML of the cancel page of `aID` having the confirm form. """
+    return (
+        '<!DOCTYPE html><html lang="ja"><head><meta charset="utf-8"><title>オークションの取り消し</title></head><body>'
+        '<form action="/jp/config/cancelauction" method="post">'
+        f'<input type="hidden" name="aID" value="{escape(aID)}">'
+        f'<input type="hidden" name=".crumb" value="{escape(crumb)}">'
+        '<textarea name="cancel_reason"></textarea>'
+        '<input type="submit" name="confirm" value="取り消す">'
+        '</form></body></html>'
+    ).encode()
+
+
+def _yahoo_datetime(dt: datetime) -> str:
+    return f'{dt:%Y.%m.%d}（{_WEEKDAYS[dt.weekday()]}）{dt:%H:%M}'
+
+
+
+class StubServer:
+    """ Local HTTP server standing in for Yahoo Auction.
+
+    Every page is served under one base URL, which `urls` points at.
+    `requests` counts requests per route and `cancelled` lists aIDs cancelled through the confirm flow.
+    """
+    ROUTES: tuple[str, ...] = ('mypage', 'list', 'detail', 'cancel', 'confirm')
+
+
+    def __init__(
+        self,
+        selling: int = 100,
+        closed_with_winner: int = 0,
+        closed_without_winner: int = 0,
+        per_page: int = 50,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_statuses: Sequence[int] = (503,),
+        error_routes: Optional[Iterable[str]] = None,
+        cookies: Optional[dict[str, str]] = None,
+        seed: int = 0,
+        host: str = '127.0.0.1',
+        port: int = 0
+    ) -> None:
+        """
+        Parameters
+        ----------
+        selling, closed_with_winner, closed_without_winner : int
+            Number of generated items of each list.
+        per_page : int
+            Items per list page.
+        latency : float
+            Seconds every response is delayed by.
+        jitter : float
+            Max random seconds added to `latency`.
+        error_rate : float
+            Probability a request is answered with one of `error_statuses` instead.
+        error_statuses : Sequence[int]
+            Statuses of injected errors. 429 and 503 come with `Retry-After: 1`.
+        error_routes : Iterable[str] | None
+            Routes of `ROUTES` errors are injected into. All routes if None.
+        cookies : dict[str, str] | None
+            Cookies a request must have, otherwise it is redirected to a login page.
+            Any request is accepted if None.
+        seed : int
+            Seed of generated items and injected errors.
+        host : str
+            Address to listen on.
+        port : int
+            Port to listen on. A free port if 0.
+        """
+        self.per_page: int = per_page
+        self.latency: float = latency
+        self.jitter: float = jitter
+        self.error_rate: float = error_rate
+        self.error_statuses: tuple[int, ...] = tuple(error_statuses)
+        self.error_routes: frozenset[str] = frozenset(self.ROUTES if error_routes is None else error_routes)
+        self.cookies: Optional[dict[str, str]] = cookies
+        self.host: str = host
+        self.port: int = port
+        self.requests: Counter[str] = Counter()
+        self.cancelled: list[str] = []
+        self.items: dict[str, StubItem] = {}
+        for count, state in ((selling, SELLING), (closed_with_winner, CLOSED_WITH_WINNER), (closed_without_winner, CLOSED_WITHOUT_WINNER)):
+            for item in make_items(count, state, seed=seed):
+                self.items[item.aID] = item
+        self._random: random.Random = random.Random(seed)
+        self._server: Optional[asyncio.base_events.Server] = None
+        self.urls: YahooAuctionURL = YahooAuctionURL.local(f'http://{host}:{port}')
+
+
+    @property
+    def base_url(self) -> str:
+        return self.urls.AUCTIONS_BASE
+
+
+    def listed(self, state: str) -> list[StubItem]:
+        """ Return items of `state` in the order of the list pages. """
+        return [item for item in self.items.values() if item.state == state]
+
+
+    async def start(self) -> str:
+        """ Start listening and return the base URL. """
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = int(self._server.sockets[0].getsockname()[1])
+        self.urls = YahooAuctionURL.local(f'http://{self.host}:{self.port}')
+        return self.base_url
+
+
+    async def stop(self) -> None:
+        """ Stop listening and close connections. """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+    async def __aenter__(self) -> StubServer:
+        await self.start()
+        return self
+
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        await self.stop()
+
+
+    def respond(
+        self,
+        method: str,
+        target: str,
+        headers: dict[str, str],
+        body: bytes = b''
+    ) -> tuple[int, dict[str, str], bytes]:
+        """ Return status, headers and body answering a request, without latency.
+
+        Parameters
+        ----------
+        method : str
+            Request method.
+        target : str
+            Path and query of the request.
+        headers : dict[str, str]
+            Request headers with lower-case names.
+        body : bytes
+            Request body.
+        """
+        split = urlsplit(target)
+        query: dict[str, list[str]] = parse_qs(split.query)
+        route: str = self._route(method, split.path)
+        self.requests[route] += 1
+
+        if route in self.error_routes and self.error_rate > 0 and self._random.random() < self.error_rate:
+            status: int = self._random.choice(self.error_statuses)
+            extra: dict[str, str] = {'Retry-After': '1'} if status in (429, 503) else {}
+            return status, extra, HTTPStatus(status).phrase.encode()
+        if route == 'login':
+            return 200, {}, '<html><body>ログイン</body></html>'.encode()
+        if self.cookies is not None and not self._logged_in(headers):
+            return 302, {'Location': f'{self.base_url}/login'}, b''
+
+        if route == 'mypage':
+            return 200, {}, '<html><body>マイ・オークション</body></html>'.encode()
+        if route == 'list':
+            return self._list(split.path, query)
+        if route == 'detail':
+            item: Optional[StubItem] = self.items.get(split.path.rsplit('/', 1)[-1])
+            if item is None:
+                return 404, {}, b'Not Found'
+            return 200, {}, render_detail_page(item)
+        if route == 'cancel':
+            aID: str = query.get('aID', [''])[0]
+            if aID not in self.items or self.items[aID].state != SELLING:
+                return 404, {}, b'Not Found'
+            return 200, {}, render_cancel_page(aID, self._crumb(aID))
+        if route == 'confirm':
+            return self._confirm(parse_qs(body.decode()))
+        return 404, {}, b'Not Found'
+
+
+    def _route(self, method: str, path: str) -> str:
+        if method == 'POST':
+            return 'confirm' if path == '/jp/config/cancelauction' else 'unknown'
+        if path == '/user/jp/show/mystatus':
+            return 'mypage'
+        if path in _LISTS:
+            return 'list'
+        if path.startswith('/jp/auction/'):
+            return 'detail'
+        if path == '/jp/show/cancelauction':
+            return 'cancel'
+        if path == '/login':
+            return 'login'
+        return 'unknown'
+
+
+    def _list(self, path: str, query: dict[str, list[str]]) -> tuple[int, dict[str, str], bytes]:
+        state: str = _LISTS[path]
+        slk: str = 'tc'
+        if state != SELLING:
+            slk = 'ttlc'
+            state = CLOSED_WITH_WINNER if query.get('hasWinner', ['1'])[0] == '1' else CLOSED_WITHOUT_WINNER
+        items: list[StubItem] = self.listed(state)
+        page: int = max(1, int(query.get('apg', ['1'])[0]))
+        start: int = (page - 1) * self.per_page
+        next_url: Optional[str] = None
+        if start + self.per_page < len(items):
+            base: str = self.urls.SELLING if state == SELLING else (
+                self.urls.CLOSED_WITH_WINNER if state == CLOSED_WITH_WINNER else self.urls.CLOSED_WITHOUT_WINNER
+            )
+            next_url = f'{base}&apg={page + 1}'
+        return 200, {}, render_list_page(items[start:start + self.per_page], self.urls, next_url, slk)
+
+
+    def _confirm(self, form: dict[str, list[str]]) -> tuple[int, dict[str, str], bytes]:
+        aID: str = form.get('aID', [''])[0]
+        if 'confirm' not in form or form.get('.crumb', [''])[0] != self._crumb(aID):
+            return 400, {}, b'Bad Request'
+        item: Optional[StubItem] = self.items.get(aID)
+        if item is None or item.state != SELLING:
+            return 404, {}, b'Not Found'
+        item.state = CANCELLED
+        self.cancelled.append(aID)
+        return 200, {}, '<html><body>オークションを取り消しました</body></html>'.encode()
+
+
+    def _logged_in(self, headers: dict[str, str]) -> bool:
+        sent: dict[str, str] = {}
+        for pair in headers.get('cookie', '').split(';'):
+            name, _, value = pair.strip().partition('=')
+            sent[name] = value
+        return all(sent.get(name) == value for name, value in (self.cookies or {}).items())
+
+
+    @staticmethod
+    def _crumb(aID: str) -> str:
+        return f'crumb-{aID}'
+
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head: bytes = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+                lines: list[str] = head.decode('latin-1').split('\r\n')
+                method, target, _ = lines[0].split(' ', 2)
+                headers: dict[str, str] = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(':')
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                body: bytes = await reader.readexactly(int(headers.get('content-length', '0') or 0))
+
+                delay: float = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                status, response_headers, content = self.respond(method, target, headers, body)
+                writer.write(_format_response(status, response_headers, content))
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+
+def _format_response(status: int, headers: dict[str, str], content: bytes) -> bytes:
+    lines: list[str] = [f'HTTP/1.1 {status} {HTTPStatus(status).phrase}']
+    headers = {'Content-Type': 'text/html; charset=utf-8', **headers, 'Content-Length': str(len(content))}
+    lines.extend(f'{name}: {value}' for name, value in headers.items())
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + content
+
+
+async def _main(args: argparse.Namespace) -> None:
+    server: StubServer = StubServer(
+        selling=args.selling,
+        closed_with_winner=args.closed_with_winner,
+        closed_without_winner=args.closed_without_winner,
+        per_page=args.per_page,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_statuses=args.error_status,
+        seed=args.seed,
+        host=args.host,
+        port=args.port,
+    )
+    async with server:
+        print(f'serving on {server.base_url}', flush=True)
+        await asyncio.Event().wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--selling', type=int, default=100)
+    parser.add_argument('--closed-with-winner', type=int, default=0)
+    parser.add_argument('--closed-without-winner', type=int, default=0)
+    parser.add_argument('--per-page', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, nargs='+', default=[503])
+    parser.add_argument('--seed', type=int, default=0)
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,19 @@
+import re
+from typing import Pattern
+
+_PATTERN_AID: Pattern[str] = re.compile(r'(?<=/)\w+$')
+
 
 class YahooAuctionURL:
+    """ URLs of Yahoo Auction pages.
+
+    Class attributes are the URLs of the real site.
+    An instance built with other base URLs, such as one of a local stand-in
+    server, has the same attributes pointing there,
+    and `auction` and `cancel` in place of `AUCTION` and `CANCEL`.
+    """
+    AUCTIONS_BASE = 'https://auctions.yahoo.co.jp'
+    PAGE_BASE = 'https://page.auctions.yahoo.co.jp'
     HOME = 'https://yahoo.co.jp'
     MYPAGE = 'https://auctions.yahoo.co.jp/user/jp/show/mystatus'
     SELLING = 'https://auctions.yahoo.co.jp/openuser/jp/show/mystatus?select=selling'
@@ -7,12 +21,61 @@ class YahooAuctionURL:
     CLOSED_WITHOUT_WINNER = 'https://auctions.yahoo.co.jp/closeduser/jp/show/mystatus?select=closed&hasWinner=0'
 
 
+    def __init__(
+        self,
+        auctions_base: str = AUCTIONS_BASE,
+        page_base: str = PAGE_BASE,
+        home: str = HOME
+    ) -> None:
+        """
+        Parameters
+        ----------
+        auctions_base : str
+            Scheme and host of the mystatus list pages.
+        page_base : str
+            Scheme and host of the auction and cancel pages.
+        home : str
+            Page cookies are set on before using Chrome.
+        """
+        self.AUCTIONS_BASE = auctions_base.rstrip('/')
+        self.PAGE_BASE = page_base.rstrip('/')
+        self.HOME = home
+        self.MYPAGE = f'{self.AUCTIONS_BASE}/user/jp/show/mystatus'
+        self.SELLING = f'{self.AUCTIONS_BASE}/openuser/jp/show/mystatus?select=selling'
+        self.CLOSED_WITH_WINNER = f'{self.AUCTIONS_BASE}/closeduser/jp/show/mystatus?select=closed&hasWinner=1'
+        self.CLOSED_WITHOUT_WINNER = f'{self.AUCTIONS_BASE}/closeduser/jp/show/mystatus?select=closed&hasWinner=0'
+
+
+    @classmethod
+    def local(cls, base: str) -> 'YahooAuctionURL':
+        """ Return URLs of a stand-in server serving every page under `base`, such as `http://127.0.0.1:8080`. """
+        return cls(base, base, base)
+
+
+    def auction(self, aID: str) -> str:
+        return f'{self.PAGE_BASE}/jp/auction/{aID}'
+
+
+    def cancel(self, aID: str) -> str:
+        return f'{self.PAGE_BASE}/jp/show/cancelauction?aID={aID}'
+
+
+    def __repr__(self) -> str:
+        return f'YahooAuctionURL({self.AUCTIONS_BASE!r}, {self.PAGE_BASE!r}, {self.HOME!r})'
+
+
     @staticmethod
     def AUCTION(aID: str) -> str:
         return f'https://page.auctions.yahoo.co.jp/jp/auction/{aID}'
 
-    
+
     @staticmethod
     def CANCEL(aID: str) -> str:
         return f'https://page.auctions.yahoo.co.jp/jp/show/cancelauction?aID={aID}'
 
+
+
+def aID_of(url: str) -> str:
+    """ Return the aID at the end of the page URL of an auction, or an empty string if none. """
+    match = _PATTERN_AID.search(url)
+    return match.group() if match else ''
@@ -0,0 +1,135 @@
+import hashlib
+import time
+from typing import Any, Iterable, Optional, Union
+
+from yahoo_auction_auto.info.selling import InfoSelling
+from yahoo_auction_auto.parsers import Parser, get_parser
+
+FIELDS: tuple[str, ...] = (
+    'title',
+    'seller_name',
+    'stack',
+    'start_datetime',
+    'end_datetime',
+    'refundable',
+    'startprice',
+    'timeleft',
+    'count_bid',
+    'count_access',
+    'count_watch',
+)
+
+
+class ChangeEvent:
+    """ Fields of a listing changed since the previous poll. """
+    aID: str
+    changes: dict[str, Any]
+    fetched_at: float
+
+
+    def __init__(self, aID: str, changes: dict[str, Any], fetched_at: float) -> None:
+        self.aID = aID
+        self.changes = changes
+        self.fetched_at = fetched_at
+
+
+    def __repr__(self) -> str:
+        return f'ChangeEvent(aID={self.aID!r}, changes={self.changes!r})'
+
+
+
+class WatchState:
+    """ Last page hash and `InfoSelling` of each watched aID. """
+
+    def __init__(
+        self, 
+        fields: Iterable[str] = FIELDS, 
+        partial: bool = False, 
+        parser: Optional[Union[str, Parser]] = None
+    ) -> None:
+        """
+        Parameters
+        ----------
+        fields : Iterable[str]
+            Fields of `InfoSelling` compared between polls.
+        partial : bool
+            Parse only the blocks of pages read by the scrapers.
+        parser : str | Parser | None
+            Parser backend, which overrides `partial`. See `parsers.PARSERS`.
+        """
+        self.fields: tuple[str, ...] = tuple(fields)
+        self.partial: bool = partial
+        self.parser: Parser = get_parser(parser or ('bs4-partial' if partial else 'bs4'))
+        self._hashes: dict[str, bytes] = {}
+        self._infos: dict[str, InfoSelling] = {}
+
+
+    def get(self, aID: str) -> Optional[InfoSelling]:
+        """ Return the last state of `aID`, or None if not seen yet. """
+        return self._infos.get(aID)
+
+
+    def forget(self, aID: str) -> None:
+        """ Drop the state of `aID`. """
+        self._hashes.pop(aID, None)
+        self._infos.pop(aID, None)
+
+
+    def observe(self, aID: str, content: bytes, fetched_at: Optional[float] = None) -> Optional[ChangeEvent]:
+        """ Update the state of `aID` from its page and return what changed. 
+
+        The page is parsed only if its hash differs from the previous one.
+        On the first observation, all fields are reported as changed.
+        
+        Parameters
+        ----------
+        aID : str
+            Auction ID.
+        content : bytes
+            HTML of the page of YahooAuctionURL.AUCTION(aID).
+        fetched_at : float | None
+            Epoch seconds the page was fetched at. Current time if None.
+
+        Returns
+        -------
+        ChangeEvent | None
+            Changed fields with their new values, or None if nothing changed.
+        """
+        digest: bytes = hashlib.blake2b(content, digest_size=16).digest()
+        if self._hashes.get(aID) == digest:
+            return None
+
+        info: InfoSelling = InfoSelling(aID)
+        info.parse(content, parser=self.parser)
+        changes: dict[str, Any] = diff(self._infos.get(aID), info, self.fields)
+        self._hashes[aID] = digest
+        self._infos[aID] = info
+        if not changes:
+            return None
+        return ChangeEvent(aID, changes, time.time() if fetched_at is None else fetched_at)
+
+
+
+def diff(old: Optional[InfoSelling], new: InfoSelling, fields: Iterable[str] = FIELDS) -> dict[str, Any]:
+    """ Return fields of `new` whose values differ from `old`. 
+    
+    Parameters
+    ----------
+    old : InfoSelling | None
+        Previous state. All fields are returned if None.
+    new : InfoSelling
+        Current state.
+    fields : Iterable[str]
+        Fields to compare.
+
+    Returns
+    -------
+    dict[str, Any]
+        Changed field names and their new values.
+    """
+    changes: dict[str, Any] = {}
+    for field in fields:
+        value: Any = getattr(new, field, None)
+        if old is None or getattr(old, field, None) != value:
+            changes[field] = value
+    return changes
@@ -0,0 +1,107 @@
+""" Watermark of incremental syncs of the closed lists.
+
+The closed lists only grow and show the newest closings first,
+so a sync only needs the entries above the newest one seen before.
+`ClosedWatermark` remembers the aIDs at the top of a list and the newest closing time,
+and the walk over list pages stops at the first entry it knows.
+
+    watermark = ClosedWatermark.load('closed_with_winner.json')
+    infos = await ya.get_info_closed_with_winner(watermark)
+    watermark.save('closed_with_winner.json')
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+
+class ClosedWatermark:
+    """ Newest entries seen on a closed list. """
+    aIDs: list[str]
+    end_datetime: Optional[datetime]
+    keep: int
+
+
+    def __init__(self, aIDs: Iterable[str] = (), end_datetime: Optional[datetime] = None, keep: int = 200) -> None:
+        """
+        Parameters
+        ----------
+        aIDs : Iterable[str]
+            aIDs seen, newest first.
+        end_datetime : datetime | None
+            Newest closing time seen.
+        keep : int
+            Number of the newest aIDs remembered.
+            Entries closed at the same time as the newest, or shuffled at the top, are recognized by them.
+        """
+        self.aIDs = list(aIDs)[:keep]
+        self.end_datetime = end_datetime
+        self.keep = keep
+        self._known: set[str] = set(self.aIDs)
+
+
+    def is_known(self, aID: str, end_datetime: Optional[datetime] = None) -> bool:
+        """ Return True if the entry was seen, or closed before the newest entry seen. """
+        if aID in self._known:
+            return True
+        return end_datetime is not None and self.end_datetime is not None and end_datetime < self.end_datetime
+
+
+    def update(self, aIDs: Iterable[str], end_datetime: Optional[datetime] = None) -> None:
+        """ Remember new entries of a finished sync.
+
+        Parameters
+        ----------
+        aIDs : Iterable[str]
+            New aIDs, newest first.
+        end_datetime : datetime | None
+            Newest closing time of them.
+        """
+        self.aIDs = [aID for aID in aIDs if aID not in self._known] + self.aIDs
+        del self.aIDs[self.keep:]
+        self._known = set(self.aIDs)
+        if end_datetime is not None and (self.end_datetime is None or end_datetime > self.end_datetime):
+            self.end_datetime = end_datetime
+
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'aIDs': self.aIDs,
+            'end_datetime': self.end_datetime.isoformat() if self.end_datetime else None,
+        }
+
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], keep: int = 200) -> ClosedWatermark:
+        end: Optional[str] = data.get('end_datetime')
+        return cls(data.get('aIDs', []), datetime.fromisoformat(end) if end else None, keep)
+
+
+    @classmethod
+    def load(cls, path: str, keep: int = 200) -> ClosedWatermark:
+        """ Return the watermark saved at `path`, or an empty one if the file is missing. """
+        try:
+            with open(path, encoding='utf-8') as f:
+                return cls.from_dict(json.load(f), keep)
+        except FileNotFoundError:
+            return cls(keep=keep)
+
+
+    def save(self, path: str) -> None:
+        """ Write the watermark to `path` atomically. """
+        directory: str = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+
+    def __repr__(self) -> str:
+        return f'ClosedWatermark(aIDs={len(self.aIDs)}, end_datetime={self.end_datetime!r})'
@@ -1,43 +1,251 @@
+from __future__ import annotations
+
 import re
+import asyncio
 import logging
-from typing import Optional, Any, Pattern
-
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.remote.webelement import WebElement
-import requests
-import requests_async 
-import bs4
-
-from yahoo_auction_auto.chrome import chrome
-from yahoo_auction_auto.urls import YahooAuctionURL
+import functools
+from datetime import datetime
+from types import TracebackType
+from typing import TYPE_CHECKING, Optional, Any, AsyncGenerator, AsyncIterator, Callable, Iterable, Pattern, Type, TypeVar, Union
+
+import httpx
+
+from yahoo_auction_auto.cache import ResponseCache
+from yahoo_auction_auto.cancel import CANCELLED_MARKER, CancelUnconfirmed, cancel_http
+from yahoo_auction_auto.client import HTTPClient
+from yahoo_auction_auto.concurrency import as_completed_bounded
+from yahoo_auction_auto.limiter import Limiter, LimiterStats
+from yahoo_auction_auto.metrics import Metrics, measure
+from yahoo_auction_auto.retry import Hedging, RetryPolicy
+from yahoo_auction_auto.session import SessionManager, save_cookies
+from yahoo_auction_auto.urls import YahooAuctionURL, aID_of
 from yahoo_auction_auto.info.selling import InfoSelling
+from yahoo_auction_auto.info.summary import InfoSummary
 from yahoo_auction_auto.info.closed_with_winner import InfoClosedWithWinner
 from yahoo_auction_auto.info.closed_without_winner import InfoClosedWithoutWinner
+from yahoo_auction_auto.parsers import Parser, get_parser
+from yahoo_auction_auto.watch import ChangeEvent, WatchState, FIELDS
+from yahoo_auction_auto.watermark import ClosedWatermark
+
+if TYPE_CHECKING:
+    from selenium.webdriver.chrome.options import Options
+    from yahoo_auction_auto.chrome import ChromePool
+    from yahoo_auction_auto.parsers.pool import ParsePool
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+I = TypeVar('I', bound=InfoSummary)
+
+_PATTERN_SELLING: Pattern[str] = re.compile(r'^rsec:itm;slk:tc;')
+_PATTERN_CLOSED: Pattern[str] = re.compile(r'^rsec:itm;slk:ttlc;')
+
 class YahooAuction:
 
     def __init__(
         self, 
         cookies: list[dict[str, Any]],
-        headless: bool = True
+        headless: bool = True,
+        http2: bool = True,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        cache: Optional[ResponseCache] = None,
+        partial_parse: bool = False,
+        parser: Union[str, Parser] = 'bs4',
+        urls: Optional[YahooAuctionURL] = None,
+        metrics: Optional[Metrics] = None,
+        limiter: Optional[Limiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        hedging: Optional[Hedging] = None,
+        parse_pool: Optional[ParsePool] = None
     ) -> None:
         """ 
         Parameters
         ----------
         cookies : dict[str, str]
             Cookies to get session.
+        headless : bool
+            Run Chrome in headless mode.
+        http2 : bool
+            Use HTTP/2 if the `h2` package is installed.
+        max_connections : int
+            Max number of connections in the HTTP pool.
+        max_keepalive_connections : int
+            Max number of idle connections kept alive in the HTTP pool.
+        transport : httpx.AsyncBaseTransport | None
+            Transport to send HTTP requests with. 
+            If given, `http2` and the pool limits are ignored.
+        cache : ResponseCache | None
+            On-disk cache of list and detail pages. Nothing is cached if None.
+        partial_parse : bool
+            Build only the subtrees of pages read by the scrapers, 
+            instead of the whole tree. Same as `parser='bs4-partial'`.
+        parser : str | Parser
+            Parser backend of list and detail pages, 
+            one of `bs4`, `bs4-partial` and `lxml`, or an instance of `Parser`.
+        urls : YahooAuctionURL | None
+            URLs of the site, such as `YahooAuctionURL.local(base)` of a stand-in server. 
+            The real site if None.
+        metrics : Metrics | None
+            Receiver of events of requests, parsing, pagination, Chrome and calls. 
+            Nothing is measured if None.
+        limiter : Limiter | None
+            Rate and adaptive concurrency limit of list, detail and cancel requests per host,
+            such as `Limiter(rate=5.0)`. Not limited if None.
+        retry : RetryPolicy | None
+            Retries of list and detail requests failed with a timeout, a connection error
+            or a status such as 503, with jittered backoff. Not retried if None.
+        hedging : Hedging | None
+            Duplicates of list and detail requests slower than the p95 of recent ones,
+            keeping the first response. Not duplicated if None.
+        parse_pool : ParsePool | None
+            Pool of processes or threads parsing list and detail pages off the event loop. 
+            Parsed on the event loop if None.
         """
         self.cookies: list[dict[str, Any]] = cookies
-        self._cookies: dict[str, str] = {cookie['name']: cookie['value'] for cookie in cookies} # for requests module
-        self._chrome_options: Options = Options()
-        self._chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-        if headless:
-            self._chrome_options.add_argument('--headless')
+        self.urls: YahooAuctionURL = urls or YahooAuctionURL()
+        self.metrics: Optional[Metrics] = metrics
+        self.limiter: Optional[Limiter] = limiter
+        self._cookies: dict[str, str] = {cookie['name']: cookie['value'] for cookie in cookies} # for HTTP client
+        self._client: HTTPClient = HTTPClient(
+            self._cookies,
+            http2=http2,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            transport=transport,
+            cache=cache,
+            metrics=metrics,
+            limiter=limiter,
+            retry=retry,
+            hedging=hedging
+        )
+        if partial_parse and parser == 'bs4':
+            parser = 'bs4-partial'
+        self._parser: Parser = get_parser(parser)
+        self._parse_pool: Optional[ParsePool] = parse_pool
+        self._headless: bool = headless
+        self._options: Optional[Options] = None
+        self._chrome_pool: Optional[ChromePool] = None
+        self.session: Optional[SessionManager] = None
 
     
-    def check_login(self) -> bool:
+    @property
+    def _chrome_options(self) -> Options:
+        """ Options of Chrome, built on first use to defer importing selenium. """
+        if self._options is None:
+            from selenium.webdriver.chrome.options import Options
+            self._options = Options()
+            self._options.add_experimental_option('excludeSwitches', ['enable-logging'])
+            if self._headless:
+                self._options.add_argument('--headless')
+        return self._options
+
+
+    def limiter_stats(self) -> dict[str, LimiterStats]:
+        """ Return the current limits and counts of requests per host. Empty without a limiter. """
+        return self.limiter.stats() if self.limiter is not None else {}
+
+
+    async def aclose(self) -> None:
+        """ Close the HTTP connections and the Chrome pool. """
+        self.close_chrome_pool()
+        await self._client.aclose()
+
+
+    def start_chrome_pool(self, size: int = 2) -> ChromePool:
+        """ Start pre-warmed Chrome drivers which `cancel` and `cancel_items` borrow. 
+
+        Drivers stay open until `close_chrome_pool` or `aclose` is called.
+        
+        Parameters
+        ----------
+        size : int
+            Number of drivers.
+
+        Returns
+        -------
+        ChromePool
+            Started pool.
+        """
+        from yahoo_auction_auto.chrome import ChromePool
+        self.close_chrome_pool()
+        pool: ChromePool = ChromePool(self._chrome_options, self.cookies, size, urls=self.urls, metrics=self.metrics)
+        pool.start()
+        self._chrome_pool = pool
+        return pool
+
+
+    def close_chrome_pool(self) -> None:
+        """ Quit the drivers started by `start_chrome_pool`. """
+        if self._chrome_pool is not None:
+            self._chrome_pool.close()
+            self._chrome_pool = None
+
+
+    def set_cookies(self, cookies: list[dict[str, Any]]) -> None:
+        """ Replace the cookies of HTTP requests and of Chrome started later.
+
+        The Chrome pool, which has the old cookies loaded, is closed.
+        Drivers borrowed from it finish their task and quit,
+        and aIDs of a running `cancel_many` not started yet fail with `RuntimeError`.
+        """
+        self.cookies = cookies
+        self._cookies = {cookie['name']: cookie['value'] for cookie in cookies}
+        self._client.set_cookies(self._cookies)
+        self.close_chrome_pool()
+
+
+    def open_session(
+        self,
+        profile_dir: Optional[str] = None,
+        path: Optional[str] = None,
+        login_ttl: float = 60.0,
+        min_interval: float = 30.0,
+        fetch: Optional[Callable[[], list[dict[str, Any]]]] = None
+    ) -> SessionManager:
+        """ Refresh cookies from a Chrome profile when requests are redirected to the login page.
+
+        Requests redirected at the same time wait for one refresh and are sent again with the new cookies.
+
+        Parameters
+        ----------
+        profile_dir : str | None
+            Chrome user-data directory logged in by `get_username_and_cookies(profile_dir)`.
+        path : str | None
+            File refreshed cookies are written to atomically. Not written if None.
+        login_ttl : float
+            Seconds the result of `SessionManager.check_login` is reused for.
+        min_interval : float
+            Seconds after a refresh in which another one is not started.
+        fetch : Callable[[], list[dict[str, Any]]] | None
+            Blocking function returning fresh cookies instead of reading them from `profile_dir`.
+
+        Returns
+        -------
+        SessionManager
+            Session, also set as `session`.
+        """
+        session: SessionManager = SessionManager(self, profile_dir, path, login_ttl, min_interval, fetch)
+        self._client.on_login_required = session.on_login_required
+        self.session = session
+        return session
+
+
+    async def __aenter__(self) -> 'YahooAuction':
+        return self
+
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        await self.aclose()
+
+
+    async def check_login(self) -> bool:
         """ Return True if logined. 
         
         Returns
@@ -45,14 +253,14 @@ class YahooAuction:
         bool
             Return True if logined.
         """
-        url: str = YahooAuctionURL.MYPAGE
-        try:
-            response: requests.Response = requests.get(url, cookies=self._cookies, timeout=60)
-            response.raise_for_status()
-        except Exception:
-            return False
+        url: str = self.urls.MYPAGE
+        with measure(self.metrics, 'call', call='check_login'):
+            try:
+                response: httpx.Response = await self._client.get(url, kind='login', timeout=60)
+            except Exception:
+                return False
         
-        return bool(response.url == url)
+        return bool(str(response.url) == url)
 
 
     def submit(self) -> None:
@@ -64,39 +272,168 @@ class YahooAuction:
 
 
 
-    def cancel(self, aID: str) -> None:
+    def cancel(self, aID: str, timeout: float = 30.0) -> None:
         """ Cancel selling. 
+
+        Borrows a driver of the pool if started, otherwise starts Chrome for this call.
         
         Parameters
         ----------
         aID
             Auction ID of Yahoo Auction.
+        timeout : float
+            Seconds to wait for the confirm button.
         """
-        with chrome(self._chrome_options) as driver:
-            driver.get(YahooAuctionURL.HOME)
-            for cookie in self.cookies:
-                driver.add_cookie(cookie)
-            driver.get(YahooAuctionURL.CANCEL(aID))
-            cancel_element: WebElement = driver.find_element_by_name('confirm')
-            cancel_element.click()
+        from yahoo_auction_auto.chrome import chrome, cancel_with
+        with measure(self.metrics, 'call', call='cancel'):
+            if self._chrome_pool is not None:
+                with self._chrome_pool.borrow() as driver:
+                    cancel_with(driver, aID, timeout, self.urls)
+                return
+
+            with chrome(self._chrome_options, self.metrics, implicit_wait=0) as driver:
+                driver.get(self.urls.HOME)
+                for cookie in self.cookies:
+                    driver.add_cookie(cookie)
+                cancel_with(driver, aID, timeout, self.urls)
             
             
-    def cancel_items(self, aIDs: list[str]) -> list[str]:
-        canceled: list[str] = []
-        with chrome(self._chrome_options) as driver:
-            driver.get(YahooAuctionURL.HOME)
-            for cookie in self.cookies:
-                driver.add_cookie(cookie)
-            for aID in aIDs:
-                try:
-                    logger.debug(f'canceling {aID}')
-                    driver.get(YahooAuctionURL.CANCEL(aID))
-                    cancel_element: WebElement = driver.find_element_by_name('confirm')
-                    cancel_element.click()
-                    canceled.append(aID)
-                except Exception as e:
-                    logger.error(e)
-        return canceled
+    def cancel_items(self, aIDs: list[str], drivers: int = 1, timeout: float = 30.0) -> list[str]:
+        """ Cancel sellings of `aIDs`. 
+        
+        Parameters
+        ----------
+        aIDs : list[str]
+            Auction IDs.
+        drivers : int
+            Number of Chrome drivers cancelling in parallel, 
+            used if the pool is not started.
+        timeout : float
+            Seconds to wait for the confirm button of each page.
+
+        Returns
+        -------
+        list[str]
+            Canceled aIDs.
+        """
+        with measure(self.metrics, 'call', call='cancel_items') as values:
+            results: dict[str, Optional[Exception]] = self.cancel_many(aIDs, drivers, timeout)
+            values['items'] = len(aIDs)
+            values['failed'] = sum(error is not None for error in results.values())
+        return [aID for aID, error in results.items() if error is None]
+
+
+    def cancel_many(
+        self, 
+        aIDs: list[str], 
+        drivers: int = 1, 
+        timeout: float = 30.0
+    ) -> dict[str, Optional[Exception]]:
+        """ Cancel sellings of `aIDs` spread across Chrome drivers. 
+
+        Drivers of the pool are used if started, 
+        otherwise `drivers` drivers are started for this call.
+        
+        Parameters
+        ----------
+        aIDs : list[str]
+            Auction IDs.
+        drivers : int
+            Number of Chrome drivers cancelling in parallel, 
+            used if the pool is not started.
+        timeout : float
+            Seconds to wait for the confirm button of each page.
+
+        Returns
+        -------
+        dict[str, Exception | None]
+            Exception raised while cancelling each aID, or None if canceled.
+        """
+        from yahoo_auction_auto.chrome import ChromePool, cancel_in_pool
+        if not aIDs:
+            return {}
+        if self._chrome_pool is not None:
+            return cancel_in_pool(self._chrome_pool, aIDs, timeout)
+        with ChromePool(
+            self._chrome_options, 
+            self.cookies, 
+            max(1, min(drivers, len(aIDs))), 
+            urls=self.urls, 
+            metrics=self.metrics
+        ) as pool:
+            return cancel_in_pool(pool, aIDs, timeout)
+
+
+    async def cancel_http(self, aID: str, marker: Optional[Pattern[str]] = CANCELLED_MARKER) -> None:
+        """ Cancel selling without browser. 
+
+        Submits the confirm form of the cancel page over the HTTP session.
+        
+        Parameters
+        ----------
+        aID
+            Auction ID of Yahoo Auction.
+        marker : Pattern[str] | None
+            Text of the page shown after a cancel is done, as of `cancel.cancel_http`.
+
+        Raises
+        ------
+        CancelUnconfirmed
+            If the confirm is sent but its result page does not have `marker`.
+        ValueError
+            If the cancel page has no confirm form, or the confirm is rejected.
+        """
+        await cancel_http(self._client, aID, urls=self.urls, marker=marker)
+
+
+    async def cancel_many_http(
+        self, 
+        aIDs: Iterable[str], 
+        concurrency: int = 4, 
+        fallback: bool = False,
+        marker: Optional[Pattern[str]] = CANCELLED_MARKER
+    ) -> AsyncIterator[tuple[str, Optional[Exception]]]:
+        """ Cancel sellings of `aIDs` concurrently without browser. 
+
+        Results are yielded as they finish, not in the order of `aIDs`.
+        
+        Parameters
+        ----------
+        aIDs : Iterable[str]
+            Auction IDs.
+        concurrency : int
+            Max number of aIDs cancelled at once.
+            `limiter`, if given, may lower it adaptively.
+        fallback : bool
+            Retry aIDs failed over HTTP with Chrome, after the others finish.
+            Not those failed with `CancelUnconfirmed`, whose confirm was accepted.
+        marker : Pattern[str] | None
+            Text of the page shown after a cancel is done, as of `cancel.cancel_http`.
+
+        Yields
+        ------
+        tuple[str, Exception | None]
+            aID and the exception raised while cancelling it, or None if canceled.
+        """
+        failed: list[str] = []
+        async def cancel(aID: str) -> None:
+            await self.cancel_http(aID, marker)
+
+        async for aID, result in as_completed_bounded(cancel, aIDs, concurrency):
+            if isinstance(result, Exception):
+                logger.error(f'failed to cancel {aID} over HTTP: {result}')
+                # an unconfirmed cancel may be done, and is not cancelled again
+                if fallback and not isinstance(result, CancelUnconfirmed):
+                    failed.append(aID)
+                    continue
+                yield aID, result
+            else:
+                yield aID, None
+
+        if failed:
+            results: dict[str, Optional[Exception]] = await asyncio.to_thread(self.cancel_many, failed)
+            for aID, error in results.items():
+                yield aID, error
 
 
     def resubmit(self, aID: str) -> None:
@@ -116,12 +453,7 @@ class YahooAuction:
             List of aIDs.
         """
         urls: list[str] = await self.get_urls_selling()
-        aIDs: list[str] = []
-        for url in urls:
-            match = re.search(r'(?<=/)\w+$', url)
-            if match:
-                aIDs.append(url[match.start():match.end()])
-        return aIDs
+        return [aID for aID in map(aID_of, urls) if aID]
 
 
     async def get_urls_selling(self) -> list[str]:
@@ -132,8 +464,46 @@ class YahooAuction:
         list[str]
             List of URLs.
         """
-        pattern: Pattern[str] = re.compile(r'^rsec:itm;slk:tc;')
-        return await _get_urls(self._cookies, YahooAuctionURL.SELLING, pattern)
+        return await _get_urls(self._client, self.urls.SELLING, _PATTERN_SELLING, self._parser, self._parse_pool)
+
+
+    def iter_urls_selling(self) -> AsyncIterator[str]:
+        """ Iterate URLs currently selling on Yahoo Auction page. 
+
+        URLs are yielded page by page while the following pages are still unfetched.
+        
+        Yields
+        ------
+        str
+            URL.
+        """
+        return _iter_urls(self._client, self.urls.SELLING, _PATTERN_SELLING, self._parser, self._parse_pool)
+
+
+
+    async def get_summaries_selling(self) -> list[InfoSummary]:
+        """ Get summaries of products currently selling from list pages. 
+
+        Title, price, bid count and end datetime are read from the list pages,
+        so no request is sent per product.
+        
+        Returns
+        -------
+        list[InfoSummary]
+            List of summaries.
+        """
+        return [summary async for summary in self.iter_summaries_selling()]
+
+
+    def iter_summaries_selling(self) -> AsyncIterator[InfoSummary]:
+        """ Iterate summaries of products currently selling from list pages, page by page. 
+        
+        Yields
+        ------
+        InfoSummary
+            Summary.
+        """
+        return _iter_list_items(self._client, self.urls.SELLING, functools.partial(self._parser.summary_page, pattern=_PATTERN_SELLING), self._parser.name, self._parse_pool)
 
 
     async def get_info_selling(self, aID: str) -> InfoSelling:
@@ -152,134 +522,448 @@ class YahooAuction:
         """
         
         info: InfoSelling = InfoSelling(aID)
-        await info.update(self._cookies)    
+        await info.update(self._client, parser=self._parser, urls=self.urls, pool=self._parse_pool)
         return info
 
 
-    async def get_aIDs_closed_with_winner(self) -> list[str]:
+    async def get_info_selling_many(
+        self, 
+        aIDs: Iterable[str], 
+        concurrency: int = 8
+    ) -> AsyncIterator[tuple[str, Union[InfoSelling, Exception]]]:
+        """ Get product information of `aIDs` concurrently. 
+
+        Results are yielded as they finish, not in the order of `aIDs`.
+        
+        Parameters
+        ----------
+        aIDs : Iterable[str]
+            Auction IDs.
+        concurrency : int
+            Max number of pages fetched at once. 
+            `limiter`, if given, may lower it adaptively.
+
+        Yields
+        ------
+        tuple[str, InfoSelling | Exception]
+            aID and its selling information, 
+            or the exception raised while getting it.
+        """
+        async for aID, result in as_completed_bounded(self.get_info_selling, aIDs, concurrency):
+            if isinstance(result, Exception):
+                logger.error(f'failed to get info of {aID}: {result}')
+            yield aID, result
+
+
+    async def watch(
+        self, 
+        aIDs: Iterable[str], 
+        interval: float = 60.0, 
+        concurrency: int = 8, 
+        fields: Iterable[str] = FIELDS,
+        rounds: Optional[int] = None
+    ) -> AsyncIterator[ChangeEvent]:
+        """ Poll pages of `aIDs` and yield only fields changed since the last poll. 
+
+        A page is parsed only if its content differs from the previous poll.
+        The first poll of each aID reports all fields.
+        Pages failed to fetch or to parse are logged and retried on the next round.
+        
+        Parameters
+        ----------
+        aIDs : Iterable[str]
+            Auction IDs to watch.
+        interval : float
+            Seconds between the starts of polling rounds.
+        concurrency : int
+            Max number of pages fetched at once. 
+            `limiter`, if given, may lower it adaptively.
+        fields : Iterable[str]
+            Fields of `InfoSelling` to compare.
+        rounds : int | None
+            Number of polling rounds. Poll forever if None.
+
+        Yields
+        ------
+        ChangeEvent
+            aID and its changed fields with new values.
+        """
+        targets: list[str] = list(aIDs)
+        state: WatchState = WatchState(fields, parser=self._parser)
+        loop = asyncio.get_running_loop()
+
+        async def fetch(aID: str) -> bytes:
+            response: httpx.Response = await self._client.get(self.urls.auction(aID), kind='detail')
+            return response.content
+
+        done: int = 0
+        while rounds is None or done < rounds:
+            started: float = loop.time()
+            async for aID, result in as_completed_bounded(fetch, targets, concurrency):
+                if isinstance(result, Exception):
+                    logger.error(f'failed to get page of {aID}: {result}')
+                    continue
+                try:
+                    event: Optional[ChangeEvent] = state.observe(aID, result)
+                except Exception as e:
+                    logger.error(f'failed to parse page of {aID}: {type(e).__name__}: {e}')
+                    continue
+                if event is not None:
+                    yield event
+            done += 1
+            if rounds is None or done < rounds:
+                await asyncio.sleep(max(0.0, interval - (loop.time() - started)))
+
+
+    async def get_aIDs_closed_with_winner(self, watermark: Optional[ClosedWatermark] = None) -> list[str]:
         """ Get aIDs closed with winner on Yahoo Auction page. 
         
+        Parameters
+        ----------
+        watermark : ClosedWatermark | None
+            Watermark of the last sync. If given, only entries above the ones it knows are returned,
+            the pages below them are not fetched, and it is updated with the new entries.
+
         Returns
         -------
         list[str]
-            List of aIDs.
+            List of aIDs, newest first.
         """
-        urls: list[str] = await self.get_urls_closed_with_winner()
-        aIDs: list[str] = []
-        for url in urls:
-            match = re.search(r'(?<=/)\w+$', url)
-            if match:
-                aIDs.append(url[match.start():match.end()])
-        return aIDs
+        urls: list[str] = await self.get_urls_closed_with_winner(watermark)
+        return [aID for aID in map(aID_of, urls) if aID]
 
 
-    async def get_urls_closed_with_winner(self) -> list[str]:
+    async def get_urls_closed_with_winner(self, watermark: Optional[ClosedWatermark] = None) -> list[str]:
         """ Get URLs closed with winner on Yahoo Auction page. 
         
+        Parameters
+        ----------
+        watermark : ClosedWatermark | None
+            Watermark of the last sync. If given, only entries above the ones it knows are returned,
+            the pages below them are not fetched, and it is updated with the new entries.
+
         Returns
         -------
         list[str]
-            List of URLs.
+            List of URLs, newest first.
         """
-        pattern: Pattern[str] = re.compile(r'^rsec:itm;slk:ttlc;')
-        return await _get_urls(self._cookies, YahooAuctionURL.CLOSED_WITH_WINNER, pattern)
+        return await self._get_closed_urls(self.urls.CLOSED_WITH_WINNER, watermark)
 
 
-    async def get_info_closed_with_winner(self) -> InfoClosedWithWinner:
-        raise NotImplementedError()
+    def iter_urls_closed_with_winner(self) -> AsyncIterator[str]:
+        """ Iterate URLs closed with winner on Yahoo Auction page. 
+
+        URLs are yielded page by page while the following pages are still unfetched.
+        
+        Yields
+        ------
+        str
+            URL.
+        """
+        return _iter_urls(self._client, self.urls.CLOSED_WITH_WINNER, _PATTERN_CLOSED, self._parser, self._parse_pool)
 
 
-    async def get_aIDs_closed_without_winner(self) -> list[str]:
+
+    async def get_summaries_closed_with_winner(self) -> list[InfoSummary]:
+        """ Get summaries of products closed with winner from list pages. 
+
+        Title, price, bid count and end datetime are read from the list pages,
+        so no request is sent per product.
+        
+        Returns
+        -------
+        list[InfoSummary]
+            List of summaries.
+        """
+        return [summary async for summary in self.iter_summaries_closed_with_winner()]
+
+
+    def iter_summaries_closed_with_winner(self) -> AsyncIterator[InfoSummary]:
+        """ Iterate summaries of products closed with winner from list pages, page by page. 
+        
+        Yields
+        ------
+        InfoSummary
+            Summary.
+        """
+        return _iter_list_items(self._client, self.urls.CLOSED_WITH_WINNER, functools.partial(self._parser.summary_page, pattern=_PATTERN_CLOSED), self._parser.name, self._parse_pool)
+
+
+    async def get_info_closed_with_winner(self, watermark: Optional[ClosedWatermark] = None) -> list[InfoClosedWithWinner]:
+        """ Get products closed with winner from list pages. 
+
+        Read from the rows of the list pages, so no request is sent per product.
+        
+        Parameters
+        ----------
+        watermark : ClosedWatermark | None
+            Watermark of the last sync. If given, only entries above the ones it knows are returned,
+            the pages below them are not fetched, and it is updated with the new entries.
+
+        Returns
+        -------
+        list[InfoClosedWithWinner]
+            Products, newest first.
+        """
+        return await self._get_closed_infos(self.urls.CLOSED_WITH_WINNER, InfoClosedWithWinner, watermark)
+
+
+    async def get_aIDs_closed_without_winner(self, watermark: Optional[ClosedWatermark] = None) -> list[str]:
         """ Get aIDs closed with no winner on Yahoo Auction page. 
         
+        Parameters
+        ----------
+        watermark : ClosedWatermark | None
+            Watermark of the last sync. If given, only entries above the ones it knows are returned,
+            the pages below them are not fetched, and it is updated with the new entries.
+
         Returns
         -------
         list[str]
-            List of aIDs.
+            List of aIDs, newest first.
         """
-        urls: list[str] = await self.get_urls_closed_without_winner()
-        aIDs: list[str] = []
-        for url in urls:
-            match = re.search(r'(?<=/)\w+$', url)
-            if match:
-                aIDs.append(url[match.start():match.end()])
-        return aIDs
+        urls: list[str] = await self.get_urls_closed_without_winner(watermark)
+        return [aID for aID in map(aID_of, urls) if aID]
 
 
-    async def get_urls_closed_without_winner(self) -> list[str]:
+    async def get_urls_closed_without_winner(self, watermark: Optional[ClosedWatermark] = None) -> list[str]:
         """ Get URLs closed with no winner on Yahoo Auction page. 
         
+        Parameters
+        ----------
+        watermark : ClosedWatermark | None
+            Watermark of the last sync. If given, only entries above the ones it knows are returned,
+            the pages below them are not fetched, and it is updated with the new entries.
+
         Returns
         -------
         list[str]
-            List of URLs.
+            List of URLs, newest first.
         """
-        pattern: Pattern[str] = re.compile(r'^rsec:itm;slk:ttlc;')
-        return await _get_urls(self._cookies, YahooAuctionURL.CLOSED_WITHOUT_WINNER, pattern)
+        return await self._get_closed_urls(self.urls.CLOSED_WITHOUT_WINNER, watermark)
 
 
-    async def get_info_closed_without_winner(self) -> InfoClosedWithoutWinner:
-        raise NotImplementedError()
+    def iter_urls_closed_without_winner(self) -> AsyncIterator[str]:
+        """ Iterate URLs closed with no winner on Yahoo Auction page. 
+
+        URLs are yielded page by page while the following pages are still unfetched.
+        
+        Yields
+        ------
+        str
+            URL.
+        """
+        return _iter_urls(self._client, self.urls.CLOSED_WITHOUT_WINNER, _PATTERN_CLOSED, self._parser, self._parse_pool)
+
 
 
+    async def get_summaries_closed_without_winner(self) -> list[InfoSummary]:
+        """ Get summaries of products closed with no winner from list pages. 
 
-    def reflesh_cookies(self) -> None:
-        """ Reflesh cookies. 
+        Title, price, bid count and end datetime are read from the list pages,
+        so no request is sent per product.
         
-        Not Impremented yet.
+        Returns
+        -------
+        list[InfoSummary]
+            List of summaries.
         """
-        raise NotImplementedError()
+        return [summary async for summary in self.iter_summaries_closed_without_winner()]
 
 
+    def iter_summaries_closed_without_winner(self) -> AsyncIterator[InfoSummary]:
+        """ Iterate summaries of products closed with no winner from list pages, page by page. 
+        
+        Yields
+        ------
+        InfoSummary
+            Summary.
+        """
+        return _iter_list_items(self._client, self.urls.CLOSED_WITHOUT_WINNER, functools.partial(self._parser.summary_page, pattern=_PATTERN_CLOSED), self._parser.name, self._parse_pool)
 
 
-async def _get_urls(cookies: dict[str, str], src_url: str, pattern: Pattern[str]) ->list[str]:
-    """ Get product urls from `src_url`. 
-    
-    Recursive.
-    """    
-    response: requests.Response = await requests_async.get(src_url, cookies=cookies)
-    response.raise_for_status()
+    async def get_info_closed_without_winner(self, watermark: Optional[ClosedWatermark] = None) -> list[InfoClosedWithoutWinner]:
+        """ Get products closed with no winner from list pages. 
 
-    soup = bs4.BeautifulSoup(response.content, 'lxml')
-    urls: list[str] = []
-    url_tags: list[bs4.element.Tag] = [tag for tag in soup.find_all('a', attrs={'data-ylk': pattern})]
-    for tag in url_tags:
+        Read from the rows of the list pages, so no request is sent per product.
+        
+        Parameters
+        ----------
+        watermark : ClosedWatermark | None
+            Watermark of the last sync. If given, only entries above the ones it knows are returned,
+            the pages below them are not fetched, and it is updated with the new entries.
+
+        Returns
+        -------
+        list[InfoClosedWithoutWinner]
+            Products, newest first.
+        """
+        return await self._get_closed_infos(self.urls.CLOSED_WITHOUT_WINNER, InfoClosedWithoutWinner, watermark)
+
+
+
+    async def _get_closed_urls(self, src_url: str, watermark: Optional[ClosedWatermark]) -> list[str]:
+        if watermark is None:
+            return await _get_urls(self._client, src_url, _PATTERN_CLOSED, self._parser, self._parse_pool)
+        urls: list[str] = await _get_urls(
+            self._client, 
+            src_url, 
+            _PATTERN_CLOSED, 
+            self._parser, 
+            self._parse_pool, 
+            known=lambda url: watermark.is_known(aID_of(url))
+        )
+        watermark.update(aID_of(url) for url in urls)
+        return urls
+
+
+    async def _get_closed_infos(self, src_url: str, cls: Type[I], watermark: Optional[ClosedWatermark]) -> list[I]:
+        infos: list[I] = []
+        summaries: AsyncGenerator[InfoSummary, None] = _iter_list_items(
+            self._client, 
+            src_url, 
+            functools.partial(self._parser.summary_page, pattern=_PATTERN_CLOSED), 
+            self._parser.name, 
+            self._parse_pool
+        )
         try:
-            urls.append(tag.get('href'))
-        except Exception as e:
-            pass
-    next_page: Optional[str] = _get_next_page(soup)
+            async for summary in summaries:
+                if watermark is not None and watermark.is_known(summary.aID, summary.end_datetime):
+                    break
+                infos.append(cls.from_summary(summary))
+        finally:
+            await summaries.aclose()
+        if watermark is not None:
+            ends: list[datetime] = [info.end_datetime for info in infos if info.end_datetime is not None]
+            watermark.update((info.aID for info in infos), max(ends, default=None))
+        return infos
 
-    
-    if next_page:
-        urls.extend(await _get_urls(cookies, next_page, pattern))
 
-    return urls
+    def reflesh_cookies(self, profile_dir: str, path: Optional[str] = None) -> list[dict[str, Any]]:
+        """ Reflesh cookies from a Chrome profile, without logging in again.
+
+        Blocks while Chrome runs. `SessionManager.refresh` of `open_session` does it in a thread.
+
+        Parameters
+        ----------
+        profile_dir : str
+            Chrome user-data directory logged in by `get_username_and_cookies(profile_dir)`.
+        path : str | None
+            File the cookies are written to atomically. Not written if None.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            New cookies.
+
+        Raises
+        ------
+        LoginRequired
+            If the login of the profile has expired too.
+        """
+        from yahoo_auction_auto.cookie import get_cookies_from_profile
+        with measure(self.metrics, 'call', call='refresh_cookies'):
+            cookies: list[dict[str, Any]] = get_cookies_from_profile(profile_dir, self.urls, self._headless, self.metrics)
+        self.set_cookies(cookies)
+        if path is not None:
+            save_cookies(path, cookies)
+        return cookies
 
 
 
-def _get_next_page(soup: bs4.BeautifulSoup) -> Optional[str]:
-    """ Return next page url from `soup`. 
+
+async def _get_urls(
+    client: HTTPClient, 
+    src_url: str, 
+    pattern: Pattern[str], 
+    parser: Optional[Parser] = None,
+    pool: Optional[ParsePool] = None,
+    known: Optional[Callable[[str], bool]] = None
+) -> list[str]:
+    """ Get product urls from `src_url` and its following pages. 
+
+    If `known` is given, stop at the first url it returns True for, 
+    without fetching the following pages.
+    """    
+    if known is None:
+        return [url async for url in _iter_urls(client, src_url, pattern, parser, pool)]
+    urls: list[str] = []
+    iterator: AsyncGenerator[str, None] = _iter_urls(client, src_url, pattern, parser, pool)
+    try:
+        async for url in iterator:
+            if known(url):
+                break
+            urls.append(url)
+    finally:
+        await iterator.aclose()
+    return urls
+
+
+async def _iter_urls(
+    client: HTTPClient, 
+    src_url: str, 
+    pattern: Pattern[str], 
+    parser: Optional[Parser] = None,
+    pool: Optional[ParsePool] = None
+) -> AsyncGenerator[str, None]:
+    """ Iterate product urls from `src_url` and its following pages. """
+    backend: Parser = get_parser(parser or 'bs4')
+    parse = functools.partial(backend.list_page, pattern=pattern)
+    urls: AsyncGenerator[str, None] = _iter_list_items(client, src_url, parse, backend.name, pool)
+    try:
+        async for url in urls:
+            yield url
+    finally:
+        # close now rather than on garbage collection, so that pagination is reported on time
+        await urls.aclose()
+
+
+async def _iter_list_items(
+    client: HTTPClient, 
+    src_url: str, 
+    parse: Callable[[bytes], tuple[list[T], Optional[str]]],
+    parser: str = '',
+    pool: Optional[ParsePool] = None
+) -> AsyncGenerator[T, None]:
+    """ Iterate items parsed from `src_url` and its following pages. 
     
+    Pages are fetched one by one, and items of a page are yielded 
+    before the next page is fetched.
+
     Parameters
     ----------
-    soup : bs4.BeautifulSoup
-        Soup of a Yahoo Auction page.
-
-    Returns
-    -------
-    str | None
-        URL of next page if exists, else None.
-
+    client : HTTPClient
+        Client to send requests with.
+    src_url : str
+        URL of the first list page.
+    parse : Callable[[bytes], tuple[list[T], str | None]]
+        Function returning items and next page url from HTML of a list page.
+    parser : str
+        Name of the parser backend of `parse`, labeling `parse` events.
+    pool : ParsePool | None
+        Pool to run `parse` in, which must be picklable for processes. 
+        Run on the event loop if None.
+
+    Yields
+    ------
+    T
+        Item.
     """
-    pattern: Pattern[str] = re.compile(r'^rsec:pagination;slk:next;')
-    next_page_tags: list[bs4.element.Tag] = [tag for tag in soup.find_all('a', attrs={'data-ylk': pattern})]
-    if len(next_page_tags) > 0:
-        try:
-            return str(next_page_tags[0].get('href'))
-        except:
-            return None
-    else:
-        return None
-
+    metrics: Optional[Metrics] = client.metrics
+    with measure(metrics, 'pagination') as values:
+        values['pages'] = values['items'] = 0
+        next_page: Optional[str] = src_url
+        visited: set[str] = set()
+        while next_page and next_page not in visited:
+            visited.add(next_page)
+            response: httpx.Response = await client.get(next_page, kind='list')
+            with measure(metrics, 'parse', kind='list', parser=parser) as parsed:
+                parsed['bytes'] = len(response.content)
+                if pool is None:
+                    items, next_page = parse(response.content)
+                else:
+                    items, next_page = await pool.run(parse, response.content)
+            values['pages'] += 1
+            values['items'] += len(items)
+            for item in items:
+                yield item